@@ -1,11 +1,119 @@
-from dx.comms import handle_assignment_comm, handle_resample_comm
-from dx.datatypes import *
 from dx.dx import display, show_docs
 from dx.formatters import *
 from dx.loggers import configure_logging
-from dx.plotting import *
 from dx.settings import *
+from dx.utils.lazy import make_lazy_module
+from dx.utils.profiling import clear_profiles, get_profiles, profile
+from dx.utils.timing import (
+    clear_display_timings,
+    get_display_timings,
+    summarize_display_timings,
+)
 
 __version__ = "1.4.0"
 
+# subpackages that are only imported once one of their attributes is accessed (PEP 562),
+# so `import dx` only loads what's needed to set up the display formatters
+LAZY_NAMES = {
+    "dx.datatypes": (
+        "write_random_dataset",
+        "register_random_dataset",
+        "generate_datetime_series",
+        "generate_datetimetz_series",
+        "generate_date_series",
+        "generate_time_series",
+        "generate_time_period_series",
+        "generate_time_interval_series",
+        "generate_time_delta_series",
+        "generate_lat_float_series",
+        "generate_lon_float_series",
+        "generate_latlon_series",
+        "generate_filled_geojson_series",
+        "generate_exterior_bounds_geojson_series",
+        "random_dataframe",
+        "quick_random_dataframe",
+        "generate_nested_tabular_series",
+        "generate_boolean_series",
+        "generate_dtype_series",
+        "generate_dict_series",
+        "generate_list_series",
+        "generate_bytes_series",
+        "generate_ipv4_series",
+        "generate_ipv6_series",
+        "generate_uuid4_series",
+        "generate_integer_series",
+        "generate_float_series",
+        "generate_decimal_series",
+        "generate_complex_number_series",
+        "generate_text_series",
+        "generate_keyword_series",
+    ),
+    "dx.comms": (
+        "handle_aggregation_comm",
+        "handle_assignment_comm",
+        "handle_facets_comm",
+        "handle_resample_comm",
+    ),
+    "dx.plotting": (
+        "bar",
+        "dataprism",
+        "line",
+        "pie",
+        "scatter",
+        "wordcloud",
+        "basic_chart_functions",
+        "connected_scatterplot",
+        "correlation_matrix",
+        "diverging_bar",
+        "dotplot",
+        "parallel_coordinates",
+        "radar_plot",
+        "scatterplot_matrix",
+        "comparison_chart_functions",
+        "flow_diagram",
+        "funnel",
+        "funnel_chart",
+        "funnel_sunburst",
+        "funnel_tree",
+        "funnel_chart_functions",
+        "choropleth",
+        "tilemap",
+        "maps_chart_functions",
+        "donut",
+        "partition",
+        "sunburst",
+        "treemap",
+        "part_to_whole_chart_functions",
+        "adjacency_matrix",
+        "arc_flow",
+        "dendrogram",
+        "force_directed_network",
+        "sankey",
+        "relationship_chart_functions",
+        "bignumber",
+        "boxplot",
+        "dimension_matrix",
+        "heatmap",
+        "hexbin",
+        "histogram",
+        "horizon",
+        "ridgeline",
+        "violin",
+        "summary_chart_functions",
+        "candlestick",
+        "cumulative",
+        "line_percent",
+        "stacked_area",
+        "stacked_percent",
+        "time_series_chart_functions",
+        "DEXView",
+        "chart_functions",
+        "get_chart_view",
+        "enable_plotting_backend",
+        "disable_plotting_backend",
+        "plot",
+    ),
+}
+__getattr__, __dir__ = make_lazy_module(__name__, LAZY_NAMES)
+
 configure_logging()
@@ -0,0 +1,440 @@
+import operator
+from contextlib import contextmanager
+from functools import lru_cache, reduce
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from dx import metrics
+from dx.dependencies import polars_installed
+from dx.settings import get_settings
+from dx.types.filters import (
+    DEXDateFilter,
+    DEXDimensionFilter,
+    DEXFilterSettings,
+    DEXMetricFilter,
+    DEXTextFilter,
+    FilterTypes,
+    get_filter_series,
+    to_naive_utc,
+)
+from dx.types.main import DXDatalinkBackend
+from dx.utils.tracking import (
+    DB_CONNECTION_LOCK,
+    MATERIALIZED_TABLES,
+    DXDataFrame,
+    LazyDBConnection,
+    get_text_index,
+    materialize_table,
+    register_dxdf,
+    should_materialize,
+)
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# (table name: polars DataFrame) pairs registered with the polars backend
+POLARS_FRAMES = {}
+
+
+class DatalinkBackend:
+    """
+    Engine used to filter and sample registered dataframes for datalink requests.
+    - `register()`/`unregister()` make a DXDataFrame's data available to the engine
+    - `query()` runs a SQL string (with a `{table_name}` placeholder) against it
+    - `sample()`/`count()` apply DEX filters, returning (up to `limit`) matching rows
+    with the dataframe's normalized index and columns, or the number of matching rows
+    """
+
+    name: str = None
+
+    def register(self, dxdf: DXDataFrame) -> None:
+        raise NotImplementedError
+
+    def unregister(self, dxdf: DXDataFrame) -> None:
+        raise NotImplementedError
+
+    def query(
+        self,
+        dxdf: DXDataFrame,
+        query_string: str,
+        filters: Optional[list] = None,
+    ) -> pd.DataFrame:
+        raise NotImplementedError(f"SQL queries aren't supported by the {self.name} backend")
+
+    def sample(
+        self,
+        dxdf: DXDataFrame,
+        filters: Optional[list] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def count(self, dxdf: DXDataFrame, filters: Optional[list] = None) -> int:
+        raise NotImplementedError
+
+
+class DuckDBDatalinkBackend(DatalinkBackend):
+    """
+    Runs SQL queries against dataframes registered as views (or materialized tables)
+    in duckdb. The connection isn't opened until it's first used.
+    """
+
+    name = DXDatalinkBackend.duckdb.value
+
+    def __init__(self, connection=None):
+        self.connection = LazyDBConnection() if connection is None else connection
+
+    def register(self, dxdf: DXDataFrame) -> None:
+        logger.debug("registering to duckdb", table_name=dxdf.variable_name)
+        register_dxdf(self.connection, dxdf)
+
+    def unregister(self, dxdf: DXDataFrame) -> None:
+        table_name = dxdf.variable_name
+        with DB_CONNECTION_LOCK:
+            if table_name in MATERIALIZED_TABLES:
+                self.connection.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                MATERIALIZED_TABLES.discard(table_name)
+                return
+            self.connection.unregister(table_name)
+
+    def query(
+        self,
+        dxdf: DXDataFrame,
+        query_string: str,
+        filters: Optional[list] = None,
+    ) -> pd.DataFrame:
+        with self.execute(dxdf, query_string, filters=filters) as result:
+            return result.df()
+
+    def sample(
+        self,
+        dxdf: DXDataFrame,
+        filters: Optional[list] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        if should_materialize(dxdf):
+            materialize_table(self.connection, dxdf)
+        new_df = self.query(dxdf, sql_select(filters=filters, limit=limit), filters=filters)
+        return new_df.set_index(dxdf.index_name)
+
+    def count(self, dxdf: DXDataFrame, filters: Optional[list] = None) -> int:
+        query_string = sql_select(filters=filters, columns="COUNT(*)")
+        with self.execute(dxdf, query_string, filters=filters) as result:
+            # should return a tuple of (count,)
+            return result.fetchone()[0]
+
+    @contextmanager
+    def execute(self, dxdf: DXDataFrame, query_string: str, filters: Optional[list] = None):
+        """
+        Runs a SQL string (with a `{table_name}` placeholder) against the registered
+        dataframe, yielding the connection's result while any filter values are registered.
+        The connection is locked until the result has been fetched.
+        """
+        query_string = query_string.format(table_name=dxdf.variable_name)
+        logger.debug("sql query string", query_string=query_string)
+        with DB_CONNECTION_LOCK, self.filter_values_registered(dxdf, filters):
+            yield self.connection.execute(query_string)
+
+    @contextmanager
+    def filter_values_registered(self, dxdf: DXDataFrame, filters: Optional[list] = None):
+        """
+        Registers the selected values of any dimension filters large enough to run as a
+        semi-join (see `DIMENSION_FILTER_SEMI_JOIN_THRESHOLD`) for the duration of a query,
+        so their SQL filter strings don't need to inline every value.
+        """
+        values_table_names = []
+        try:
+            for dex_filter in DEXFilterSettings(filters=filters or []).filters:
+                if not isinstance(dex_filter, DEXDimensionFilter) or not dex_filter.use_semi_join:
+                    continue
+                table_name = dex_filter.values_table_name
+                if table_name in values_table_names:
+                    continue
+                logger.debug(
+                    "registering filter values",
+                    table_name=table_name,
+                    num_values=len(dex_filter.value),
+                )
+                self.connection.register(table_name, dex_filter.values_frame(dxdf.df))
+                values_table_names.append(table_name)
+            yield
+        finally:
+            for table_name in values_table_names:
+                self.connection.unregister(table_name)
+
+
+class NumpyDatalinkBackend(DatalinkBackend):
+    """
+    Evaluates DEX filters as vectorized boolean masks directly against the cached
+    dataframe, so nothing needs to be copied or registered.
+    """
+
+    name = DXDatalinkBackend.numpy.value
+
+    def register(self, dxdf: DXDataFrame) -> None:
+        pass
+
+    def unregister(self, dxdf: DXDataFrame) -> None:
+        dxdf.filter_bitmaps.clear()
+        dxdf.text_indexes.clear()
+
+    def sample(
+        self,
+        dxdf: DXDataFrame,
+        filters: Optional[list] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        row_positions = self.filtered_row_positions(dxdf, filters)
+        if limit is not None:
+            row_positions = row_positions[:limit]
+        # only copy the rows we're keeping
+        return dxdf.df.take(row_positions)
+
+    def count(self, dxdf: DXDataFrame, filters: Optional[list] = None) -> int:
+        return len(self.filtered_row_positions(dxdf, filters))
+
+    def filtered_row_positions(
+        self,
+        dxdf: DXDataFrame,
+        filters: Optional[list] = None,
+    ) -> np.ndarray:
+        if not filters:
+            dxdf.filter_bitmaps.clear()
+            return np.arange(len(dxdf.df))
+
+        if settings.ENABLE_FILTER_BITMAP_CACHE:
+            mask = get_cached_filter_mask(dxdf, filters)
+        else:
+            dex_filters = DEXFilterSettings(filters=filters).filters
+            mask = np.logical_and.reduce([get_filter_mask(dxdf, f) for f in dex_filters])
+        return np.flatnonzero(mask)
+
+
+class PolarsDatalinkBackend(DatalinkBackend):
+    """
+    Copies registered dataframes into polars, applying DEX filters as polars expressions
+    and running SQL queries through a polars `SQLContext`. (Requires `polars` to be installed)
+    """
+
+    name = DXDatalinkBackend.polars.value
+
+    def register(self, dxdf: DXDataFrame) -> None:
+        logger.debug("registering to polars", table_name=dxdf.variable_name)
+        frame = to_polars(dxdf.df.reset_index())
+        POLARS_FRAMES[dxdf.variable_name] = frame
+        get_polars_context().register(dxdf.variable_name, frame.lazy())
+
+    def unregister(self, dxdf: DXDataFrame) -> None:
+        if POLARS_FRAMES.pop(dxdf.variable_name, None) is not None:
+            get_polars_context().unregister(dxdf.variable_name)
+
+    def query(
+        self,
+        dxdf: DXDataFrame,
+        query_string: str,
+        filters: Optional[list] = None,
+    ) -> pd.DataFrame:
+        query_string = query_string.format(table_name=dxdf.variable_name)
+        logger.debug("polars sql query string", query_string=query_string)
+        result = get_polars_context().execute(query_string)
+        # older polars versions return a LazyFrame
+        if hasattr(result, "collect"):
+            result = result.collect()
+        return from_polars(result)
+
+    def sample(
+        self,
+        dxdf: DXDataFrame,
+        filters: Optional[list] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        frame = self.filtered_frame(dxdf, filters)
+        if limit is not None:
+            frame = frame.head(limit)
+        return from_polars(frame.collect()).set_index(dxdf.index_name)
+
+    def count(self, dxdf: DXDataFrame, filters: Optional[list] = None) -> int:
+        import polars as pl
+
+        return self.filtered_frame(dxdf, filters).select(pl.count()).collect()[0, 0]
+
+    def filtered_frame(self, dxdf: DXDataFrame, filters: Optional[list] = None):
+        frame = POLARS_FRAMES[dxdf.variable_name].lazy()
+        if not filters:
+            return frame
+        dex_filters = DEXFilterSettings(filters=filters).filters
+        filter_exprs = [polars_filter_expr(dxdf, dex_filter) for dex_filter in dex_filters]
+        return frame.filter(reduce(operator.and_, filter_exprs))
+
+
+DATALINK_BACKENDS = {
+    backend.name: backend
+    for backend in [DuckDBDatalinkBackend, NumpyDatalinkBackend, PolarsDatalinkBackend]
+}
+
+
+def get_datalink_backend(db_connection=None) -> DatalinkBackend:
+    """
+    Returns the backend set by `settings.DATALINK_BACKEND`,
+    using `db_connection` (if provided) for duckdb.
+    """
+    backend_name = str(settings.DATALINK_BACKEND)
+    if backend_name == DXDatalinkBackend.duckdb.value:
+        return DuckDBDatalinkBackend(connection=db_connection)
+    if backend_name == DXDatalinkBackend.polars.value and not polars_installed():
+        logger.warning("`polars` is not installed; falling back to the numpy datalink backend")
+        backend_name = DXDatalinkBackend.numpy.value
+    return DATALINK_BACKENDS[backend_name]()
+
+
+def sql_select(
+    filters: Optional[list] = None,
+    limit: Optional[int] = None,
+    columns: str = "*",
+) -> str:
+    """
+    Returns a SQL query string with a `{table_name}` placeholder
+    for the given DEX filters and row limit.
+    """
+    query_string = f"SELECT {columns} FROM {{table_name}}"
+    if filters:
+        sql_filter_str = DEXFilterSettings(filters=filters).to_sql_query()
+        query_string = f"{query_string} WHERE {sql_filter_str}"
+    if limit is not None:
+        query_string = f"{query_string} LIMIT {limit}"
+    return query_string
+
+
+def get_cached_filter_mask(dxdf: DXDataFrame, filters: list) -> np.ndarray:
+    """
+    Combines per-filter row masks into a single boolean mask, only evaluating filters
+    that weren't applied in the previous request for this dataframe.
+
+    Each filter's mask is stored bit-packed (1 bit per row) on the DXDataFrame, so the
+    cache is dropped along with the parent dataframe, and masks for filters that are
+    no longer applied are discarded.
+    """
+    num_rows = len(dxdf.df)
+    dex_filters = DEXFilterSettings(filters=filters).filters
+
+    bitmaps = {}
+    for dex_filter in dex_filters:
+        filter_key = dex_filter.json(sort_keys=True)
+        bitmap = dxdf.filter_bitmaps.get(filter_key)
+        if bitmap is None:
+            logger.debug("evaluating filter", filter_key=filter_key)
+            metrics.CACHE_MISSES.inc(cache="filter_bitmap")
+            bitmap = np.packbits(get_filter_mask(dxdf, dex_filter))
+        else:
+            metrics.CACHE_HITS.inc(cache="filter_bitmap")
+        bitmaps[filter_key] = bitmap
+    dxdf.filter_bitmaps = bitmaps
+
+    combined_bitmap = np.bitwise_and.reduce(list(bitmaps.values()))
+    return np.unpackbits(combined_bitmap, count=num_rows).astype(bool)
+
+
+def get_filter_mask(dxdf: DXDataFrame, dex_filter: FilterTypes) -> np.ndarray:
+    """
+    Evaluates a single filter as a boolean row mask against the cached dataframe,
+    using the column's n-gram index for text filters if one is available.
+    """
+    if isinstance(dex_filter, DEXTextFilter):
+        text_index = get_text_index(dxdf, dex_filter.column)
+        if text_index is not None:
+            return text_index.mask(dex_filter)
+    return dex_filter.mask(dxdf.df)
+
+
+@lru_cache
+def get_polars_context():
+    import polars as pl
+
+    return pl.SQLContext()
+
+
+def to_polars(df: pd.DataFrame):
+    """
+    Converts a pandas DataFrame to polars column by column, since `pl.from_pandas()`
+    requires `pyarrow`.
+    """
+    import polars as pl
+
+    columns = []
+    for column, s in df.items():
+        if isinstance(s.dtype, pd.DatetimeTZDtype):
+            s = s.dt.tz_convert("UTC").dt.tz_localize(None)
+        if isinstance(s.dtype, np.dtype) and s.dtype.kind in "biufM":
+            values = s.to_numpy()
+        else:
+            # object/extension dtypes, with missing values as None
+            values = s.astype(object).where(s.notnull(), None).tolist()
+        try:
+            columns.append(pl.Series(str(column), values))
+        except (TypeError, ValueError):
+            # mixed-type values that polars can't infer a dtype for
+            columns.append(pl.Series(str(column), s.astype(str).tolist()))
+    return pl.DataFrame(columns)
+
+
+def from_polars(frame) -> pd.DataFrame:
+    """
+    Converts a polars DataFrame to pandas without requiring `pyarrow`.
+    """
+    import polars as pl
+
+    columns = {}
+    for column in frame.columns:
+        s = frame[column]
+        values = s.to_numpy()
+        # boolean columns come back as object arrays
+        if s.dtype == pl.Boolean and not s.null_count():
+            values = values.astype(bool)
+        columns[column] = values
+    return pd.DataFrame(columns)
+
+
+def polars_filter_expr(dxdf: DXDataFrame, dex_filter: FilterTypes):
+    """
+    Converts a DEX filter into a boolean polars expression, matching its SQL filter.
+    """
+    import polars as pl
+
+    column = pl.col(dex_filter.column)
+    if isinstance(dex_filter, DEXDateFilter):
+        # tz-aware columns are converted to (naive) UTC by to_polars(), matching DEXDateFilter.mask()
+        start = to_naive_utc(dex_filter.start).floor("us").to_pydatetime()
+        end = to_naive_utc(dex_filter.end).floor("us").to_pydatetime()
+        return column.is_between(start, end, closed="both")
+    if isinstance(dex_filter, DEXMetricFilter):
+        s = get_filter_series(dxdf.df, dex_filter.column)
+        if pd.api.types.is_integer_dtype(s):
+            # compared as integers, since int64 values above 2**53 aren't exact as floats
+            integer_bounds = dex_filter.integer_bounds(getattr(s.dtype, "numpy_dtype", s.dtype))
+            if integer_bounds is None:
+                return pl.lit(False)
+            return column.is_between(*integer_bounds, closed="both")
+        metric_min, metric_max = dex_filter.bounds
+        return column.cast(pl.Float64).is_between(
+            float(metric_min),
+            float(metric_max),
+            closed="both",
+        )
+    if isinstance(dex_filter, DEXDimensionFilter):
+        values = dex_filter.cast_values(get_filter_series(dxdf.df, dex_filter.column))
+        return column.is_in(list(values))
+    if isinstance(dex_filter, DEXTextFilter):
+        values = column.cast(pl.Utf8)
+        search = dex_filter.value
+        if not dex_filter.case_sensitive:
+            if dex_filter.predicate == "regex":
+                return values.str.contains(f"(?i){search}")
+            values = values.str.to_lowercase()
+            search = search.lower()
+        if dex_filter.predicate == "prefix":
+            return values.str.starts_with(search)
+        return values.str.contains(search, literal=dex_filter.predicate != "regex")
+    raise NotImplementedError(f"{dex_filter.type} filters aren't supported by the polars backend")
@@ -1,2 +1,4 @@
+from dx.comms.aggregation import handle_aggregation_comm
 from dx.comms.assignment import handle_assignment_comm
+from dx.comms.facets import handle_facets_comm
 from dx.comms.resample import handle_resample_comm
@@ -0,0 +1,60 @@
+import pandas as pd
+import structlog
+
+from dx.filtering import aggregate_from_db
+from dx.types.aggregation import DEXAggregationMessage
+
+logger = structlog.get_logger(__name__)
+
+
+# ref: https://jupyter-notebook.readthedocs.io/en/stable/comms.html#opening-a-comm-from-the-frontend
+def aggregator(comm, open_msg):
+    """
+    Datalink aggregation request.
+    """
+
+    @comm.on_msg
+    def _recv(msg):
+        response = handle_aggregation_comm(msg)
+        if response is not None:
+            comm.send(response)
+
+    comm.send({"status": "connected", "source": "aggregator"})
+
+
+def handle_aggregation_comm(msg: dict) -> dict:
+    data = msg.get("content", {}).get("data", {})
+    if not data:
+        return
+
+    logger.debug("handling aggregation", msg=msg)
+    msg = DEXAggregationMessage.parse_obj(data)
+    try:
+        agg_df = aggregate_from_db(msg)
+    except Exception as e:
+        logger.error(f"error handling aggregation request: {e}")
+        return {
+            "status": "error",
+            "source": "aggregator",
+            "display_id": msg.display_id,
+            "error": str(e),
+        }
+
+    return {
+        "status": "success",
+        "source": "aggregator",
+        "display_id": msg.display_id,
+        "data": aggregation_payload(agg_df),
+    }
+
+
+def aggregation_payload(df: pd.DataFrame) -> dict:
+    """
+    Converts aggregated rows to a compact column/row payload,
+    replacing `NaN`/`pd.NA` with `None`.
+    """
+    clean_df = df.astype(object).where(df.notnull(), None)
+    return {
+        "columns": [str(col) for col in clean_df.columns],
+        "data": clean_df.values.tolist(),
+    }
@@ -1,11 +1,11 @@
 from typing import Optional
 
+import pandas as pd
 import structlog
 from IPython import get_ipython
 from IPython.core.interactiveshell import InteractiveShell
 
-from dx.filtering import resample_from_db
-from dx.types.filters import DEXFilterSettings
+from dx.filtering import resample_from_backend
 from dx.utils.formatting import incrementing_label
 
 logger = structlog.get_logger(__name__)
@@ -34,24 +34,32 @@ def handle_assignment_comm(msg: dict, ipython_shell: Optional[InteractiveShell]
         filters = data["filters"]
         sample_size = data["sample_size"]
 
-        sql_filter = f"SELECT * FROM {{table_name}} LIMIT {sample_size}"
-        if filters:
-            dex_filters = DEXFilterSettings(filters=filters)
-            sql_filter_str = dex_filters.to_sql_query()
-            sql_filter = f"SELECT * FROM {{table_name}} WHERE {sql_filter_str} LIMIT {sample_size}"
-
-        sampled_df = resample_from_db(
+        sampled_df = resample_from_backend(
             display_id=data["display_id"],
-            sql_filter=sql_filter,
             filters=filters,
+            limit=sample_size,
             assign_subset=False,
         )
+        assign_dataframe(sampled_df, data["variable_name"], ipython_shell=ipython_shell)
+
 
-        ipython = ipython_shell or get_ipython()
-        variable_name = data["variable_name"]
+def assign_dataframe(
+    df: pd.DataFrame,
+    variable_name: str,
+    ipython_shell: Optional[InteractiveShell] = None,
+) -> None:
+    """
+    Assigns the dataframe to a variable in the user namespace.
+    """
+    ipython = ipython_shell or get_ipython()
 
-        # if the variable already exists in the user namespace, add a suffix so the previous value isn't overwritten
-        if variable_name in ipython.user_ns:
-            variable_name = incrementing_label(variable_name, ipython.user_ns)
-        logger.debug(f"assigning {len(sampled_df)}-row dataframe to `{variable_name}` in {ipython}")
-        ipython.user_ns[variable_name] = sampled_df
+    # if the variable already exists in the user namespace, add a suffix so the previous value isn't overwritten
+    if variable_name in ipython.user_ns:
+        variable_name = incrementing_label(variable_name, ipython.user_ns)
+    logger.debug(
+        "assigning dataframe",
+        num_rows=len(df),
+        variable_name=variable_name,
+        ipython_shell=ipython,
+    )
+    ipython.user_ns[variable_name] = df
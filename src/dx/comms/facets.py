@@ -0,0 +1,47 @@
+import structlog
+
+from dx.filtering import facets_from_db
+from dx.types.facets import DEXFacetsMessage
+
+logger = structlog.get_logger(__name__)
+
+
+# ref: https://jupyter-notebook.readthedocs.io/en/stable/comms.html#opening-a-comm-from-the-frontend
+def facet_counter(comm, open_msg):
+    """
+    Datalink facet counts request.
+    """
+
+    @comm.on_msg
+    def _recv(msg):
+        response = handle_facets_comm(msg)
+        if response is not None:
+            comm.send(response)
+
+    comm.send({"status": "connected", "source": "facet_counter"})
+
+
+def handle_facets_comm(msg: dict) -> dict:
+    data = msg.get("content", {}).get("data", {})
+    if not data:
+        return
+
+    logger.debug("handling facet counts", msg=msg)
+    msg = DEXFacetsMessage.parse_obj(data)
+    try:
+        payload = facets_from_db(msg)
+    except Exception as e:
+        logger.error(f"error handling facet counts request: {e}")
+        return {
+            "status": "error",
+            "source": "facet_counter",
+            "display_id": msg.display_id,
+            "error": str(e),
+        }
+
+    return {
+        "status": "success",
+        "source": "facet_counter",
+        "display_id": msg.display_id,
+        "data": payload,
+    }
@@ -1,9 +1,22 @@
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
 import structlog
 
-from dx.filtering import handle_resample
+from dx import metrics
+from dx.filtering import LATEST_RESAMPLE_REQUESTS, handle_resample
+from dx.settings import get_settings
 from dx.types.filters import DEXResampleMessage
 
 logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# a single worker keeps resample requests ordered while keeping the kernel's shell thread free
+# (duckdb queries from the worker and the shell thread are serialized by DB_CONNECTION_LOCK)
+RESAMPLE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dx-resample")
+# (display_id: Future) pairs for the most recently submitted resample request per display
+PENDING_RESAMPLES = {}
 
 
 # ref: https://jupyter-notebook.readthedocs.io/en/stable/comms.html#opening-a-comm-from-the-frontend
@@ -14,17 +27,77 @@ def resampler(comm, open_msg):
 
     @comm.on_msg
     def _recv(msg):
-        handle_resample_comm(msg)
-        comm.send({"status": "success", "source": "resampler"})
+        future = handle_resample_comm(msg)
+        if future is None:
+            comm.send({"status": "success", "source": "resampler"})
+            return
+        future.add_done_callback(lambda f: comm.send(resample_status(f)))
 
     comm.send({"status": "connected", "source": "resampler"})
 
 
-def handle_resample_comm(msg):
+def handle_resample_comm(msg) -> Optional[Future]:
     data = msg.get("content", {}).get("data", {})
     if not data:
         return
 
-    logger.debug(f"handling resample {msg=}")
+    logger.debug("handling resample", msg=msg)
     msg = DEXResampleMessage.parse_obj(data)
-    handle_resample(msg)
+    if not settings.ENABLE_ASYNC_RESAMPLE:
+        handle_resample(msg)
+        return
+    return submit_resample(msg)
+
+
+def submit_resample(msg: DEXResampleMessage) -> Future:
+    """
+    Queues a resample request on the background worker, marking it as the latest
+    request for its display ID. Any request still waiting in the queue for the same
+    display ID is cancelled, and one that's already running will skip its
+    display update once it finishes.
+    """
+    display_id = msg.display_id
+    LATEST_RESAMPLE_REQUESTS[display_id] = msg
+
+    previous_future = PENDING_RESAMPLES.get(display_id)
+    if previous_future is not None and previous_future.cancel():
+        logger.debug("cancelled queued resample request", display_id=display_id)
+        metrics.RESAMPLES.inc(backend=str(settings.DATALINK_BACKEND), status="cancelled")
+
+    # run with a copy of the caller's context so any settings_context() overrides carry over
+    context = contextvars.copy_context()
+    future = RESAMPLE_EXECUTOR.submit(context.run, handle_resample, msg)
+    PENDING_RESAMPLES[display_id] = future
+    future.add_done_callback(lambda f: cleanup_resample(msg, f))
+    return future
+
+
+def cleanup_resample(msg: DEXResampleMessage, future: Future) -> None:
+    """
+    Removes tracking for a finished resample request, unless a newer
+    request for the same display ID has already replaced it.
+    """
+    display_id = msg.display_id
+    if PENDING_RESAMPLES.get(display_id) is future:
+        PENDING_RESAMPLES.pop(display_id, None)
+    if LATEST_RESAMPLE_REQUESTS.get(display_id) is msg:
+        LATEST_RESAMPLE_REQUESTS.pop(display_id, None)
+
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"error handling resample request: {future.exception()}")
+
+
+def resample_status(future: Future) -> dict:
+    """
+    Builds the comm status message sent back to the frontend once a resample request is done.
+    """
+    if future.cancelled():
+        status = "cancelled"
+    elif future.exception() is not None:
+        status = "error"
+    elif future.result() is None:
+        # superseded by a newer request before the display was updated
+        status = "cancelled"
+    else:
+        status = "success"
+    return {"status": status, "source": "resampler"}
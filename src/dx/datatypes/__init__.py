@@ -1,3 +1,4 @@
+from dx.datatypes.dataset import *
 from dx.datatypes.date_time import *
 from dx.datatypes.geometry import *
 from dx.datatypes.main import *
@@ -1,11 +1,17 @@
+import multiprocessing
+import os
 import traceback
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Union
 
 import pandas as pd
+import structlog
 from pandas.io.json import build_table_schema
 
 from dx.settings import get_settings
 
+logger = structlog.get_logger(__name__)
 settings = get_settings()
 
 
@@ -205,3 +211,182 @@ def test_dx_handling(value: Any, as_dataframe: bool = False) -> dict:
     if as_dataframe:
         return pd.DataFrame(result).transpose()
     return result
+
+
+COMPATIBILITY_CHECKS = [
+    "pandas.io.json.build_table_schema",
+    "jupyter_client.jsonutil.json_clean",
+    "duckdb.conn.register",
+    "dx.handle_format",
+]
+
+
+def check_build_table_schema(df: pd.DataFrame) -> str:
+    schema = build_table_schema(df, index=False)
+    return schema["fields"][0]["type"]
+
+
+def check_json_clean(df: pd.DataFrame) -> str:
+    from jupyter_client.jsonutil import json_clean
+
+    clean_json = json_clean(df.to_dict("records"))
+    return ", ".join(sorted({type(row[df.columns[0]]).__name__ for row in clean_json}))
+
+
+def check_db_write(df: pd.DataFrame, db_connection) -> str:
+    db_connection.register("test", df)
+    try:
+        return db_connection.execute("DESCRIBE SELECT * FROM test").fetchall()[0][1]
+    finally:
+        db_connection.unregister("test")
+
+
+def check_dx_handling(df: pd.DataFrame) -> str:
+    # the same path handle_format() takes with datalink disabled, without toggling
+    # ENABLE_DATALINK (a global setting that re-registers the comm targets on every change)
+    from dx.formatters.main import format_without_datalink  # circular import
+    from dx.utils.formatting import is_default_index
+
+    payload, _ = format_without_datalink(
+        df.copy(),
+        default_index_used=is_default_index(df.index),
+        with_ipython_display=False,
+    )
+    fields = payload[settings.MEDIA_TYPE]["schema"]["fields"]
+    # the first field is the index
+    return fields[-1]["type"]
+
+
+def check_column_compatibility(series: pd.Series, db_connection) -> dict:
+    """
+    Runs a column through each step of the dx display process,
+    returning the resulting type (or error) per step.
+    """
+    df = series.to_frame(name="test")
+    checks = {
+        "pandas.io.json.build_table_schema": check_build_table_schema,
+        "jupyter_client.jsonutil.json_clean": check_json_clean,
+        "duckdb.conn.register": lambda df: check_db_write(df, db_connection),
+        "dx.handle_format": check_dx_handling,
+    }
+    result = {}
+    for check_name, check in checks.items():
+        try:
+            result[check_name] = {"success": True, "type": check(df)}
+        except Exception as e:
+            result[check_name] = {"success": False, "error": str(e)}
+    return result
+
+
+def set_worker_display_mode(display_mode: str) -> None:
+    # only the setting is needed (not the IPython formatters) for handle_format()
+    settings.DISPLAY_MODE = display_mode
+
+
+def test_compatibility_batch(
+    data: Union[pd.DataFrame, pd.Series, list],
+    as_dataframe: bool = True,
+    max_workers: Optional[int] = None,
+    use_processes: bool = True,
+) -> Union[pd.DataFrame, dict]:
+    """
+    Batch version of `test_compatibility()` that checks every column of a dataframe
+    (or every value of a list, each as its own column) against the same dx display steps,
+    spreading the columns across a process pool.
+
+    Returns a compatibility matrix with a row per column/value and a column per check,
+    which is `True` if the check passed; the types and errors of each check are
+    included in the `details` column (or returned directly if `as_dataframe` is `False`).
+
+    Parameters
+    ----------
+    data: Union[pd.DataFrame, pd.Series, list]
+        The dataframe columns, series, or list of values to test compatibility with.
+    as_dataframe: bool
+        Whether to return the results as a pandas DataFrame (if `True`),
+        or as a dictionary of results per column (if `False`)
+    max_workers: Optional[int]
+        Number of worker processes to use; defaults to the number of CPUs
+    use_processes: bool
+        Whether to run the checks in a process pool (if `True`),
+        or one column at a time in the current process (if `False`)
+    """
+    if isinstance(data, pd.DataFrame):
+        columns = {column: data[column] for column in data.columns}
+        dtypes = [str(dtype) for dtype in data.dtypes]
+    elif isinstance(data, pd.Series):
+        columns = {data.name if data.name is not None else 0: data}
+        dtypes = [str(data.dtype)]
+    else:
+        # same as test_compatibility(value)
+        columns = {i: pd.Series([value]) for i, value in enumerate(data)}
+        dtypes = [type(value).__name__ for value in data]
+
+    results = {}
+    if use_processes and len(columns) > 1 and max_workers != 1:
+        results = check_columns_in_processes(columns, max_workers=max_workers)
+    # columns that couldn't be sent to (or back from) a worker process are checked here
+    remaining_columns = {column: columns[column] for column in columns if column not in results}
+    if remaining_columns:
+        results.update(check_columns_compatibility(remaining_columns))
+    results = {column: results[column] for column in columns}
+
+    if not as_dataframe:
+        return results
+
+    matrix = pd.DataFrame(
+        {
+            check_name: [results[column][check_name]["success"] for column in columns]
+            for check_name in COMPATIBILITY_CHECKS
+        },
+        index=pd.Index(list(columns), name="column"),
+    )
+    matrix.insert(0, "dtype", dtypes)
+    matrix["details"] = [results[column] for column in columns]
+    return matrix
+
+
+def check_columns_compatibility(columns: Dict[Any, pd.Series]) -> dict:
+    import duckdb
+
+    # a separate connection, so nothing is registered with the datalink connection
+    db_connection = duckdb.connect()
+    try:
+        return {
+            column: check_column_compatibility(series, db_connection)
+            for column, series in columns.items()
+        }
+    finally:
+        db_connection.close()
+
+
+def check_columns_in_processes(columns: Dict[Any, pd.Series], max_workers: Optional[int]) -> dict:
+    max_workers = max_workers or os.cpu_count() or 1
+    # a few batches of columns per worker, rather than one task per column,
+    # to cut down on inter-process overhead while keeping the workers evenly loaded
+    column_names = list(columns)
+    num_batches = min(len(column_names), max_workers * 4)
+    batches = [column_names[i::num_batches] for i in range(num_batches)]
+
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        # forking a kernel process with duckdb (and IPython) threads running isn't safe
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=set_worker_display_mode,
+        initargs=(str(settings.DISPLAY_MODE),),
+    ) as executor:
+        futures = [
+            executor.submit(check_columns_compatibility, {name: columns[name] for name in batch})
+            for batch in batches
+        ]
+        for future in futures:
+            try:
+                results.update(future.result())
+            except BrokenProcessPool:
+                # a worker crashed, so the remaining columns are checked in-process
+                logger.warning("compatibility worker process failed")
+                break
+            except Exception as e:
+                logger.debug("unable to check columns in worker process", error=e)
+    return results
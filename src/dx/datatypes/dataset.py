@@ -0,0 +1,205 @@
+import glob
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from dx.datatypes.main import random_dataframe
+from dx.dependencies import package_installed
+
+logger = structlog.get_logger(__name__)
+
+__all__ = [
+    "write_random_dataset",
+    "register_random_dataset",
+]
+
+DATASET_FILE_FORMATS = {
+    "parquet": "parquet",
+    "arrow": "arrow",
+}
+
+
+def dataset_file_paths(path: str, file_format: str = "parquet") -> List[str]:
+    extension = DATASET_FILE_FORMATS[file_format]
+    return sorted(glob.glob(os.path.join(path, f"part-*.{extension}")))
+
+
+def prepare_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts values that can't be written to parquet/arrow as-is
+    (like `type`s, geometries, and nested objects) to strings,
+    the same way they would be before duckdb registration.
+    """
+    from dx.utils.formatting import normalize_index_and_columns  # circular import
+
+    return normalize_index_and_columns(df)
+
+
+def write_parquet_chunk(df: pd.DataFrame, file_path: str, row_group_size: int) -> None:
+    # written with duckdb (rather than pyarrow, which isn't a dx dependency),
+    # using a separate connection so the chunk isn't registered with the datalink connection
+    import duckdb
+
+    escaped_path = file_path.replace("'", "''")
+    conn = duckdb.connect()
+    try:
+        conn.register("dx_dataset_chunk", df)
+        conn.execute(
+            f"COPY dx_dataset_chunk TO '{escaped_path}' "
+            f"(FORMAT PARQUET, ROW_GROUP_SIZE {int(row_group_size)})"
+        )
+    finally:
+        conn.close()
+
+
+def write_arrow_chunk(df: pd.DataFrame, file_path: str, row_group_size: int) -> None:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(file_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=row_group_size)
+
+
+def write_random_dataset(
+    path: str,
+    num_rows: int,
+    chunk_size: int = 1_000_000,
+    row_group_size: int = 100_000,
+    seed: int = 0,
+    file_format: str = "parquet",
+    register: bool = False,
+    table_name: Optional[str] = None,
+    db_connection=None,
+    overwrite: bool = False,
+    **random_dataframe_kwargs,
+) -> List[str]:
+    """
+    Writes `num_rows` rows of `random_dataframe()` data to `path` as a directory of
+    `part-NNNNN.parquet` (or `.arrow`) files, generating and writing one chunk of
+    `chunk_size` rows at a time so the full dataset never has to fit in memory.
+    Returns the paths of the files written.
+
+    The same `seed`, `chunk_size`, and column options always generate the same files.
+
+    Parameters
+    ----------
+    path : str
+        Directory to write the dataset files to (created if it doesn't exist)
+    num_rows : int
+        Total number of rows to generate
+    chunk_size : int
+        Number of rows to generate (and hold in memory) at a time; one file is written per chunk
+    row_group_size : int
+        Number of rows per parquet row group (or arrow record batch); duckdb writes parquet
+        row groups in multiples of its 2048-row vector size, so this is rounded up to one
+    seed : int
+        Seed used to derive an independent random generator for each chunk
+    file_format : str
+        `"parquet"`, or `"arrow"` for Arrow IPC files (requires `pyarrow` to be installed)
+    register : bool
+        Whether to register the written files as a duckdb view (see `register_random_dataset()`)
+    table_name : Optional[str]
+        Name of the duckdb view if `register` is set; defaults to the directory name
+    db_connection : Optional[duckdb.DuckDBPyConnection]
+        Connection to register the view with; defaults to the dx datalink connection
+    overwrite : bool
+        Whether to delete any existing dataset files in `path` first; otherwise
+        a `FileExistsError` is raised if there are any
+    **random_dataframe_kwargs
+        Column options passed to `random_dataframe()`, like `text_column=True`
+    """
+    if file_format not in DATASET_FILE_FORMATS:
+        raise ValueError(
+            f"`{file_format}` is not a supported file format, use one of {list(DATASET_FILE_FORMATS)}"
+        )
+    if file_format == "arrow" and not package_installed("pyarrow"):
+        raise ImportError("pyarrow is required to write random datasets as Arrow files")
+    if chunk_size <= 0 or row_group_size <= 0:
+        raise ValueError("`chunk_size` and `row_group_size` must be positive")
+    if "seed" in random_dataframe_kwargs or "num_rows" in random_dataframe_kwargs:
+        raise ValueError("use `write_random_dataset(seed=..., num_rows=...)` instead")
+
+    os.makedirs(path, exist_ok=True)
+    existing_paths = dataset_file_paths(path, file_format)
+    if existing_paths:
+        if not overwrite:
+            raise FileExistsError(
+                f"`{path}` already contains {len(existing_paths)} dataset file(s); "
+                "pass `overwrite=True` to replace them"
+            )
+        # don't leave parts from a previous (larger) dataset behind
+        logger.debug("removing existing dataset files", path=path, num_files=len(existing_paths))
+        for existing_path in existing_paths:
+            os.remove(existing_path)
+
+    write_chunk = write_arrow_chunk if file_format == "arrow" else write_parquet_chunk
+    num_chunks = -(-num_rows // chunk_size)
+    chunk_seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+
+    file_paths = []
+    for chunk_num, chunk_seed in enumerate(chunk_seeds):
+        chunk_rows = min(chunk_size, num_rows - chunk_num * chunk_size)
+        chunk = random_dataframe(
+            num_rows=chunk_rows,
+            seed=np.random.default_rng(chunk_seed),
+            **random_dataframe_kwargs,
+        )
+        chunk = prepare_chunk(chunk)
+
+        file_path = os.path.join(path, f"part-{chunk_num:05d}.{DATASET_FILE_FORMATS[file_format]}")
+        write_chunk(chunk, file_path, row_group_size)
+        file_paths.append(file_path)
+        logger.debug("wrote dataset chunk", file_path=file_path, num_rows=chunk_rows)
+        del chunk
+
+    if register:
+        register_random_dataset(
+            path,
+            table_name=table_name,
+            file_format=file_format,
+            db_connection=db_connection,
+        )
+    return file_paths
+
+
+def register_random_dataset(
+    path: str,
+    table_name: Optional[str] = None,
+    file_format: str = "parquet",
+    db_connection=None,
+) -> str:
+    """
+    Creates (or replaces) a duckdb view over every file of a dataset written with
+    `write_random_dataset()`, which reads from the files instead of loading them into
+    memory. Returns the view name, which defaults to the dataset's directory name.
+    """
+    from dx.utils.tracking import DB_CONNECTION_LOCK, get_db_connection  # circular import
+
+    if db_connection is None:
+        db_connection = get_db_connection()
+
+    table_name = table_name or os.path.basename(os.path.normpath(path))
+    escaped_table_name = table_name.replace('"', '""')
+
+    if file_format == "arrow":
+        # duckdb can't read arrow IPC files directly, but scans (lazy) pyarrow datasets
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(dataset_file_paths(path, file_format), format="ipc")
+        with DB_CONNECTION_LOCK:
+            db_connection.register(f"{table_name}_arrow_dataset", dataset)
+        source = f'"{escaped_table_name}_arrow_dataset"'
+    else:
+        glob_path = os.path.join(path, "part-*.parquet").replace("'", "''")
+        source = f"read_parquet('{glob_path}')"
+
+    with DB_CONNECTION_LOCK:
+        db_connection.execute(
+            f'CREATE OR REPLACE VIEW "{escaped_table_name}" AS SELECT * FROM {source}'
+        )
+    logger.debug("registered random dataset", path=path, table_name=table_name)
+    return table_name
@@ -1,4 +1,5 @@
 import datetime
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -19,8 +20,38 @@ __all__ = [
     "generate_time_delta_series",
 ]
 
+# seeded series are generated around this (rather than the current) time,
+# so the same seed always generates the same values
+SEEDED_ANCHOR_TIMESTAMP = "2023-01-01 12:00:00"
 
-def generate_datetime_series(num_rows: int) -> pd.Series:
+
+def anchor_timestamp(
+    rng: Optional[np.random.Generator] = None,
+    tz: Optional[datetime.tzinfo] = None,
+) -> pd.Timestamp:
+    """
+    Returns the time random values are generated around: a fixed timestamp if a seed
+    or generator is provided, otherwise the current time.
+    """
+    if rng is None:
+        return pd.Timestamp("now", tz=tz)
+    return pd.Timestamp(SEEDED_ANCHOR_TIMESTAMP, tz=tz)
+
+
+def random_hour_offsets(
+    num_rows: int,
+    low: int = -1000,
+    high: int = 1000,
+    rng: Optional[np.random.Generator] = None,
+) -> pd.TimedeltaIndex:
+    """
+    Returns `num_rows` random whole-hour offsets in [`low`, `high`).
+    """
+    rng = np.random.default_rng(rng)
+    return pd.to_timedelta(rng.integers(low, high, size=num_rows), unit="h")
+
+
+def generate_datetime_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `datetime.datetime` values.
 
@@ -28,18 +59,18 @@ def generate_datetime_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator (or seed) to use; values are generated around the
+        current time if not provided, otherwise around a fixed time
     """
-    return pd.Series(
-        [
-            (
-                pd.Timestamp("now") + pd.Timedelta(f"{np.random.randint(-1000, 1000)} hours")
-            ).to_pydatetime()
-            for _ in range(num_rows)
-        ]
-    )
+    return pd.Series(anchor_timestamp(rng) + random_hour_offsets(num_rows, rng=rng))
 
 
-def generate_datetimetz_series(num_rows: int, timezone_source: str = "datetime") -> pd.Series:
+def generate_datetimetz_series(
+    num_rows: int,
+    timezone_source: str = "datetime",
+    rng: Optional[np.random.Generator] = None,
+) -> pd.Series:
     """
     Generate a series of random `datetime.datetime` values with `datetime.timezone` information.
 
@@ -47,6 +78,9 @@ def generate_datetimetz_series(num_rows: int, timezone_source: str = "datetime")
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator (or seed) to use; values are generated around the
+        current time if not provided, otherwise around a fixed time
     """
     # by default, pandas will use pytz for timezone information,
     # but for testing rendering compatibility, we want to make sure
@@ -55,15 +89,10 @@ def generate_datetimetz_series(num_rows: int, timezone_source: str = "datetime")
     if timezone_source == "pytz":
         tz = "UTC"
 
-    return pd.Series(
-        [
-            (pd.Timestamp("now", tz=tz) + pd.Timedelta(f"{np.random.randint(-1000, 1000)} hours"))
-            for _ in range(num_rows)
-        ]
-    )
+    return pd.Series(anchor_timestamp(rng, tz=tz) + random_hour_offsets(num_rows, rng=rng))
 
 
-def generate_date_series(num_rows: int) -> pd.Series:
+def generate_date_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `datetime.date` values.
 
@@ -71,16 +100,15 @@ def generate_date_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator (or seed) to use; values are generated around the
+        current time if not provided, otherwise around a fixed time
     """
-    return pd.Series(
-        [
-            (pd.Timestamp("now") + pd.Timedelta(f"{np.random.randint(-1000, 1000)} hours")).date()
-            for _ in range(num_rows)
-        ]
-    )
+    datetimes = anchor_timestamp(rng) + random_hour_offsets(num_rows, rng=rng)
+    return pd.Series(datetimes.date)
 
 
-def generate_time_series(num_rows: int) -> pd.Series:
+def generate_time_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `datetime.time` values.
 
@@ -88,16 +116,17 @@ def generate_time_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator (or seed) to use; values are generated around the
+        current time if not provided, otherwise around a fixed time
     """
-    return pd.Series(
-        [
-            (pd.Timestamp("now") + pd.Timedelta(f"{np.random.randint(-1000, 1000)} hours")).time()
-            for _ in range(num_rows)
-        ]
-    )
+    datetimes = anchor_timestamp(rng) + random_hour_offsets(num_rows, rng=rng)
+    return pd.Series(datetimes.time)
 
 
-def generate_time_period_series(num_rows: int) -> pd.Series:
+def generate_time_period_series(
+    num_rows: int, rng: Optional[np.random.Generator] = None
+) -> pd.Series:
     """
     Generate a series of random `pd.Period` values.
 
@@ -105,18 +134,17 @@ def generate_time_period_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator (or seed) to use; values are generated around the
+        current time if not provided, otherwise around a fixed time
     """
-    return pd.Series(
-        [
-            (
-                pd.Timestamp("now") + pd.Timedelta(f"{np.random.randint(-1000, 1000)} hours")
-            ).to_period(freq="W")
-            for _ in range(num_rows)
-        ]
-    )
+    datetimes = anchor_timestamp(rng) + random_hour_offsets(num_rows, rng=rng)
+    return pd.Series(datetimes.to_period(freq="W"))
 
 
-def generate_time_interval_series(num_rows: int) -> pd.Series:
+def generate_time_interval_series(
+    num_rows: int, rng: Optional[np.random.Generator] = None
+) -> pd.Series:
     """
     Generate a series of random `pd.Interval` values with `pd.Timestamp` left/right values.
 
@@ -124,19 +152,23 @@ def generate_time_interval_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator (or seed) to use; values are generated around the
+        current time if not provided, otherwise around a fixed time
     """
+    anchor = anchor_timestamp(rng)
+    rng = np.random.default_rng(rng)
     return pd.Series(
-        [
-            pd.Interval(
-                pd.Timestamp("now") + pd.Timedelta(f"{np.random.randint(-1000, 0)} hours"),
-                pd.Timestamp("now") + pd.Timedelta(f"{np.random.randint(0, 1000)} hours"),
-            )
-            for _ in range(num_rows)
-        ]
+        pd.arrays.IntervalArray.from_arrays(
+            anchor + random_hour_offsets(num_rows, low=-1000, high=0, rng=rng),
+            anchor + random_hour_offsets(num_rows, low=0, high=1000, rng=rng),
+        )
     )
 
 
-def generate_time_delta_series(num_rows: int) -> pd.Series:
+def generate_time_delta_series(
+    num_rows: int, rng: Optional[np.random.Generator] = None
+) -> pd.Series:
     """
     Generate a series of random `pd.Timedelta` values.
 
@@ -144,16 +176,16 @@ def generate_time_delta_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series(
-        [pd.Timedelta(f"{np.random.randint(-1000, 1000)} hours") for _ in range(num_rows)]
-    )
+    return pd.Series(random_hour_offsets(num_rows, rng=rng))
 
 
 def handle_time_period_series(s: pd.Series) -> pd.Series:
     types = (pd.Period, pd.PeriodIndex)
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has pd.Period values; converting to string")
+        logger.debug("series has pd.Period values; converting to string", column=s.name)
         s = s.apply(lambda x: [x.start_time, x.end_time] if isinstance(x, types) else x)
     return s
 
@@ -165,7 +197,7 @@ def handle_time_delta_series(s: pd.Series) -> pd.Series:
         pd.Timedelta,
     )
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has pd.TimeDelta values; converting to total seconds")
+        logger.debug("series has pd.TimeDelta values; converting to total seconds", column=s.name)
         s = s.apply(lambda x: x.total_seconds() if isinstance(x, types) else x)
     return s
 
@@ -180,7 +212,8 @@ def handle_datetime_series(s: pd.Series) -> pd.Series:
     has_tzinfo = sample_rows.apply(lambda x: hasattr(x, "tzinfo"))
     if any(isinstance(v, types) for v in sample_rows.values):
         logger.debug(
-            f"series `{s.name}` has datetime values; converting with pd.to_datetime()",
+            "series has datetime values; converting with pd.to_datetime()",
+            column=s.name,
             utc=has_tzinfo.any(),
         )
         s = pd.to_datetime(s, utc=has_tzinfo.any())
@@ -1,4 +1,4 @@
-import random
+import sys
 from typing import Optional
 
 import numpy as np
@@ -7,11 +7,6 @@ import structlog
 
 from dx.dependencies import geopandas_installed
 
-if geopandas_installed():
-    import geopandas as gpd
-    import shapely.geometry.base
-    from shapely.geometry import mapping
-
 logger = structlog.get_logger(__name__)
 
 __all__ = [
@@ -23,7 +18,17 @@ __all__ = [
 ]
 
 
-def generate_lat_float_series(num_rows: int):
+def random_lats(num_rows: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    rng = np.random.default_rng(rng)
+    return rng.integers(-90, 89, endpoint=True, size=num_rows) + rng.random(num_rows)
+
+
+def random_lons(num_rows: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    rng = np.random.default_rng(rng)
+    return rng.integers(-180, 179, endpoint=True, size=num_rows) + rng.random(num_rows)
+
+
+def generate_lat_float_series(num_rows: int, rng: Optional[np.random.Generator] = None):
     """
     Generate a series of random `float` values representing latitude values.
 
@@ -31,11 +36,13 @@ def generate_lat_float_series(num_rows: int):
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series([random.randint(-90, 89) + np.random.rand() for _ in range(num_rows)])
+    return pd.Series(random_lats(num_rows, rng=rng))
 
 
-def generate_lon_float_series(num_rows: int):
+def generate_lon_float_series(num_rows: int, rng: Optional[np.random.Generator] = None):
     """
     Generate a series of random `float` values representing longitude values.
 
@@ -43,11 +50,13 @@ def generate_lon_float_series(num_rows: int):
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series([random.randint(-180, 179) + np.random.rand() for _ in range(num_rows)])
+    return pd.Series(random_lons(num_rows, rng=rng))
 
 
-def generate_latlon_series(num_rows: int):
+def generate_latlon_series(num_rows: int, rng: Optional[np.random.Generator] = None):
     """
     Generate a series of `shapely.geometry.Point`s with latitude and longitude values.
 
@@ -55,19 +64,25 @@ def generate_latlon_series(num_rows: int):
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
     if not geopandas_installed():
         logger.warning("geopandas is not installed, skipping generate_latlon_series")
         return np.nan
 
-    lats = [random.randint(-90, 89) + np.random.rand() for _ in range(num_rows)]
-    lons = [random.randint(-180, 179) + np.random.rand() for _ in range(num_rows)]
+    import geopandas as gpd
+
+    rng = np.random.default_rng(rng)
+    lats = random_lats(num_rows, rng=rng)
+    lons = random_lons(num_rows, rng=rng)
     return gpd.GeoSeries(gpd.points_from_xy(lons, lats))
 
 
 def generate_filled_geojson_series(
     num_rows: int,
     existing_latlon_series: Optional[pd.Series] = None,
+    rng: Optional[np.random.Generator] = None,
 ):
     """
     Generate a series of `shapely.geometry.Polygon` values by
@@ -80,22 +95,27 @@ def generate_filled_geojson_series(
         Number of rows to generate
     existing_latlon_series: Optional[pd.Series]
         If provided, use this series of `shapely.geometry.Point` values
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
     if not geopandas_installed():
         logger.warning("geopandas is not installed, skipping filled_geojson_column")
         return np.nan
 
+    import geopandas as gpd
+
+    rng = np.random.default_rng(rng)
     if existing_latlon_series is None:
-        latlon_series = generate_latlon_series(num_rows)
+        latlon_series = generate_latlon_series(num_rows, rng=rng)
     else:
         latlon_series = existing_latlon_series
-    buffer_series = gpd.GeoSeries(latlon_series).apply(lambda x: x.buffer(np.random.rand()))
-    return gpd.GeoSeries(buffer_series)
+    return gpd.GeoSeries(latlon_series).buffer(rng.random(len(latlon_series)))
 
 
 def generate_exterior_bounds_geojson_series(
     num_rows: int,
     existing_latlon_series: Optional[pd.Series] = None,
+    rng: Optional[np.random.Generator] = None,
 ):
     """
     Generate a series of `shapely.geometry.Polygon` values by
@@ -109,34 +129,42 @@ def generate_exterior_bounds_geojson_series(
         Number of rows to generate
     existing_latlon_series: Optional[pd.Series]
         If provided, use this series of `shapely.geometry.Point` values
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
     if not geopandas_installed():
         logger.warning("geopandas is not installed, skipping exterior_geojson_column")
         return np.nan
 
+    import geopandas as gpd
+
+    rng = np.random.default_rng(rng)
     if existing_latlon_series is None:
-        latlon_series = generate_latlon_series(num_rows)
+        latlon_series = generate_latlon_series(num_rows, rng=rng)
     else:
         latlon_series = existing_latlon_series
 
-    envelope_series = gpd.GeoSeries(latlon_series).apply(
-        lambda x: x.buffer(np.random.rand()).envelope.exterior
-    )
-    return gpd.GeoSeries(envelope_series)
+    buffer_series = gpd.GeoSeries(latlon_series).buffer(rng.random(len(latlon_series)))
+    return buffer_series.envelope.exterior
 
 
 def handle_geometry_series(s: pd.Series) -> pd.Series:
     """
     Converts shapely.geometry values to JSON.
     """
-    if not geopandas_installed():
+    # geometry values can't exist unless shapely has already been imported,
+    # so there's no need to import it (or check every series) otherwise
+    if "shapely" not in sys.modules:
         return s
 
+    import shapely.geometry.base
+    from shapely.geometry import mapping
+
     types = (
         shapely.geometry.base.BaseGeometry,
         shapely.geometry.base.BaseMultipartGeometry,
     )
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has geometries; converting to JSON")
+        logger.debug("series has geometries; converting to JSON", column=s.name)
         s = s.apply(lambda x: mapping(x) if isinstance(x, types) else x)
     return s
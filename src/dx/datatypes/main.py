@@ -1,3 +1,5 @@
+from typing import Optional, Union
+
 import numpy as np
 import pandas as pd
 import structlog
@@ -101,6 +103,7 @@ def random_dataframe(
     ipv6_address_column: bool = False,
     complex_number_column: bool = False,
     uuid4_column: bool = False,
+    seed: Optional[Union[int, np.random.Generator]] = None,
 ):  # noqa: C901
     """
     Convenience function to generate a dataframe of `num_rows` length
@@ -164,99 +167,108 @@ def random_dataframe(
         Whether to include a column of `complex` values
     uuid4_column : bool
         Whether to include a column of `uuid.UUID` values
+    seed : Optional[Union[int, np.random.Generator]]
+        Seed (or `np.random.Generator`) used to generate every column's values,
+        for reproducible dataframes (date/time values are generated around a fixed time
+        instead of the current time)
     """
+    rng = np.random.default_rng(seed)
     df = pd.DataFrame(index=list(range(num_rows)))
 
     if dtype_column:
-        df["dtype_column"] = misc.generate_dtype_series(num_rows)
+        df["dtype_column"] = misc.generate_dtype_series(num_rows, rng=rng)
 
     if bool_column:
-        df["bool_column"] = misc.generate_boolean_series(num_rows)
+        df["bool_column"] = misc.generate_boolean_series(num_rows, rng=rng)
 
     # numeric columns
     if integer_column:
-        df["integer_column"] = numeric.generate_integer_series(num_rows)
+        df["integer_column"] = numeric.generate_integer_series(num_rows, rng=rng)
 
     if float_column:
-        df["float_column"] = numeric.generate_float_series(num_rows)
+        df["float_column"] = numeric.generate_float_series(num_rows, rng=rng)
 
     if decimal_column:
-        df["decimal_column"] = numeric.generate_decimal_series(num_rows)
+        df["decimal_column"] = numeric.generate_decimal_series(num_rows, rng=rng)
 
     if complex_number_column:
-        df["complex_number_column"] = numeric.generate_complex_number_series(num_rows)
+        df["complex_number_column"] = numeric.generate_complex_number_series(num_rows, rng=rng)
 
-    # date/time columns
+    # date/time columns, generated around a fixed time if seeded, otherwise the current time
+    date_rng = rng if seed is not None else None
     if datetime_column:
-        df["datetime_column"] = date_time.generate_datetime_series(num_rows)
+        df["datetime_column"] = date_time.generate_datetime_series(num_rows, rng=date_rng)
 
     if datetimetz_column:
-        df["datetimetz_column"] = date_time.generate_datetimetz_series(num_rows)
+        df["datetimetz_column"] = date_time.generate_datetimetz_series(num_rows, rng=date_rng)
 
     if date_column:
-        df["date_column"] = date_time.generate_date_series(num_rows)
+        df["date_column"] = date_time.generate_date_series(num_rows, rng=date_rng)
 
     if time_column:
-        df["time_column"] = date_time.generate_time_series(num_rows)
+        df["time_column"] = date_time.generate_time_series(num_rows, rng=date_rng)
 
     if time_delta_column:
-        df["time_delta_column"] = date_time.generate_time_delta_series(num_rows)
+        df["time_delta_column"] = date_time.generate_time_delta_series(num_rows, rng=rng)
 
     if time_period_column:
-        df["time_period_column"] = date_time.generate_time_period_series(num_rows)
+        df["time_period_column"] = date_time.generate_time_period_series(num_rows, rng=date_rng)
 
     if time_interval_column:
-        df["time_interval_column"] = date_time.generate_time_interval_series(num_rows)
+        df["time_interval_column"] = date_time.generate_time_interval_series(num_rows, rng=date_rng)
 
     # string columns
     if text_column:
-        df["text_column"] = text.generate_text_series(num_rows)
+        df["text_column"] = text.generate_text_series(num_rows, rng=rng)
 
     if keyword_column:
-        df["keyword_column"] = text.generate_keyword_series(num_rows)
+        df["keyword_column"] = text.generate_keyword_series(num_rows, rng=rng)
 
     # container columns
     if dict_column:
-        df["dict_column"] = misc.generate_dict_series(num_rows)
+        df["dict_column"] = misc.generate_dict_series(num_rows, rng=rng)
 
     if list_column:
-        df["list_column"] = misc.generate_list_series(num_rows)
+        df["list_column"] = misc.generate_list_series(num_rows, rng=rng)
 
     if nested_tabular_column:
         df["nested_tabular_column"] = generate_nested_tabular_series(
             num_rows,
             float_column=True,
             keyword_column=True,
+            seed=rng,
         )
 
     # geopandas/shapely columns
     if lat_float_column:
-        df["lat_float_column"] = geometry.generate_lat_float_series(num_rows)
+        df["lat_float_column"] = geometry.generate_lat_float_series(num_rows, rng=rng)
 
     if lon_float_column:
-        df["lon_float_column"] = geometry.generate_lon_float_series(num_rows)
+        df["lon_float_column"] = geometry.generate_lon_float_series(num_rows, rng=rng)
 
     if latlon_point_column:
-        df["latlon_point_column"] = geometry.generate_latlon_series(num_rows)
+        df["latlon_point_column"] = geometry.generate_latlon_series(num_rows, rng=rng)
 
     if filled_geojson_column:
-        df["filled_geojson_column"] = geometry.generate_filled_geojson_series(num_rows)
+        df["filled_geojson_column"] = geometry.generate_filled_geojson_series(num_rows, rng=rng)
 
     if exterior_geojson_column:
-        df["exterior_geojson_column"] = geometry.generate_exterior_bounds_geojson_series(num_rows)
+        df["exterior_geojson_column"] = geometry.generate_exterior_bounds_geojson_series(
+            num_rows, rng=rng
+        )
 
     # extras
     if bytes_column:
-        df["bytes_column"] = misc.generate_bytes_series(num_rows)
+        df["bytes_column"] = misc.generate_bytes_series(num_rows, rng=rng)
 
     if ipv4_address_column:
-        df["ipv4_address_column"] = misc.generate_ipv4_series(num_rows)
+        df["ipv4_address_column"] = misc.generate_ipv4_series(num_rows, rng=rng)
 
     if ipv6_address_column:
-        df["ipv6_address_column"] = misc.generate_ipv6_series(num_rows)
+        df["ipv6_address_column"] = misc.generate_ipv6_series(num_rows, rng=rng)
 
     if uuid4_column:
-        df["uuid4_column"] = misc.generate_uuid4_series(num_rows)
+        df["uuid4_column"] = misc.generate_uuid4_series(num_rows, rng=rng)
 
     return df
 
@@ -273,9 +285,11 @@ def generate_nested_tabular_series(num_rows: int, num_nested_rows: int = 5, **kw
     num_nested_rows: int
         Number of rows to generate for each nested dictionary
     """
+    # generate every nested row at once, then split the records up per row
+    records = random_dataframe(num_rows=num_rows * num_nested_rows, **kwargs).to_dict("records")
     return pd.Series(
         [
-            random_dataframe(num_rows=num_nested_rows, **kwargs).to_dict("records")
-            for _ in range(num_rows)
+            records[i : i + num_nested_rows]
+            for i in range(0, num_rows * num_nested_rows, num_nested_rows)
         ]
     )
@@ -1,7 +1,7 @@
 import ipaddress
 import json
-import random
 import uuid
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -22,7 +22,7 @@ __all__ = [
 
 
 ### Generator helper functions ###
-def generate_boolean_series(num_rows: int) -> pd.Series:
+def generate_boolean_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `boolean` values.
 
@@ -30,11 +30,14 @@ def generate_boolean_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series([random.choice([True, False]) for _ in range(num_rows)])
+    rng = np.random.default_rng(rng)
+    return pd.Series(rng.integers(0, 2, size=num_rows).astype(bool))
 
 
-def generate_dtype_series(num_rows: int) -> pd.Series:
+def generate_dtype_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `type` values.
 
@@ -42,13 +45,15 @@ def generate_dtype_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series(
-        [random.choice([float, int, str, bool, set, tuple, dict, list]) for _ in range(num_rows)]
-    )
+    rng = np.random.default_rng(rng)
+    dtypes = np.array([float, int, str, bool, set, tuple, dict, list], dtype=object)
+    return pd.Series(dtypes[rng.integers(0, len(dtypes), size=num_rows)])
 
 
-def generate_dict_series(num_rows: int) -> pd.Series:
+def generate_dict_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `dict` values.
 
@@ -56,20 +61,29 @@ def generate_dict_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
+    rng = np.random.default_rng(rng)
+    fruits = np.array(["apple", "banana", "orange", "pear"], dtype=object)
+    properties = fruits[rng.integers(0, len(fruits), size=num_rows)].tolist()
+    other_properties = rng.integers(0, 10, endpoint=True, size=num_rows).tolist()
+    bools = rng.integers(0, 2, size=num_rows).astype(bool).tolist()
     return pd.Series(
         [
             {
-                "nested_property": random.choice(["apple", "banana", "orange", "pear"]),
-                "nested_other_property": random.randint(0, 10),
-                "nested_bool": random.choice([True, False]),
+                "nested_property": nested_property,
+                "nested_other_property": nested_other_property,
+                "nested_bool": nested_bool,
             }
-            for _ in range(num_rows)
+            for nested_property, nested_other_property, nested_bool in zip(
+                properties, other_properties, bools
+            )
         ]
     )
 
 
-def generate_list_series(num_rows: int) -> pd.Series:
+def generate_list_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `list` values.
 
@@ -77,11 +91,18 @@ def generate_list_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series([[random.randint(0, 5) for _ in range(5)] for _ in range(num_rows)])
+    rng = np.random.default_rng(rng)
+    return pd.Series(rng.integers(0, 5, endpoint=True, size=(num_rows, 5)).tolist())
 
 
-def generate_bytes_series(num_rows: int, n_bytes: int = 10) -> pd.Series:
+def generate_bytes_series(
+    num_rows: int,
+    n_bytes: int = 10,
+    rng: Optional[np.random.Generator] = None,
+) -> pd.Series:
     """
     Generate a series of random `bytes` values.
 
@@ -91,11 +112,15 @@ def generate_bytes_series(num_rows: int, n_bytes: int = 10) -> pd.Series:
         Number of rows to generate
     n_bytes: int
         Number of bytes to generate per row
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series([np.random.bytes(n_bytes) for _ in range(num_rows)])
+    rng = np.random.default_rng(rng)
+    data = rng.bytes(num_rows * n_bytes)
+    return pd.Series([data[i : i + n_bytes] for i in range(0, num_rows * n_bytes, n_bytes)])
 
 
-def generate_ipv4_series(num_rows: int) -> pd.Series:
+def generate_ipv4_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `ipaddress.IPv4Address` values.
 
@@ -103,16 +128,15 @@ def generate_ipv4_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
+    rng = np.random.default_rng(rng)
+    addresses = rng.integers(0, 2**32, size=num_rows, dtype=np.uint64).tolist()
+    return pd.Series(list(map(ipaddress.IPv4Address, addresses)))
 
-    def random_ipv4():
-        address_str = ".".join(str(random.randint(0, 255)) for _ in range(4))
-        return ipaddress.ip_address(address_str)
-
-    return pd.Series([random_ipv4() for _ in range(num_rows)])
 
-
-def generate_ipv6_series(num_rows: int) -> pd.Series:
+def generate_ipv6_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `ipaddress.IPv6Address` values.
 
@@ -120,18 +144,22 @@ def generate_ipv6_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-
-    def random_ipv6():
-        address_str = ":".join(
-            str(hex(random.randint(0, 65_535))).replace("0x", "") for _ in range(8)
-        )
-        return ipaddress.ip_address(address_str)
-
-    return pd.Series([random_ipv6() for _ in range(num_rows)])
+    rng = np.random.default_rng(rng)
+    max_uint64 = np.iinfo(np.uint64).max
+    upper_bits = rng.integers(0, max_uint64, endpoint=True, size=num_rows, dtype=np.uint64)
+    lower_bits = rng.integers(0, max_uint64, endpoint=True, size=num_rows, dtype=np.uint64)
+    return pd.Series(
+        [
+            ipaddress.IPv6Address((upper << 64) | lower)
+            for upper, lower in zip(upper_bits.tolist(), lower_bits.tolist())
+        ]
+    )
 
 
-def generate_uuid4_series(num_rows: int) -> pd.Series:
+def generate_uuid4_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random `uuid.UUID` values.
 
@@ -139,15 +167,22 @@ def generate_uuid4_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series([uuid.uuid4() for _ in range(num_rows)])
+    rng = np.random.default_rng(rng)
+    uuid_bytes = rng.integers(0, 256, size=(num_rows, 16), dtype=np.uint8)
+    # set the version (4) and variant (RFC 4122) bits, as uuid.uuid4() would
+    uuid_bytes[:, 6] = (uuid_bytes[:, 6] & 0x0F) | 0x40
+    uuid_bytes[:, 8] = (uuid_bytes[:, 8] & 0x3F) | 0x80
+    return pd.Series([uuid.UUID(bytes=row.tobytes()) for row in uuid_bytes])
 
 
 ### Handler helper functions ###
 def handle_dict_series(s: pd.Series) -> pd.Series:
     types = dict
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has dicts; converting to json string")
+        logger.debug("series has dicts; converting to json string", column=s.name)
         s = s.apply(lambda x: json.dumps(x) if isinstance(x, types) else x)
     return s
 
@@ -158,7 +193,7 @@ def handle_dtype_series(s: pd.Series):
     """
     types = (type, np.dtype)
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has types; converting to strings")
+        logger.debug("series has types; converting to strings", column=s.name)
         s = s.astype(str)
     return s
 
@@ -166,7 +201,7 @@ def handle_dtype_series(s: pd.Series):
 def handle_interval_series(s: pd.Series) -> pd.Series:
     types = pd.Interval
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has intervals; converting to left/right")
+        logger.debug("series has intervals; converting to left/right", column=s.name)
         s = s.apply(lambda x: [x.left, x.right] if isinstance(x, types) else x)
     return s
 
@@ -174,7 +209,7 @@ def handle_interval_series(s: pd.Series) -> pd.Series:
 def handle_ip_address_series(s: pd.Series) -> pd.Series:
     types = (ipaddress.IPv4Address, ipaddress.IPv6Address)
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has ip addresses; converting to strings")
+        logger.debug("series has ip addresses; converting to strings", column=s.name)
         s = s.astype(str)
     return s
 
@@ -182,21 +217,21 @@ def handle_ip_address_series(s: pd.Series) -> pd.Series:
 def handle_sequence_series(s: pd.Series) -> pd.Series:
     types = (list, tuple, set, np.ndarray)
     if is_sequence_series(s):
-        logger.debug(f"series `{s.name}` has sequences; converting to comma-separated string")
+        logger.debug("series has sequences; converting to comma-separated string", column=s.name)
         s = s.apply(lambda x: ", ".join([str(val) for val in x] if isinstance(x, types) else x))
     return s
 
 
 def handle_unk_type_series(s: pd.Series) -> pd.Series:
     if not is_json_serializable(s):
-        logger.debug(f"series `{s.name}` has non-JSON-serializable types; converting to string")
+        logger.debug("series has non-JSON-serializable types; converting to string", column=s.name)
         s = s.astype(str)
     return s
 
 
 def handle_uuid_series(s: pd.Series) -> pd.Series:
     if any(isinstance(v, uuid.UUID) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has uuids; converting to strings")
+        logger.debug("series has uuids; converting to strings", column=s.name)
         s = s.astype(str)
     return s
 
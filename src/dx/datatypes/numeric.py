@@ -1,5 +1,5 @@
-import random
 from decimal import Decimal
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -17,7 +17,10 @@ __all__ = [
 
 ### Generator helper functions ###
 def generate_integer_series(
-    num_rows: int, value_min: int = -100, value_max: int = 100
+    num_rows: int,
+    value_min: int = -100,
+    value_max: int = 100,
+    rng: Optional[np.random.Generator] = None,
 ) -> pd.Series:
     """
     Generate a series of random `integer` values.
@@ -29,12 +32,20 @@ def generate_integer_series(
     value_min: int
         Minimum value to generate
     value_max: int
-        Maximum value to generate
+        Maximum value to generate (exclusive)
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series([np.random.randint(value_min, value_max) for _ in range(num_rows)])
+    rng = np.random.default_rng(rng)
+    return pd.Series(rng.integers(value_min, value_max, size=num_rows))
 
 
-def generate_float_series(num_rows: int, value_min: int = 0, value_max: int = 0) -> pd.Series:
+def generate_float_series(
+    num_rows: int,
+    value_min: int = 0,
+    value_max: int = 0,
+    rng: Optional[np.random.Generator] = None,
+) -> pd.Series:
     """
     Generate a series of random `float` values.
     (`value_min` and `value_max` both set to `0` by default since a random `0.0`-`1.0` is added.)
@@ -47,13 +58,20 @@ def generate_float_series(num_rows: int, value_min: int = 0, value_max: int = 0)
         Minimum value to generate
     value_max: int
         Maximum value to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series(
-        [random.randint(value_min, value_max) + np.random.rand() for _ in range(num_rows)]
-    )
+    rng = np.random.default_rng(rng)
+    integers = rng.integers(value_min, value_max, endpoint=True, size=num_rows)
+    return pd.Series(integers + rng.random(num_rows))
 
 
-def generate_decimal_series(num_rows: int, value_min: int = 0, value_max: int = 0) -> pd.Series:
+def generate_decimal_series(
+    num_rows: int,
+    value_min: int = 0,
+    value_max: int = 0,
+    rng: Optional[np.random.Generator] = None,
+) -> pd.Series:
     """
     Generate a series of random `decimal.Decimal` values.
 
@@ -65,11 +83,16 @@ def generate_decimal_series(num_rows: int, value_min: int = 0, value_max: int =
         Minimum value to generate
     value_max: int
         Maximum value to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return generate_float_series(num_rows, value_min, value_max).apply(lambda x: Decimal(x))
+    floats = generate_float_series(num_rows, value_min, value_max, rng=rng)
+    return pd.Series(list(map(Decimal, floats.tolist())), dtype=object)
 
 
-def generate_complex_number_series(num_rows: int) -> pd.Series:
+def generate_complex_number_series(
+    num_rows: int, rng: Optional[np.random.Generator] = None
+) -> pd.Series:
     """
     Generate a series of random complex numbers.
 
@@ -77,17 +100,18 @@ def generate_complex_number_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series(
-        [complex(real=np.random.rand(), imag=np.random.rand()) for _ in range(num_rows)]
-    )
+    rng = np.random.default_rng(rng)
+    return pd.Series(rng.random(num_rows) + 1j * rng.random(num_rows))
 
 
 ### Handler helper functions ###
 def handle_complex_number_series(s: pd.Series) -> pd.Series:
     types = (complex,)
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has complex numbers; converting to real/imag string")
+        logger.debug("series has complex numbers; converting to real/imag string", column=s.name)
         s = s.apply(lambda x: f"{x.real}+{x.imag}j" if isinstance(x, types) else x)
     return s
 
@@ -95,6 +119,6 @@ def handle_complex_number_series(s: pd.Series) -> pd.Series:
 def handle_decimal_series(s: pd.Series) -> pd.Series:
     types = (Decimal,)
     if any(isinstance(v, types) for v in s.dropna().head().values):
-        logger.debug(f"series `{s.name}` has Decimals; converting to float")
+        logger.debug("series has Decimals; converting to float", column=s.name)
         s = s.astype(float)
     return s
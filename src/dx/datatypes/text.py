@@ -1,17 +1,15 @@
-import random
 import string
+from functools import lru_cache
+from typing import Optional
 
 import numpy as np
 import pandas as pd
 import structlog
 
-try:
-    from faker import Faker
+from dx.dependencies import package_installed
 
-    fake = Faker()
-    FAKER_INSTALLED = True
-except ImportError:
-    FAKER_INSTALLED = False
+# faker is only imported once text values are generated
+FAKER_INSTALLED = package_installed("faker")
 
 
 logger = structlog.get_logger(__name__)
@@ -22,7 +20,7 @@ __all__ = [
 ]
 
 
-def generate_text_series(num_rows: int) -> pd.Series:
+def generate_text_series(num_rows: int, rng: Optional[np.random.Generator] = None) -> pd.Series:
     """
     Generate a series of random long `str` values. (Requires `faker` to be installed)
 
@@ -30,15 +28,25 @@ def generate_text_series(num_rows: int) -> pd.Series:
     ----------
     num_rows: int
         Number of rows to generate
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
     if not FAKER_INSTALLED:
         logger.warning("faker is not installed, skipping text_column")
         return np.nan
 
+    # faker builds each value in python, so this is only seeded from `rng`
+    rng = np.random.default_rng(rng)
+    fake = get_faker()
+    fake.seed_instance(int(rng.integers(2**32)))
     return pd.Series([fake.text() for _ in range(num_rows)])
 
 
-def generate_keyword_series(num_rows: int, num_letters: int = 2) -> pd.Series:
+def generate_keyword_series(
+    num_rows: int,
+    num_letters: int = 2,
+    rng: Optional[np.random.Generator] = None,
+) -> pd.Series:
     """
     Generate a series of random short `str` values.
 
@@ -47,8 +55,28 @@ def generate_keyword_series(num_rows: int, num_letters: int = 2) -> pd.Series:
     num_rows: int
         Number of rows to generate
     num_letters: int
-        Number of letters to use in each keyword
+        Number of (distinct) letters to use in each keyword
+    rng: Optional[np.random.Generator]
+        Random number generator to use (a new unseeded one if not provided)
     """
-    return pd.Series(
-        ["".join(random.sample(string.ascii_uppercase, num_letters)) for _ in range(num_rows)]
-    )
+    rng = np.random.default_rng(rng)
+    num_choices = len(string.ascii_uppercase)
+    letter_positions = np.empty((num_rows, num_letters), dtype=np.int64)
+    for i in range(num_letters):
+        # pick from the letters not used yet in each row by shifting the position
+        # past each already-used letter (in ascending order) at or below it
+        positions = rng.integers(0, num_choices - i, size=num_rows)
+        for used_positions in np.sort(letter_positions[:, :i], axis=1).T:
+            positions += positions >= used_positions
+        letter_positions[:, i] = positions
+
+    letter_codes = (letter_positions + ord("A")).astype(np.uint8)
+    keywords = letter_codes.view(f"S{num_letters}").ravel().astype(str)
+    return pd.Series(keywords.astype(object))
+
+
+@lru_cache
+def get_faker():
+    from faker import Faker
+
+    return Faker()
@@ -1,3 +1,4 @@
+import sys
 from importlib.util import find_spec
 
 import pandas as pd
@@ -31,44 +32,85 @@ def vaex_installed():
     return package_installed("vaex")
 
 
-def get_default_renderable_types() -> dict:
-    """Return a dictionary of default renderable types,
-    including callable functions or names of methods to use
-    to convert a specific type to a pandas.DataFrame.
-    """
-    types = {
-        pd.Series: None,
-        pd.DataFrame: None,
-    }
+def get_dask_renderable_types() -> dict:
+    import dask.dataframe as dd
+
+    return {dd.Series: "compute", dd.DataFrame: "compute"}
+
+
+def get_geopandas_renderable_types() -> dict:
+    import geopandas as gpd
+
+    return {gpd.GeoDataFrame: None, gpd.GeoSeries: None}
+
+
+def get_modin_renderable_types() -> dict:
+    import modin.pandas as mpd
+
+    return {mpd.DataFrame: "_to_pandas", mpd.Series: "_to_pandas"}
+
+
+def get_polars_renderable_types() -> dict:
+    import polars as pl
 
-    if dask_installed():
-        import dask.dataframe as dd
+    return {pl.DataFrame: "to_pandas", pl.Series: "to_pandas"}
 
-        dd_types = {dd.Series: "compute", dd.DataFrame: "compute"}
-        types.update(dd_types)
 
-    if geopandas_installed():
-        import geopandas as gpd
+def get_vaex_renderable_types() -> dict:
+    import vaex
 
-        gpd_types = {gpd.GeoDataFrame: None, gpd.GeoSeries: None}
-        types.update(gpd_types)
+    return {vaex.dataframe.DataFrame: "to_pandas_df"}
 
-    if modin_installed():
-        import modin.pandas as mpd
 
-        mpd_types = {mpd.DataFrame: "_to_pandas", mpd.Series: "_to_pandas"}
-        types.update(mpd_types)
+# (module: function returning {type: converter}) for optional dataframe libraries,
+# keyed by the module that has to be imported before any of its objects can exist
+OPTIONAL_RENDERABLE_TYPES = {
+    "dask.dataframe": get_dask_renderable_types,
+    "geopandas": get_geopandas_renderable_types,
+    "modin.pandas": get_modin_renderable_types,
+    "polars": get_polars_renderable_types,
+    "vaex": get_vaex_renderable_types,
+}
 
-    if polars_installed():
-        import polars as pl
 
-        pl_types = {pl.DataFrame: "to_pandas", pl.Series: "to_pandas"}
-        types.update(pl_types)
+def get_base_renderable_types() -> dict:
+    return {
+        pd.Series: None,
+        pd.DataFrame: None,
+    }
 
-    if vaex_installed():
-        import vaex
 
-        vaex_types = {vaex.dataframe.DataFrame: "to_pandas_df"}
-        types.update(vaex_types)
+def get_default_renderable_types() -> dict:
+    """Return a dictionary of default renderable types,
+    including callable functions or names of methods to use
+    to convert a specific type to a pandas.DataFrame.
 
+    This imports every optional dataframe library that's installed;
+    see `get_loaded_renderable_types()` to avoid that.
+    """
+    types = get_base_renderable_types()
+    for module_name, get_types in OPTIONAL_RENDERABLE_TYPES.items():
+        if package_installed(module_name.split(".")[0]):
+            types.update(get_types())
+    return types
+
+
+def get_loaded_optional_modules() -> tuple:
+    """
+    Returns which of the optional dataframe library modules have already been imported.
+    """
+    return tuple(
+        module_name for module_name in OPTIONAL_RENDERABLE_TYPES if module_name in sys.modules
+    )
+
+
+def get_loaded_renderable_types() -> dict:
+    """
+    Like `get_default_renderable_types()`, but only includes types from optional dataframe
+    libraries that have already been imported (an object of one of their types can't
+    exist otherwise), so checking an object never triggers a new import.
+    """
+    types = get_base_renderable_types()
+    for module_name in get_loaded_optional_modules():
+        types.update(OPTIONAL_RENDERABLE_TYPES[module_name]())
     return types
@@ -1,23 +1,52 @@
+import time
 from typing import Optional
 
 import pandas as pd
 import structlog
 from IPython.display import update_display
 
+from dx import metrics
+from dx.backends import (
+    DatalinkBackend,
+    DuckDBDatalinkBackend,
+    NumpyDatalinkBackend,
+    get_datalink_backend,
+)
 from dx.sampling import get_df_dimensions
 from dx.settings import get_settings, settings_context
+from dx.types.aggregation import DEXAggregationMessage
+from dx.types.facets import DEXFacetsMessage
 from dx.types.filters import DEXFilterSettings, DEXResampleMessage
+from dx.types.main import DXDatalinkBackend
+from dx.utils.profiling import profiled
 from dx.utils.tracking import (
     DXDF_CACHE,
     SUBSET_HASH_TO_PARENT_DATA,
+    TRACKING_LOCK,
+    DXDataFrame,
+    LazyDBConnection,
     generate_df_hash,
-    get_db_connection,
+    materialize_table,
+    should_materialize,
 )
 
 logger = structlog.get_logger(__name__)
-db_connection = get_db_connection()
+db_connection = LazyDBConnection()
 settings = get_settings()
 
+# (display_id: DEXResampleMessage) pairs for the most recent resample request received
+# per display, used to skip requests that were superseded while they were queued or running
+LATEST_RESAMPLE_REQUESTS = {}
+
+
+def is_superseded(msg: DEXResampleMessage) -> bool:
+    """
+    Returns True if a newer resample request has been received for the same display ID.
+    (Requests that were never tracked, like direct handle_resample() calls, are never superseded.)
+    """
+    latest_msg = LATEST_RESAMPLE_REQUESTS.get(msg.display_id, msg)
+    return latest_msg is not msg
+
 
 def store_sample_to_history(df: pd.DataFrame, display_id: str, filters: list) -> dict:
     """
@@ -59,87 +88,292 @@ def resample_from_db(
     assign_subset: bool = True,
 ) -> pd.DataFrame:
     """
-    Filters the dataframe in the cell with the given display_id.
-    This is done by executing the SQL filter on the table
-    associated with the given display ID.
+    Filters the dataframe in the cell with the given display_id
+    by running a custom SQL query (with a `{table_name}` placeholder)
+    through the duckdb backend.
 
     This also associates the queried subset to the original dataset
     (based on the display ID) so as to avoid re-registering a new
     display handler.
     """
     dxdf = DXDF_CACHE[display_id]
-    # store filters to be passed through metadata to the frontend
-    logger.debug(f"applying {filters=}")
-    dxdf.filters = filters or []
+    track_filters(dxdf, filters)
+    if should_materialize(dxdf):
+        materialize_table(db_connection, dxdf)
 
-    query_string = sql_filter.format(table_name=dxdf.variable_name)
-    logger.debug(f"sql query string: {query_string}")
-    new_df: pd.DataFrame = db_connection.execute(query_string).df()
-
-    # just for logging purposes - not used anywhere
-    count_resp = db_connection.execute(f"SELECT COUNT(*) FROM {dxdf.variable_name}").fetchone()
-    # should return a tuple of (count,)
-    orig_df_count = count_resp[0]
-    logger.debug(f"filtered to {len(new_df)}/{orig_df_count} row(s)")
-
-    # resetting original index if needed
-    if dxdf.index_name is not None:
-        new_df.set_index(dxdf.index_name, inplace=True)
-    # convert back to original dtypes
-    for col, dtype in dxdf.original_column_dtypes.items():
-        if settings.FLATTEN_COLUMN_VALUES and isinstance(col, tuple):
-            # the dataframe in use originally had pd.MultiIndex columns
-            col = ", ".join(col)
-        new_df[col] = new_df[col].astype(dtype)
+    backend = DuckDBDatalinkBackend(connection=db_connection)
+    new_df = backend.query(dxdf, sql_filter, filters=filters)
+    new_df = new_df.set_index(dxdf.index_name)
+    return finish_resample(dxdf, new_df, display_id, cell_id=cell_id, assign_subset=assign_subset)
 
+
+def resample_from_backend(
+    display_id: str,
+    filters: Optional[list] = None,
+    limit: Optional[int] = None,
+    cell_id: Optional[str] = None,
+    assign_subset: bool = True,
+    track: bool = True,
+    backend: Optional[DatalinkBackend] = None,
+) -> pd.DataFrame:
+    """
+    Filters the dataframe in the cell with the given display_id, leaving building and
+    running the filters to a datalink backend (defaulting to the one set by
+    `settings.DATALINK_BACKEND`).
+
+    `track=False` skips counting the filters toward materialization and storing them
+    on the parent DXDataFrame, e.g. for a progressive preview of the same request.
+    """
+    backend = backend or get_datalink_backend(db_connection)
+    dxdf = DXDF_CACHE[display_id]
+    if track:
+        track_filters(dxdf, filters)
+
+    new_df = backend.sample(dxdf, filters=filters, limit=limit)
+    return finish_resample(dxdf, new_df, display_id, cell_id=cell_id, assign_subset=assign_subset)
+
+
+def finish_resample(
+    dxdf: DXDataFrame,
+    new_df: pd.DataFrame,
+    display_id: str,
+    cell_id: Optional[str] = None,
+    assign_subset: bool = True,
+) -> pd.DataFrame:
+    """
+    Restores the original column dtypes of a resampled subset and (optionally)
+    links it to its parent display.
+    """
+    logger.debug("filtered rows", num_rows=len(new_df))
+    new_df = restore_column_dtypes(dxdf, new_df)
     if assign_subset:
-        # this is associating the subset with the original dataframe,
-        # which will be checked when the DisplayFormatter.format() is called
-        # during update_display(), which will prevent re-registering the display ID to the subset
-        new_df_hash = generate_df_hash(new_df)
-        logger.debug(f"assigning subset {cell_id}+{new_df_hash} to {display_id=}")
+        assign_subset_to_parent(new_df, display_id=display_id, cell_id=cell_id)
+    return new_df
+
+
+def resample_from_frame(
+    display_id: str,
+    filters: Optional[list] = None,
+    limit: Optional[int] = None,
+    cell_id: Optional[str] = None,
+    assign_subset: bool = True,
+) -> pd.DataFrame:
+    """
+    Filters the dataframe in the cell with the given display_id, like `resample_from_backend()`,
+    but always evaluates the filters as vectorized boolean masks directly against the cached
+    dataframe instead of querying a database.
+    """
+    return resample_from_backend(
+        display_id=display_id,
+        filters=filters,
+        limit=limit,
+        cell_id=cell_id,
+        assign_subset=assign_subset,
+        backend=NumpyDatalinkBackend(),
+    )
+
+
+def track_filters(dxdf: DXDataFrame, filters: Optional[list] = None) -> None:
+    """
+    Stores the applied filters to be passed through metadata to the frontend,
+    and counts filter usage to decide whether to materialize the dataframe.
+    """
+    logger.debug("applying filters", filters=filters)
+    dxdf.filters = filters or []
+    if not filters:
+        return
+
+    # filters may come through as FilterTypes or raw dicts from the frontend
+    dex_filters = DEXFilterSettings(filters=filters).filters
+    dxdf.num_filter_requests += 1
+    dxdf.date_filter_counts.update(f.column for f in dex_filters if f.type == "DATE_FILTER")
+
+
+def restore_column_dtypes(dxdf: DXDataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts resampled columns back to their original dtypes, but only
+    for the columns whose dtypes were changed along the way.
+    """
+    restore_dtypes = {
+        col: dtype
+        for col, dtype in dxdf.db_column_dtypes.items()
+        if col in new_df.columns and new_df[col].dtype != dtype
+    }
+    if restore_dtypes:
+        logger.debug("restoring dtypes", columns=list(restore_dtypes))
+        new_df = new_df.astype(restore_dtypes, copy=False)
+    return new_df
+
+
+def assign_subset_to_parent(
+    new_df: pd.DataFrame,
+    display_id: str,
+    cell_id: Optional[str] = None,
+) -> None:
+    """
+    Associates the subset with the original dataframe, which will be checked when
+    DisplayFormatter.format() is called during update_display(), and will prevent
+    re-registering the display ID to the subset.
+    """
+    new_df_hash = generate_df_hash(new_df)
+    logger.debug(
+        "assigning subset", cell_id=cell_id, subset_hash=new_df_hash, display_id=display_id
+    )
+    with TRACKING_LOCK:
         SUBSET_HASH_TO_PARENT_DATA[new_df_hash] = {
             "cell_id": cell_id,
             "display_id": display_id,
         }
 
-    return new_df
+
+def get_sql_backend(dxdf: DXDataFrame) -> DuckDBDatalinkBackend:
+    """
+    Returns a duckdb backend for running aggregation and facet queries, which are written
+    in duckdb SQL. Dataframes displayed with another `DATALINK_BACKEND` are registered
+    with duckdb the first time one of these queries needs them.
+    """
+    backend = DuckDBDatalinkBackend(connection=db_connection)
+    if not dxdf.duckdb_registered:
+        backend.register(dxdf)
+    return backend
 
 
-def handle_resample(msg: DEXResampleMessage) -> pd.DataFrame:
+@profiled
+def handle_resample(msg: DEXResampleMessage) -> Optional[pd.DataFrame]:
     """Converts incoming resample message to SQL query and executes it on the database,
     then stores the result in the parent dataframe's metadata cache to use in the
     follow-on update_display_data call.
+
+    With `ENABLE_PROGRESSIVE_RESAMPLE`, a small preview of the filtered data
+    (`PROGRESSIVE_RESAMPLE_PREVIEW_ROWS`) is displayed first along with the exact
+    filtered row count, then replaced with the full sample once it's ready.
+
+    If a newer request for the same display ID arrives before this one finishes,
+    this returns `None` without updating the display, so only the latest result is shown.
     """
+    backend_name = str(settings.DATALINK_BACKEND)
+    start = time.perf_counter()
+    status = "error"
+    try:
+        resampled_df = resample_and_update_display(msg)
+        status = "success" if resampled_df is not None else "superseded"
+        return resampled_df
+    finally:
+        metrics.RESAMPLES.inc(backend=backend_name, status=status)
+        metrics.RESAMPLE_SECONDS.observe(time.perf_counter() - start, backend=backend_name)
+
+
+def resample_and_update_display(msg: DEXResampleMessage) -> Optional[pd.DataFrame]:
+    if is_superseded(msg):
+        logger.debug("skipping superseded resample request", display_id=msg.display_id)
+        return None
+
     raw_filters = msg.filters
     sample_size = msg.limit
-
+    backend = get_datalink_backend(db_connection)
     update_params = {
         "display_id": msg.display_id,
-        "sql_filter": f"SELECT * FROM {{table_name}} LIMIT {sample_size}",
         "filters": raw_filters,
         "cell_id": msg.cell_id,
+        "backend": backend,
     }
 
-    if raw_filters:
-        dex_filters = DEXFilterSettings(filters=raw_filters)
-        # used to actually filter the data
-        sql_filter_str = dex_filters.to_sql_query()
-        update_params[
-            "sql_filter"
-        ] = f"SELECT * FROM {{table_name}} WHERE {sql_filter_str} LIMIT {sample_size}"
+    preview_size = settings.PROGRESSIVE_RESAMPLE_PREVIEW_ROWS
+    num_filtered_rows = None
+    # filtering in-process is fast enough that a preview is only needed for duckdb
+    if (
+        backend.name == DXDatalinkBackend.duckdb.value
+        and settings.ENABLE_PROGRESSIVE_RESAMPLE
+        and 0 < preview_size < sample_size
+    ):
+        logger.debug(
+            "resampling preview...",
+            display_id=msg.display_id,
+            filters=raw_filters,
+            limit=preview_size,
+        )
+        # the full query below tracks the filters, but the preview still needs to be
+        # linked to its parent so it updates the existing display
+        preview_df = resample_from_backend(**update_params, limit=preview_size, track=False)
+        if is_superseded(msg):
+            logger.debug("discarding superseded resample preview", display_id=msg.display_id)
+            return None
 
-    logger.debug("resampling from db...", **update_params)
-    resampled_df = resample_from_db(**update_params)
+        if len(preview_df) < preview_size:
+            # the preview already holds every filtered row, so there's nothing left to send
+            track_filters(DXDF_CACHE[msg.display_id], raw_filters)
+            update_resampled_display(
+                msg,
+                preview_df,
+                stage="complete",
+                num_filtered_rows=len(preview_df),
+            )
+            return preview_df
 
-    logger.debug("storing sample to history", display_id=msg.display_id, filters=raw_filters)
-    metadata = store_sample_to_history(
-        resampled_df,
+        num_filtered_rows = backend.count(DXDF_CACHE[msg.display_id], filters=raw_filters)
+        update_resampled_display(
+            msg,
+            preview_df,
+            stage="preview",
+            num_filtered_rows=num_filtered_rows,
+        )
+        if is_superseded(msg):
+            return None
+
+    logger.debug(
+        "resampling...",
         display_id=msg.display_id,
         filters=raw_filters,
+        limit=sample_size,
+        backend=backend.name,
     )
+    resampled_df = resample_from_backend(**update_params, limit=sample_size)
+    if is_superseded(msg):
+        # a newer request came in while we were querying; don't overwrite its result
+        logger.debug("discarding superseded resample result", display_id=msg.display_id)
+        return None
+
+    update_resampled_display(
+        msg,
+        resampled_df,
+        stage="complete",
+        num_filtered_rows=num_filtered_rows,
+    )
+    return resampled_df
+
+
+def update_resampled_display(
+    msg: DEXResampleMessage,
+    resampled_df: pd.DataFrame,
+    stage: str = "complete",
+    num_filtered_rows: Optional[int] = None,
+) -> dict:
+    """
+    Updates the existing display handler for the resample request's display ID
+    with the resampled data.
+
+    `stage` is either `"preview"` (a partial first page of a progressive resample, which isn't
+    added to the sample history) or `"complete"` (the full sample), and is passed along with
+    the exact filtered row count (if known) in the `datalink.resample_progress` metadata.
+    """
+    if stage == "complete":
+        logger.debug("storing sample to history", display_id=msg.display_id, filters=msg.filters)
+        metadata = store_sample_to_history(
+            resampled_df,
+            display_id=msg.display_id,
+            filters=msg.filters,
+        )
+    else:
+        metadata = DXDF_CACHE[msg.display_id].metadata
+
+    metadata["datalink"]["resample_progress"] = {
+        "stage": stage,
+        "num_filtered_rows": num_filtered_rows,
+        "num_sampled_rows": len(resampled_df),
+    }
 
     # allow temporary override of the display
+    sample_size = msg.limit
     context_params = dict(
         DISPLAY_MAX_ROWS=sample_size,
         DISPLAY_MAX_COLUMNS=msg.num_columns,
@@ -148,7 +382,10 @@ def handle_resample(msg: DEXResampleMessage) -> pd.DataFrame:
     )
     with settings_context(**context_params):
         logger.debug(
-            f"updating {msg.display_id=} with {min(sample_size, len(resampled_df))}-row resample",
+            "updating display with resample",
+            display_id=msg.display_id,
+            num_rows=min(sample_size, len(resampled_df)),
+            stage=stage,
             **context_params,
         )
         update_display(
@@ -157,4 +394,70 @@ def handle_resample(msg: DEXResampleMessage) -> pd.DataFrame:
             metadata=metadata,
         )
 
-    return resampled_df
+    return metadata
+
+
+def aggregate_from_db(msg: DEXAggregationMessage) -> pd.DataFrame:
+    """
+    Runs a chart's group-by aggregation over the full table associated with the
+    message's display ID (rather than the sampled rows sent to the frontend)
+    and returns only the aggregated rows.
+    """
+    dxdf = DXDF_CACHE[msg.display_id]
+    backend = get_sql_backend(dxdf)
+    agg_df = backend.query(dxdf, msg.to_sql_query(), filters=msg.filters)
+    logger.debug("aggregated rows", num_rows=len(agg_df))
+    return agg_df
+
+
+def facets_from_db(msg: DEXFacetsMessage) -> dict:
+    """
+    Computes value counts for dimension columns and histograms for metric columns
+    over the full table associated with the message's display ID, with the message's
+    filters applied, in a single grouped query.
+
+    If no columns are requested, all string/categorical/boolean columns are used as
+    dimensions and all other numeric columns as metrics. Results are cached per
+    filter set on the parent DXDataFrame.
+    """
+    dxdf = DXDF_CACHE[msg.display_id]
+    if not msg.dimensions and not msg.metrics:
+        msg = msg.copy(update=get_facet_columns(dxdf.df))
+
+    cache_key = msg.cache_key
+    if (payload := dxdf.facet_cache.get(cache_key)) is not None:
+        logger.debug("using cached facet counts", display_id=msg.display_id)
+        metrics.CACHE_HITS.inc(cache="facets")
+        return payload
+    metrics.CACHE_MISSES.inc(cache="facets")
+    if not msg.dimensions and not msg.metrics:
+        return msg.to_payload(pd.DataFrame())
+
+    backend = get_sql_backend(dxdf)
+    facets_df = backend.query(dxdf, msg.to_sql_query(), filters=msg.filters)
+    payload = msg.to_payload(facets_df)
+
+    dxdf.facet_cache[cache_key] = payload
+    # only keep the most recent results
+    while len(dxdf.facet_cache) > settings.FACETS_CACHE_SIZE:
+        dxdf.facet_cache.pop(next(iter(dxdf.facet_cache)))
+    return payload
+
+
+def get_facet_columns(df: pd.DataFrame) -> dict:
+    """
+    Splits a dataframe's columns into facet dimensions (string, categorical, and boolean
+    columns) and metrics (other numeric columns), using the column names from the database.
+    """
+    dimensions = []
+    metric_columns = []
+    for column, dtype in df.dtypes.items():
+        if (
+            pd.api.types.is_bool_dtype(dtype)
+            or pd.api.types.is_object_dtype(dtype)
+            or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+        ):
+            dimensions.append(str(column))
+        elif pd.api.types.is_numeric_dtype(dtype):
+            metric_columns.append(str(column))
+    return {"dimensions": dimensions, "metrics": metric_columns}
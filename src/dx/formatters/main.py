@@ -1,4 +1,5 @@
 import os
+import time
 import uuid
 from typing import Optional
 
@@ -10,6 +11,8 @@ from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import display as ipydisplay
 from pandas.io.json import build_table_schema
 
+from dx import metrics
+from dx.backends import get_datalink_backend
 from dx.formatters.summarizing import make_df_summary
 from dx.sampling import get_column_string_lengths, get_df_dimensions, sample_if_too_big
 from dx.settings import get_settings
@@ -21,10 +24,18 @@ from dx.utils.formatting import (
     normalize_index_and_columns,
     to_dataframe,
 )
-from dx.utils.tracking import DXDF_CACHE, SUBSET_HASH_TO_PARENT_DATA, DXDataFrame, get_db_connection
+from dx.utils.profiling import profiled
+from dx.utils.timing import CURRENT_DISPLAY_TIMINGS, collect_display_timings, timed
+from dx.utils.tracking import (
+    DXDF_CACHE,
+    SUBSET_HASH_TO_PARENT_DATA,
+    TRACKING_LOCK,
+    DXDataFrame,
+    LazyDBConnection,
+)
 
 logger = structlog.get_logger(__name__)
-db_connection = get_db_connection()
+db_connection = LazyDBConnection()
 settings = get_settings()
 
 DEFAULT_IPYTHON_DISPLAY_FORMATTER = DisplayFormatter()
@@ -62,40 +73,58 @@ def datalink_processing(
     # this needs to happen after sending to the frontend
     # so the user doesn't wait as long for writing larger datasets
     if not parent_display_id:
-        logger.debug(f"registering `{dxdf.variable_name}` to duckdb")
-        db_connection.register(dxdf.variable_name, dxdf.df.reset_index())
+        timed("register", get_datalink_backend(db_connection).register, dxdf)
 
     return payload, metadata
 
 
+@profiled
 def handle_format(
     obj,
     with_ipython_display: bool = True,
     ipython_shell: Optional[InteractiveShell] = None,
     extra_metadata: Optional[dict] = None,
+):
+    start = time.perf_counter()
+    with collect_display_timings():
+        payload, metadata = _handle_format(
+            obj,
+            with_ipython_display=with_ipython_display,
+            ipython_shell=ipython_shell,
+            extra_metadata=extra_metadata,
+        )
+    display_mode = str(settings.DISPLAY_MODE)
+    metrics.DISPLAYS.inc(display_mode=display_mode)
+    metrics.DISPLAY_SECONDS.observe(time.perf_counter() - start, display_mode=display_mode)
+    return payload, metadata
+
+
+def _handle_format(
+    obj,
+    with_ipython_display: bool = True,
+    ipython_shell: Optional[InteractiveShell] = None,
+    extra_metadata: Optional[dict] = None,
 ):
     ipython = ipython_shell or get_ipython()
 
-    logger.debug(f"*** handling {settings.DISPLAY_MODE} format for {type(obj)=} ***")
+    logger.debug("*** handling format ***", display_mode=settings.DISPLAY_MODE, obj_type=type(obj))
     if not isinstance(obj, pd.DataFrame):
         obj = to_dataframe(obj)
 
     # ensure we aren't mutating the original dataframe
-    df = obj.copy()
+    df = timed("copy", obj.copy)
     df = check_for_duplicate_columns(df)
-    logger.debug(f"{df.shape=}")
+    logger.debug("copied dataframe", shape=df.shape)
 
     default_index_used = is_default_index(df.index)
 
     if not settings.ENABLE_DATALINK:
-        df = normalize_index_and_columns(df)
-        payload, metadata = format_output(
+        return format_without_datalink(
             df,
             default_index_used=default_index_used,
             with_ipython_display=with_ipython_display,
             extra_metadata=extra_metadata,
         )
-        return payload, metadata
 
     try:
         payload, metadata = datalink_processing(
@@ -106,10 +135,9 @@ def handle_format(
             extra_metadata=extra_metadata,
         )
     except Exception as e:
-        logger.debug(f"Error in datalink_processing: {e}")
+        logger.debug("error in datalink_processing", error=e)
         # fall back to default processing
-        df = normalize_index_and_columns(df)
-        payload, metadata = format_output(
+        payload, metadata = format_without_datalink(
             df,
             default_index_used=default_index_used,
             with_ipython_display=with_ipython_display,
@@ -119,11 +147,30 @@ def handle_format(
     return payload, metadata
 
 
+def format_without_datalink(
+    df: pd.DataFrame,
+    default_index_used: bool = True,
+    with_ipython_display: bool = True,
+    extra_metadata: Optional[dict] = None,
+) -> tuple:
+    """
+    Normalizes and formats the dataframe without tracking it or registering it
+    with a datalink backend.
+    """
+    df = timed("normalize", normalize_index_and_columns, df)
+    return format_output(
+        df,
+        default_index_used=default_index_used,
+        with_ipython_display=with_ipython_display,
+        extra_metadata=extra_metadata,
+    )
+
+
 class DXDisplayFormatter(DisplayFormatter):
     formatters = DEFAULT_IPYTHON_DISPLAY_FORMATTER.formatters
 
     def format(self, obj, **kwargs):
-        if IN_NOTEBOOK_ENV and isinstance(obj, tuple(settings.get_renderable_types())):
+        if IN_NOTEBOOK_ENV and settings.is_renderable(obj):
             handle_format(obj)
             return ({}, {})
 
@@ -140,21 +187,12 @@ def generate_body(
     table schema and transformed tabular data based on the current
     display mode.
     """
-    schema = build_table_schema(df)
-    logger.debug(f"{schema=}")
+    schema = timed("schema", build_table_schema, df)
+    logger.debug("built table schema", schema=schema)
 
-    # This is a little odd, but it allows replacing `pd.NA` and np.nan
-    # with `None` values without altering any of the other values.
-    # Without converting to `object`, `NaN`s will persist (but `pd.NA`s
-    # will be converted to `None`).
     # We build the schema first since, after this, the dtypes will be
     # changed to `object` for any Series whose values were replaced with `None`s.
-    clean_df = df.astype(object).where(df.notnull(), None)
-
-    if settings.DISPLAY_MODE == DXDisplayMode.simple:
-        data = clean_df.reset_index().to_dict("records")
-    elif settings.DISPLAY_MODE == DXDisplayMode.enhanced:
-        data = clean_df.reset_index().transpose().values.tolist()
+    data = timed("body", generate_data, df)
 
     payload = {
         "schema": schema,
@@ -164,6 +202,23 @@ def generate_body(
     return payload
 
 
+def generate_data(df: pd.DataFrame) -> list:
+    """
+    Returns the dataframe values (including the index) as a list of records
+    in simple display mode, or a list of column value lists in enhanced display mode.
+    """
+    # This is a little odd, but it allows replacing `pd.NA` and np.nan
+    # with `None` values without altering any of the other values.
+    # Without converting to `object`, `NaN`s will persist (but `pd.NA`s
+    # will be converted to `None`).
+    clean_df = df.astype(object).where(df.notnull(), None)
+
+    if settings.DISPLAY_MODE == DXDisplayMode.simple:
+        return clean_df.reset_index().to_dict("records")
+    elif settings.DISPLAY_MODE == DXDisplayMode.enhanced:
+        return clean_df.reset_index().transpose().values.tolist()
+
+
 def format_output(
     df: pd.DataFrame,
     update: bool = False,
@@ -178,9 +233,12 @@ def format_output(
     # determine original dataset size, and truncated/sampled size if it's beyond the limits
     orig_df_dimensions = get_df_dimensions(df, prefix="orig")
     orig_col_string_lengths = get_column_string_lengths(df)
-    df = sample_if_too_big(df, display_id=display_id)
+    df = timed("sample", sample_if_too_big, df, display_id=display_id)
     sampled_df_dimensions = get_df_dimensions(df, prefix="truncated")
     sampled_col_string_lengths = get_column_string_lengths(df)
+    metrics.ROWS_ORIGINAL.inc(orig_df_dimensions["orig_num_rows"])
+    metrics.ROWS_SAMPLED.inc(sampled_df_dimensions["truncated_num_rows"])
+    metrics.DISPLAYED_BYTES.inc(sampled_df_dimensions["truncated_size_bytes"])
 
     # keep track of which string/object columns may have been shortened
     # based on settings.MAX_STRING_LENGTH for the frontend to provide an affordance
@@ -216,16 +274,23 @@ def format_output(
     # add additional payload for LLM consumption; if any parsing/summarizing errors occur, we
     # shouldn't block displaying the bundle
     try:
-        payload["text/llm+plain"] = make_df_summary(df)
+        payload["text/llm+plain"] = timed("summary", make_df_summary, df)
     except Exception as e:
-        logger.debug(f"Error in summarize_dataframe: {e}")
+        logger.debug("error in summarize_dataframe", error=e)
+
+    if (timings := CURRENT_DISPLAY_TIMINGS.get()) is not None:
+        # registration happens after displaying, so it's only included in get_display_timings()
+        timings.display_id = display_id
+        metadata["datalink"]["timings"] = timings.to_dict()
 
     metadata = {settings.MEDIA_TYPE: metadata}
 
     # this needs to happen so we can update by display_id as needed
     if with_ipython_display:
         with pd.option_context("html.table_schema", settings.HTML_TABLE_SCHEMA):
-            logger.debug(f"displaying {settings.MEDIA_TYPE} payload in {display_id=}")
+            logger.debug(
+                "displaying payload", media_type=settings.MEDIA_TYPE, display_id=display_id
+            )
             ipydisplay(
                 payload,
                 raw=True,
@@ -254,39 +319,53 @@ def determine_parent_display_id(dxdf: DXDataFrame) -> Optional[str]:
     - If the hash is different and is *not* found in SUBSET_HASH_TO_PARENT_DATA, we have
     a new dataframe altogether, which should trigger a new output.
     """
-    parent_dataset_info = SUBSET_HASH_TO_PARENT_DATA.get(dxdf.hash, {})
-
-    parent_display_id = parent_dataset_info.get("display_id")
-    no_parent_id = parent_display_id is None
-    logger.debug(f"{dxdf.display_id=} & {parent_display_id=}")
-    if no_parent_id:
-        DXDF_CACHE[dxdf.display_id] = dxdf
-    else:
-        logger.debug(f"df is subset of existing {parent_display_id=}")
-
-    last_executed_cell_id = os.environ.get("LAST_EXECUTED_CELL_ID")
-    parent_cell_id = parent_dataset_info.get("cell_id")
-    different_cell_output = parent_cell_id != dxdf.cell_id
-    logger.debug(f"{dxdf.cell_id=} | {parent_cell_id=} | {last_executed_cell_id=}")
-    if different_cell_output and parent_display_id is not None:
+    # checked and updated together, since resample requests are displayed on a background thread
+    with TRACKING_LOCK:
+        parent_dataset_info = SUBSET_HASH_TO_PARENT_DATA.get(dxdf.hash, {})
+
+        parent_display_id = parent_dataset_info.get("display_id")
+        no_parent_id = parent_display_id is None
         logger.debug(
-            f"disregarding {parent_display_id=} and using {dxdf.display_id=} since this is a new cell_id",
-            parent_cell_id=parent_cell_id,
-            cell_id=dxdf.cell_id,
+            "checking for parent display ID",
+            display_id=dxdf.display_id,
+            parent_display_id=parent_display_id,
         )
-        # doesn't matter if this dataset was associated with another,
-        # we shouldn't be re-rendering the display ID from another cell ID
-        parent_display_id = None
-
-    if parent_display_id is not None:
+        if no_parent_id:
+            DXDF_CACHE[dxdf.display_id] = dxdf
+        else:
+            logger.debug("df is subset of existing display", parent_display_id=parent_display_id)
+
+        last_executed_cell_id = os.environ.get("LAST_EXECUTED_CELL_ID")
+        parent_cell_id = parent_dataset_info.get("cell_id")
+        different_cell_output = parent_cell_id != dxdf.cell_id
         logger.debug(
-            f"updating existing display handler {parent_display_id=}",
-            parent_cell_id=parent_cell_id,
+            "checking cell IDs",
             cell_id=dxdf.cell_id,
+            parent_cell_id=parent_cell_id,
+            last_executed_cell_id=last_executed_cell_id,
         )
-        # if we don't remove this, we'll keep updating the same display handler
-        SUBSET_HASH_TO_PARENT_DATA.pop(dxdf.hash)
-    return parent_display_id
+        if different_cell_output and parent_display_id is not None:
+            logger.debug(
+                "disregarding parent display ID since this is a new cell_id",
+                parent_display_id=parent_display_id,
+                display_id=dxdf.display_id,
+                parent_cell_id=parent_cell_id,
+                cell_id=dxdf.cell_id,
+            )
+            # doesn't matter if this dataset was associated with another,
+            # we shouldn't be re-rendering the display ID from another cell ID
+            parent_display_id = None
+
+        if parent_display_id is not None:
+            logger.debug(
+                "updating existing display handler",
+                parent_display_id=parent_display_id,
+                parent_cell_id=parent_cell_id,
+                cell_id=dxdf.cell_id,
+            )
+            # if we don't remove this, we'll keep updating the same display handler
+            SUBSET_HASH_TO_PARENT_DATA.pop(dxdf.hash, None)
+        return parent_display_id
 
 
 def dev_display(payload, metadata):
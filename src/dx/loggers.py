@@ -23,6 +23,8 @@ pre_chain = [
 # Pre-processing for Structlog messages
 structlog.configure(
     processors=[
+        # drop events below the logger's level before doing any other work
+        structlog.stdlib.filter_by_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
@@ -43,22 +45,31 @@ shared_processors = [
     structlog.stdlib.add_logger_name,
     # timestamp format
     timestamper,
-    # To see all CallsiteParameterAdder options:
-    # https://www.structlog.org/en/stable/api.html?highlight=CallsiteParameterAdder#structlog.processors.CallsiteParameterAdder
-    # more options include module, pathname, process, process_name, thread, thread_name
-    structlog.processors.CallsiteParameterAdder(
-        {
-            structlog.processors.CallsiteParameter.FILENAME,
-            structlog.processors.CallsiteParameter.FUNC_NAME,
-            structlog.processors.CallsiteParameter.LINENO,
-        }
-    ),
     # Any structlog.contextvars.bind_contextvars included in middleware/functions
     structlog.contextvars.merge_contextvars,
     # strip _record and _from_structlog keys from event dictionary
     structlog.stdlib.ProcessorFormatter.remove_processors_meta,
 ]
 
+# To see all CallsiteParameterAdder options:
+# https://www.structlog.org/en/stable/api.html?highlight=CallsiteParameterAdder#structlog.processors.CallsiteParameterAdder
+# more options include module, pathname, process, process_name, thread, thread_name
+# (this inspects stack frames for every emitted event, so it's only added with LOG_CALLSITE_PARAMETERS)
+callsite_parameter_adder = structlog.processors.CallsiteParameterAdder(
+    {
+        structlog.processors.CallsiteParameter.FILENAME,
+        structlog.processors.CallsiteParameter.FUNC_NAME,
+        structlog.processors.CallsiteParameter.LINENO,
+    }
+)
+
+
+def get_shared_processors() -> list:
+    processors = list(shared_processors)
+    if settings.LOG_CALLSITE_PARAMETERS:
+        processors.insert(processors.index(timestamper) + 1, callsite_parameter_adder)
+    return processors
+
 
 def configure_logging(app_level: Optional[int] = None):
     logging.config.dictConfig(
@@ -68,7 +79,7 @@ def configure_logging(app_level: Optional[int] = None):
             "formatters": {
                 "color": {
                     "()": structlog.stdlib.ProcessorFormatter,
-                    "processors": shared_processors
+                    "processors": get_shared_processors()
                     + [
                         structlog.dev.ConsoleRenderer(colors=True),
                     ],
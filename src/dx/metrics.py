@@ -0,0 +1,318 @@
+"""
+Kernel-local counters and histograms for what dx is doing (and how long it takes), collected
+across the session while `ENABLE_METRICS` is set. Export them as a dict (`to_dict()`) or in the
+Prometheus text format, either written to a file (`write_prometheus()`, e.g. for a node exporter
+textfile collector) or served over HTTP (`serve()`).
+"""
+import bisect
+import math
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+from dx.settings import get_settings
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+__all__ = [
+    "to_dict",
+    "to_prometheus",
+    "write_prometheus",
+    "serve",
+    "reset",
+]
+
+# upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Metric:
+    metric_type: str = None
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        # (label values: value) pairs
+        self.values: dict = {}
+        self.lock = threading.Lock()
+
+    def label_values(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(label_name, "")) for label_name in self.label_names)
+
+    def samples(self) -> List[dict]:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        with self.lock:
+            self.values.clear()
+
+
+class Counter(Metric):
+    """
+    Running total that only goes up.
+    """
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not settings.ENABLE_METRICS:
+            return
+        key = self.label_values(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self.values.get(self.label_values(labels), 0)
+
+    def samples(self) -> List[dict]:
+        with self.lock:
+            return [
+                {"labels": dict(zip(self.label_names, key)), "value": value}
+                for key, value in self.values.items()
+            ]
+
+
+class Histogram(Metric):
+    """
+    Counts of observed values falling under each bucket's upper bound, along with
+    the total count and sum of all observed values.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, description, label_names=label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        if not settings.ENABLE_METRICS:
+            return
+        key = self.label_values(labels)
+        with self.lock:
+            if key not in self.values:
+                # non-cumulative count per bucket, plus one for values over the largest bound
+                self.values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            bucket_values = self.values[key]
+            bucket_values["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            bucket_values["sum"] += value
+
+    def samples(self) -> List[dict]:
+        samples = []
+        with self.lock:
+            for key, bucket_values in self.values.items():
+                cumulative_counts = []
+                total = 0
+                for count in bucket_values["counts"]:
+                    total += count
+                    cumulative_counts.append(total)
+                samples.append(
+                    {
+                        "labels": dict(zip(self.label_names, key)),
+                        "buckets": dict(zip([*self.buckets, math.inf], cumulative_counts)),
+                        "count": total,
+                        "sum": bucket_values["sum"],
+                    }
+                )
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"metric `{metric.name}` is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, description, label_names=label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, description, label_names=label_names, buckets=buckets))
+
+    def to_dict(self) -> dict:
+        return {
+            name: {
+                "type": metric.metric_type,
+                "description": metric.description,
+                "samples": metric.samples(),
+            }
+            for name, metric in self.metrics.items()
+        }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {escape_help(metric.description)}")
+            lines.append(f"# TYPE {name} {metric.metric_type}")
+            for sample in metric.samples():
+                labels = sample["labels"]
+                if metric.metric_type == "counter":
+                    lines.append(f"{name}{format_labels(labels)} {format_value(sample['value'])}")
+                    continue
+                for bound, count in sample["buckets"].items():
+                    bucket_labels = format_labels({**labels, "le": format_value(bound)})
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(f"{name}_sum{format_labels(labels)} {format_value(sample['sum'])}")
+                lines.append(f"{name}_count{format_labels(labels)} {sample['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+def escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    label_strs = []
+    for label_name, label_value in labels.items():
+        escaped_value = str(label_value).replace("\\", r"\\").replace("\n", r"\n")
+        escaped_value = escaped_value.replace('"', r"\"")
+        label_strs.append(f'{label_name}="{escaped_value}"')
+    return "{" + ",".join(label_strs) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+DISPLAYS = REGISTRY.counter(
+    "dx_displays_total",
+    "Dataframes formatted for display.",
+    label_names=("display_mode",),
+)
+DISPLAY_SECONDS = REGISTRY.histogram(
+    "dx_display_seconds",
+    "Time spent formatting a dataframe for display.",
+    label_names=("display_mode",),
+)
+ROWS_ORIGINAL = REGISTRY.counter(
+    "dx_rows_original_total",
+    "Rows in dataframes before sampling for display.",
+)
+ROWS_SAMPLED = REGISTRY.counter(
+    "dx_rows_sampled_total",
+    "Rows in dataframes after sampling for display.",
+)
+DISPLAYED_BYTES = REGISTRY.counter(
+    "dx_displayed_bytes_total",
+    "In-memory size of the (sampled) dataframes sent for display.",
+)
+RESAMPLES = REGISTRY.counter(
+    "dx_resamples_total",
+    "Datalink resample requests handled, by outcome.",
+    label_names=("backend", "status"),
+)
+RESAMPLE_SECONDS = REGISTRY.histogram(
+    "dx_resample_seconds",
+    "Time spent handling a datalink resample request.",
+    label_names=("backend",),
+)
+CACHE_HITS = REGISTRY.counter(
+    "dx_cache_hits_total",
+    "Lookups answered from a datalink cache.",
+    label_names=("cache",),
+)
+CACHE_MISSES = REGISTRY.counter(
+    "dx_cache_misses_total",
+    "Lookups that had to be computed because they weren't in a datalink cache.",
+    label_names=("cache",),
+)
+
+
+def to_dict() -> dict:
+    """
+    Returns every metric's type, description, and samples (values per label set).
+    """
+    return REGISTRY.to_dict()
+
+
+def to_prometheus() -> str:
+    """
+    Returns every metric in the Prometheus text exposition format.
+    """
+    return REGISTRY.to_prometheus()
+
+
+def write_prometheus(path: str) -> None:
+    """
+    Writes every metric in the Prometheus text exposition format to `path`, replacing
+    the file in one step so collectors never read a partially-written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+        f.write(to_prometheus())
+    # temporary files are only readable by their owner, which collectors may not be
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+
+
+def serve(port: int = 0, host: str = "127.0.0.1"):
+    """
+    Serves `to_prometheus()` at `http://{host}:{port}/metrics` on a background thread
+    (using a random free port if `port` is 0), returning the server so it can be
+    `.shutdown()`; the bound address is available from `server.server_address`.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug("metrics request", message=format % args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="dx-metrics", daemon=True)
+    thread.start()
+    logger.debug("serving metrics", address=server.server_address)
+    return server
+
+
+def reset(metric_names: Optional[List[str]] = None) -> None:
+    """
+    Resets all metrics (or only those in `metric_names`) back to zero.
+    """
+    if metric_names is None:
+        REGISTRY.reset()
+        return
+    for metric_name in metric_names:
+        REGISTRY.metrics[metric_name].reset()
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Type, Union
 
 import pandas as pd
 import structlog
@@ -6,7 +6,7 @@ from pydantic import parse_obj_as
 
 from dx.formatters.main import handle_format
 from dx.settings import settings_context
-from dx.types.charts import dex_charts
+from dx.types.charts import dex_charts, get_chart_view_model
 from dx.types.charts._base import DEXChartBase
 from dx.types.dex_metadata import DEXView
 
@@ -16,7 +16,7 @@ logger = structlog.get_logger(__name__)
 def handle_view(
     df: pd.DataFrame,
     chart_mode: str,
-    chart: Optional[dict] = None,
+    chart: Optional[Union[dict, DEXChartBase]] = None,
     return_view: bool = False,
     **kwargs,
 ) -> Optional[DEXView]:
@@ -25,16 +25,21 @@ def handle_view(
     parsing the chart information into a DEXChartView object. Once modeled, it will either be
     handled by the display formatter, or will return the view.
     """
-    logger.debug(f"{chart=}")
+    logger.debug("handling view", chart_mode=chart_mode, chart=chart)
 
     view_params = {
         "chart_mode": chart_mode,
-        "chart": DEXChartBase.parse_obj(chart or {}),
+        "chart": parse_chart_config(chart_mode, chart),
         "decoration": {"title": chart_mode.title()},
     }
     view_params.update(kwargs)
 
-    view = parse_obj_as(dex_charts, view_params)
+    view_model = get_chart_view_model(chart_mode)
+    if view_model is None:
+        # let pydantic raise its usual error for an unknown chart_mode
+        view = parse_obj_as(dex_charts, view_params)
+    else:
+        view = view_model.parse_obj(view_params)
 
     if view.chart.summary_type is not None:
         # show "Summary (Violin)" instead of just "Summary"
@@ -48,11 +53,64 @@ def handle_view(
         exclude_none=True,
         by_alias=True,
     )
-    logger.debug(f"{view_metadata=}")
+    logger.debug("generated view metadata", view_metadata=view_metadata)
     with settings_context(generate_dex_metadata=True):
         handle_format(df, extra_metadata=view_metadata)
 
 
+def get_chart_config_model(
+    chart_mode: str,
+    chart: Optional[Union[dict, DEXChartBase]] = None,
+) -> Type[DEXChartBase]:
+    """
+    Returns the chart config model used by the `chart_mode`'s view, picking from the view's
+    discriminated union of configs (like summary's `summary_type`) based on the chart options.
+    Falls back to DEXChartBase if the chart_mode or config can't be determined.
+    """
+    view_model = get_chart_view_model(chart_mode)
+    if view_model is None:
+        return DEXChartBase
+
+    chart_field = view_model.__fields__["chart"]
+    if not chart_field.sub_fields_mapping:
+        return chart_field.type_
+
+    if isinstance(chart, DEXChartBase):
+        discriminator_value = getattr(chart, chart_field.discriminator_key, None)
+    else:
+        chart = chart or {}
+        discriminator_value = chart.get(
+            chart_field.discriminator_key, chart.get(chart_field.discriminator_alias)
+        )
+    try:
+        return chart_field.sub_fields_mapping[discriminator_value].type_
+    except (KeyError, TypeError):
+        # let the view's validation raise its usual error
+        return DEXChartBase
+
+
+def parse_chart_config(
+    chart_mode: str,
+    chart: Optional[Union[dict, DEXChartBase]] = None,
+) -> DEXChartBase:
+    """
+    Validates chart options directly against the chart config model used by the `chart_mode`'s
+    view, so they aren't validated once as a DEXChartBase and again as the view's config.
+    Config models passed in (like from another view) are used as-is rather than re-validated.
+
+    Every DEXChartBase field is marked as set, the same as if the config had been
+    validated from a DEXChartBase, so the defaults are still included in view metadata.
+    """
+    config_model = get_chart_config_model(chart_mode, chart)
+    if isinstance(chart, config_model):
+        # (.copy() would drop any fields not included by the config model)
+        chart_config = config_model.construct(_fields_set=set(chart.__fields_set__), **vars(chart))
+    else:
+        chart_config = config_model.parse_obj(chart or {})
+    chart_config.__fields_set__.update(DEXChartBase.__fields__)
+    return chart_config
+
+
 def raise_for_missing_columns(columns: List[str], existing_columns: pd.Index) -> None:
     """
     Checks if a column exists in a dataframe or is "index".
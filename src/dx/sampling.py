@@ -38,7 +38,7 @@ def sample_if_too_big(df: pd.DataFrame, display_id: Optional[str] = None) -> pd.
     for col in string_columns:
         has_long_string_values = df[col].astype(str).str.len() >= max_chars
         if has_long_string_values.any():
-            logger.debug(f"truncating `{col}` to {max_chars} characters")
+            logger.debug("truncating column values", column=col, max_chars=max_chars)
             df[col] = df[col].apply(lambda x: x[:max_chars] if isinstance(x, str) else x)
 
     # in the event that there are nested/large values bloating the dataframe,
@@ -56,11 +56,13 @@ def sample_if_too_big(df: pd.DataFrame, display_id: Optional[str] = None) -> pd.
         for column, dtype in dtype_conversions:
             if column not in df.columns:
                 # this is a column that was dropped during sampling
-                logger.debug(f"`{column}` no longer in df, skipping dtype conversion")
+                logger.debug("column no longer in df, skipping dtype conversion", column=column)
                 continue
             if str(df[column].dtype) == str(dtype):
                 continue
-            logger.debug(f"converting `{column}` from `{df[column].dtype!r}` to `{dtype!r}`")
+            logger.debug(
+                "converting column dtype", column=column, from_dtype=df[column].dtype, dtype=dtype
+            )
             df[column] = df[column].astype(dtype)
 
     return df
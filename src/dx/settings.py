@@ -1,17 +1,28 @@
+import contextvars
+import importlib
 import logging
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from functools import lru_cache
 from typing import Callable, Dict, Optional, Union
 
-import pandas as pd
 import structlog
 from IPython import get_ipython
 from IPython.core.interactiveshell import InteractiveShell
+from pandas import option_context as pandas_option_context
 from pandas import set_option as pandas_set_option
-from pydantic import BaseSettings, validator
-
-from dx.dependencies import get_default_renderable_types
-from dx.types.main import DXDisplayMode, DXSamplingMethod
+from pydantic import BaseSettings, ValidationError, validator
+
+from dx.dependencies import (
+    get_base_renderable_types,
+    get_loaded_optional_modules,
+    get_loaded_renderable_types,
+)
+from dx.types.main import (
+    DXDatalinkBackend,
+    DXDisplayMode,
+    DXMaterializeMode,
+    DXSamplingMethod,
+)
 
 MB = 1024 * 1024
 
@@ -28,12 +39,69 @@ __all__ = [
     "add_renderable_type",
 ]
 
+# (setting: comm target, comm module, comm callback name) -- the comm modules (and the
+# datalink machinery behind them) are only imported when a target is (un)registered
+COMM_SETTING_TARGETS = {
+    "ENABLE_DATALINK": ("datalink_resample", "dx.comms.resample", "resampler"),
+    "ENABLE_ASSIGNMENT": ("datalink_assignment", "dx.comms.assignment", "dataframe_assignment"),
+    "ENABLE_AGGREGATION": ("datalink_aggregation", "dx.comms.aggregation", "aggregator"),
+    "ENABLE_FACETS": ("datalink_facets", "dx.comms.facets", "facet_counter"),
+}
+# settings mirrored to pandas display options whenever they're set
+PANDAS_OPTIONS = {
+    "DISPLAY_MAX_ROWS": "display.max_rows",
+    "DISPLAY_MAX_COLUMNS": "display.max_columns",
+    "HTML_TABLE_SCHEMA": "html.table_schema",
+    "MAX_STRING_LENGTH": "display.max_colwidth",
+}
+# settings that update global state (display formatters, logging, comm targets, the
+# renderable type cache) when set, so settings_context() can't override them locally
+GLOBAL_SETTINGS = {
+    "DISPLAY_MODE",
+    "LOG_LEVEL",
+    "LOG_CALLSITE_PARAMETERS",
+    "RENDERABLE_TYPES",
+    *COMM_SETTING_TARGETS,
+}
+# (setting: value) overrides from settings_context(), only visible to the
+# current thread/async task and anything it copies its context to
+SETTINGS_OVERLAY = contextvars.ContextVar("dx_settings_overlay", default={})
+
+# the resolved {type: converter} table from Settings.get_renderable_types(), along with
+# which optional dataframe modules were imported at the time; cleared when RENDERABLE_TYPES changes
+RENDERABLE_TYPES_CACHE = {}
+
 
 class Settings(BaseSettings):
     LOG_LEVEL: Union[int, str] = logging.WARNING
+    # include the filename/function/line number of each emitted log event (slower)
+    LOG_CALLSITE_PARAMETERS: bool = False
 
     # IPython.display.JSON payload/metadata during handle_format()
     DEV_MODE: bool = False
+    # record the wall-clock time of each handle_format() stage, attach them
+    # under metadata["datalink"]["timings"], and keep the last NUM_DISPLAY_TIMINGS_TRACKED
+    # for dx.get_display_timings()
+    ENABLE_DISPLAY_TIMINGS: bool = False
+    NUM_DISPLAY_TIMINGS_TRACKED: int = 100
+    # also record the size of each stage's output (which serializes non-dataframe outputs,
+    # like the display body, an extra time)
+    DISPLAY_TIMINGS_TRACK_SIZE: bool = False
+    # also record the peak memory allocated during each stage with tracemalloc (which slows down
+    # allocations while it's tracing), and the kernel's peak RSS after each display
+    # (only for displays on the main thread, not display updates from resample requests)
+    DISPLAY_TIMINGS_TRACK_MEMORY: bool = False
+    # run handle_format()/handle_resample() under cProfile, keeping the top PROFILING_NUM_FUNCTIONS
+    # functions of the last NUM_PROFILES_TRACKED calls for dx.get_profiles(), optionally printing
+    # them and writing .pstats files to PROFILING_OUTPUT_DIR (see dx.profile())
+    ENABLE_PROFILING: bool = False
+    PROFILING_PRINT_STATS: bool = False
+    PROFILING_NUM_FUNCTIONS: int = 20
+    PROFILING_SORT_BY: str = "cumulative"
+    PROFILING_OUTPUT_DIR: Optional[str] = None
+    NUM_PROFILES_TRACKED: int = 10
+    # collect session-wide counters/latency histograms in dx.metrics
+    ENABLE_METRICS: bool = True
 
     DISPLAY_MAX_ROWS: int = 60
     DISPLAY_MAX_COLUMNS: int = 20
@@ -70,9 +138,40 @@ class Settings(BaseSettings):
     # controls dataframe variable tracking, hashing, and storing in sqlite
     ENABLE_DATALINK: bool = True
     ENABLE_ASSIGNMENT: bool = True
+    ENABLE_AGGREGATION: bool = True
+    ENABLE_FACETS: bool = True
+    # number of facet count results cached per display
+    FACETS_CACHE_SIZE: int = 16
+    # handle datalink resample requests on a background thread instead of the kernel's
+    # shell thread, skipping any request that's superseded by a newer one for the same display
+    ENABLE_ASYNC_RESAMPLE: bool = True
+    # send a small first page of filtered results (with the exact filtered row count)
+    # before the full resample, so the frontend has something to render sooner
+    ENABLE_PROGRESSIVE_RESAMPLE: bool = True
+    PROGRESSIVE_RESAMPLE_PREVIEW_ROWS: int = 500
+
+    # which engine handles datalink filtering/resampling
+    DATALINK_BACKEND: DXDatalinkBackend = DXDatalinkBackend.duckdb
+    # dimension filters with more selected values than this are run as a semi-join
+    # against a registered table of values instead of an inline `IN (...)` list
+    DIMENSION_FILTER_SEMI_JOIN_THRESHOLD: int = 1_000
+    # build an n-gram index for text filters on columns with at least this many distinct
+    # values when filtering with numpy (duckdb scans string columns natively)
+    ENABLE_TEXT_INDEX: bool = True
+    TEXT_INDEX_MIN_UNIQUE_VALUES: int = 10_000
+    TEXT_INDEX_NGRAM_SIZE: int = 3
+    # cache each filter's (bit-packed) row mask per display when filtering with numpy
+    ENABLE_FILTER_BITMAP_CACHE: bool = True
 
     NUM_PAST_SAMPLES_TRACKED: int = 3
     DB_LOCATION: str = ":memory:"
+    # whether dataframes are registered in duckdb as views over the pandas data,
+    # or copied into native tables (sorted by their most-filtered date column)
+    # to speed up repeated filtering at the cost of extra memory
+    DB_MATERIALIZE_MODE: DXMaterializeMode = DXMaterializeMode.auto
+    DB_MATERIALIZE_MIN_ROWS: int = 1_000_000
+    DB_MATERIALIZE_MIN_FILTER_COUNT: int = 3
+    DB_MATERIALIZE_SORT_BY_DATE: bool = True
 
     GENERATE_DEX_METADATA: bool = False
     ALLOW_NOTEABLE_ATTRS: bool = True
@@ -80,7 +179,8 @@ class Settings(BaseSettings):
     @validator("RENDERABLE_TYPES", pre=True, always=True)
     def validate_renderables(cls, vals):
         """Allow passing comma-separated strings or actual types."""
-        vals = vals or get_default_renderable_types()
+        RENDERABLE_TYPES_CACHE.clear()
+        vals = vals or get_base_renderable_types()
         if isinstance(vals, dict):
             return vals
 
@@ -104,33 +204,88 @@ class Settings(BaseSettings):
             raise ValueError("DISPLAY_MAX_COLUMNS must be >= 0")
         if val > 50_000:
             raise ValueError("DISPLAY_MAX_COLUMNS must be <= 50000")
-        pd.set_option("display.max_columns", val)
         return val
 
     @validator("DISPLAY_MAX_ROWS", pre=True, always=True)
     def validate_display_max_rows(cls, val):
         if val < 0:
             raise ValueError("DISPLAY_MAX_ROWS must be >= 0")
-        pd.set_option("display.max_rows", val)
         return val
 
     @validator("HTML_TABLE_SCHEMA", pre=True, always=True)
     def validate_html_table_schema(cls, val):
-        pd.set_option("html.table_schema", val)
         return val
 
     @validator("MAX_STRING_LENGTH", pre=True, always=True)
     def validate_max_string_length(cls, val):
         if val < 0:
             raise ValueError("MAX_STRING_LENGTH must be >= 0")
-        pd.set_option("display.max_colwidth", val)
         return val
 
-    def get_renderable_types(self):
-        return {
-            **self.RENDERABLE_TYPES,
-            **get_default_renderable_types(),
-        }
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for key, pandas_option in PANDAS_OPTIONS.items():
+            pandas_set_option(pandas_option, vars(self)[key])
+
+    def __setattr__(self, name: str, value):
+        super().__setattr__(name, value)
+        if name in PANDAS_OPTIONS:
+            pandas_set_option(PANDAS_OPTIONS[name], vars(self)[name])
+
+    def __getattribute__(self, name: str):
+        # only settings (upper-case fields) can be overridden by settings_context()
+        if name[:1].isupper():
+            overlay = SETTINGS_OVERLAY.get()
+            if name in overlay:
+                return overlay[name]
+        return super().__getattribute__(name)
+
+    def dict(self, **kwargs) -> dict:
+        values = super().dict(**kwargs)
+        for key, value in SETTINGS_OVERLAY.get().items():
+            if key in values:
+                values[key] = value
+        return values
+
+    def validate_override(self, key: str, value):
+        """
+        Validates a value for a setting without assigning it.
+        """
+        field = self.__fields__.get(key)
+        if field is None:
+            raise ValueError(f"`{key}` is not a valid setting")
+        value, errors = field.validate(value, vars(self), loc=key, cls=self.__class__)
+        if errors:
+            raise ValidationError([errors], self.__class__)
+        return value
+
+    def get_renderable_types(self) -> dict:
+        """
+        Returns the types handled by the display formatter, along with their
+        converters to pd.DataFrame. This is resolved once and reused until RENDERABLE_TYPES
+        changes or another optional dataframe library (dask, geopandas, modin, polars, vaex)
+        is imported, so displaying an object never probes for or imports those libraries.
+        """
+        loaded_modules = get_loaded_optional_modules()
+        if RENDERABLE_TYPES_CACHE.get("loaded_modules") != loaded_modules:
+            renderable_types = {
+                **self.RENDERABLE_TYPES,
+                **get_loaded_renderable_types(),
+            }
+            logger.debug(f"resolved {len(renderable_types)} renderable type(s)")
+            RENDERABLE_TYPES_CACHE.update(
+                loaded_modules=loaded_modules,
+                types=renderable_types,
+                type_tuple=tuple(renderable_types),
+            )
+        return RENDERABLE_TYPES_CACHE["types"]
+
+    def is_renderable(self, obj) -> bool:
+        """
+        Returns True if the object is one of the types handled by the display formatter.
+        """
+        self.get_renderable_types()
+        return isinstance(obj, RENDERABLE_TYPES_CACHE["type_tuple"])
 
     class Config:
         validate_assignment = True
@@ -205,16 +360,6 @@ def set_option(
     if key in vars(settings):
         setattr(settings, key, value)
 
-        # make sure pandas settings are updated as well for display sizes
-        pd_options = {
-            "DISPLAY_MAX_ROWS": "display.max_rows",
-            "DISPLAY_MAX_COLUMNS": "display.max_columns",
-            "HTML_TABLE_SCHEMA": "html.table_schema",
-        }
-        if key in pd_options:
-            logger.debug(f"setting pandas option {pd_options[key]} to {value}")
-            pandas_set_option(pd_options[key], value)
-
         # this may be the most straightforward way to handle
         # IPython display formatter changes being done through
         # settings updates for now, but I don't like it being here
@@ -224,6 +369,12 @@ def set_option(
         if key == "LOG_LEVEL":
             set_log_level(value)
 
+        if key == "LOG_CALLSITE_PARAMETERS":
+            # circular import
+            from dx.loggers import configure_logging
+
+            configure_logging()
+
         # allow enabling/disabling comms based on settings
         enable_disable_comms(
             setting_name=key,
@@ -247,20 +398,15 @@ def enable_disable_comms(
     And to re-register it:
     >>> enable_disable_comms("ENABLE_DATALINK", True)
     """
-    from dx import comms
-
-    comm_setting_targets = {
-        "ENABLE_DATALINK": ("datalink_resample", comms.resample.resampler),
-        "ENABLE_ASSIGNMENT": ("datalink_assignment", comms.assignment.dataframe_assignment),
-    }
-    if setting_name not in comm_setting_targets:
+    if setting_name not in COMM_SETTING_TARGETS:
         return
 
     ipython_shell = ipython_shell or get_ipython()
     if getattr(ipython_shell, "kernel", None) is None:
         return
 
-    comm_target, comm_callback = comm_setting_targets[setting_name]
+    comm_target, comm_module_name, comm_callback_name = COMM_SETTING_TARGETS[setting_name]
+    comm_callback = getattr(importlib.import_module(comm_module_name), comm_callback_name)
     if enabled:
         ipython_shell.kernel.comm_manager.register_target(comm_target, comm_callback)
     else:
@@ -269,25 +415,54 @@ def enable_disable_comms(
 
 @contextmanager
 def settings_context(ipython_shell: Optional[InteractiveShell] = None, **option_kwargs):
+    """
+    Temporarily overrides settings within the context.
+
+    Most overrides are validated and stored in a context-local overlay instead of being
+    assigned, so they only apply to the current thread/async task (a resample running
+    in the background won't change the settings seen by cells executing meanwhile).
+    Settings that update global state (`GLOBAL_SETTINGS`) are set with `set_option()`
+    and reset on exit, and any mirrored pandas display options (`PANDAS_OPTIONS`)
+    are set with `pd.option_context()`.
+    """
     settings = get_settings()
-    orig_settings = settings.dict()
     option_kwargs = {str(k).upper(): v for k, v in option_kwargs.items()}
+    global_kwargs = {
+        setting: option_kwargs.pop(setting)
+        for setting in list(option_kwargs)
+        if setting in GLOBAL_SETTINGS
+    }
+    overrides = {
+        setting: settings.validate_override(setting, value)
+        for setting, value in option_kwargs.items()
+    }
+    overlay = {**SETTINGS_OVERLAY.get(), **overrides}
+    # pandas display options are global, so they're applied (and restored on exit) directly
+    pandas_options = [
+        arg
+        for setting, value in overrides.items()
+        if setting in PANDAS_OPTIONS
+        for arg in (PANDAS_OPTIONS[setting], value)
+    ]
+    pandas_context = pandas_option_context(*pandas_options) if pandas_options else nullcontext()
+    orig_settings = {setting: vars(settings)[setting] for setting in global_kwargs}
 
     # handle DISPLAY_MODE updates first since it can overwrite other settings
-    if display_mode := option_kwargs.pop("DISPLAY_MODE", None):
+    if display_mode := global_kwargs.pop("DISPLAY_MODE", None):
         set_display_mode(display_mode, ipython_shell=ipython_shell)
 
+    overlay_token = SETTINGS_OVERLAY.set(overlay)
     try:
-        for setting, value in option_kwargs.items():
+        for setting, value in global_kwargs.items():
             set_option(setting, value, ipython_shell=ipython_shell)
-        yield settings
+        with pandas_context:
+            yield settings
     finally:
+        SETTINGS_OVERLAY.reset(overlay_token)
         if display_mode is not None:
             set_display_mode(orig_settings["DISPLAY_MODE"], ipython_shell=ipython_shell)
-        for setting, value in orig_settings.items():
-            # only reset it if it was adjusted originally; don't reset everything
-            if setting in option_kwargs:
-                set_option(setting, value, ipython_shell=ipython_shell)
+        for setting in global_kwargs:
+            set_option(setting, orig_settings[setting], ipython_shell=ipython_shell)
 
 
 def add_renderable_type(renderable_type: type, converter: Optional[Union[Callable, str]] = None):
@@ -300,3 +475,4 @@ def add_renderable_type(renderable_type: type, converter: Optional[Union[Callabl
     renderable = {renderable_type: converter}
     logger.debug(f"adding `{renderable}` to {settings.RENDERABLE_TYPES=}")
     settings.RENDERABLE_TYPES.update(renderable)
+    RENDERABLE_TYPES_CACHE.clear()
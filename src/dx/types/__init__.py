@@ -1,4 +1,112 @@
-from .charts import *
-from .dex_metadata import *
-from .filters import *
-from .main import *
+from dx.utils.lazy import make_lazy_module
+
+# submodules are only imported once one of their attributes is accessed (PEP 562),
+# so e.g. `dx.types.main` doesn't pull in every chart model
+LAZY_NAMES = {
+    "dx.types.main": (
+        "BaseEnum",
+        "DXDisplayMode",
+        "DXSamplingMethod",
+        "DXDatalinkBackend",
+        "DXMaterializeMode",
+        "DEXMediaType",
+    ),
+    "dx.types.filters": (
+        "BOOL_STRINGS",
+        "DEXDateFilter",
+        "DEXDimensionFilter",
+        "DEXMetricFilter",
+        "DEXTextFilter",
+        "DEXFilterSettings",
+        "DEXResampleMessage",
+        "clean_pandas_query_column",
+        "to_naive_utc",
+        "exact_number",
+        "sql_number",
+        "get_filter_series",
+    ),
+    "dx.types.dex_metadata": (
+        "DEXColorMode",
+        "DEXFunctionalCondition",
+        "DEXGradient",
+        "color_schemes",
+        "DEXColorScheme",
+        "DEXMode",
+        "DEXConfoScale",
+        "DEXViewType",
+        "DEXFieldOverrideType",
+        "DEXBaseModel",
+        "DEXColorOptions",
+        "DEXFixedColorOptions",
+        "DEXFunctionalColorOptions",
+        "DEXGradientColorOptions",
+        "DEXThresholdColorOptions",
+        "DEXConditionalFormatRule",
+        "DEXDecoration",
+        "DEXDashboardViewConfig",
+        "DEXField",
+        "DEXStyleConfig",
+        "DEXView",
+        "DEXDashboard",
+        "DEXMetadata",
+    ),
+    "dx.types.aggregation": (
+        "SQL_AGGREGATE_FUNCTIONS",
+        "AGGREGATION_COUNT_COLUMN",
+        "DEXAggregationMessage",
+        "quote_column",
+    ),
+    "dx.types.facets": ("DEXFacetsMessage",),
+    "dx.types.charts": (
+        "DEXAdjacencyMatrixChartView",
+        "DEXArcFlowChartView",
+        "DEXBarChartView",
+        "DEXBigNumberChartView",
+        "DEXCandlestickChartView",
+        "DEXChoroplethChartView",
+        "DEXConnectedScatterChartView",
+        "DEXCorrelationMatrixChartView",
+        "DEXCumulativeChartView",
+        "DEXDataPrismChartView",
+        "DEXDendrogramChartView",
+        "DEXDimensionMatrixChartView",
+        "DEXDivergingBarChartView",
+        "DEXDonutChartView",
+        "DEXGenericDotPlotChartView",
+        "DEXFlowDiagramChartView",
+        "DEXForceDirectedNetworkChartView",
+        "DEXFunnelChartView",
+        "DEXFunnelChartChartView",
+        "DEXFunnelSunburstChartView",
+        "DEXFunnelTreeChartView",
+        "DEXHexbinChartView",
+        "DEXLineChartView",
+        "DEXLinePercentChartView",
+        "DEXParallelCoordinatesChartView",
+        "DEXPartitionChartView",
+        "DEXPieChartView",
+        "DEXSankeyChartView",
+        "DEXScatterChartView",
+        "DEXScatterPlotMatrixChartView",
+        "DEXStackedAreaChartView",
+        "DEXStackedPercentChartView",
+        "DEXSummaryChartView",
+        "DEXSunburstChartView",
+        "DEXTilemapChartView",
+        "DEXTreemapChartView",
+        "DEXWordcloudChartView",
+        "basic_charts",
+        "comparison_charts",
+        "funnel_charts",
+        "map_charts",
+        "part_to_whole_charts",
+        "relationship_charts",
+        "summary_charts",
+        "time_series_charts",
+        "dex_charts",
+        "get_chart_view_models",
+        "CHART_VIEW_MODELS",
+        "get_chart_view_model",
+    ),
+}
+__getattr__, __dir__ = make_lazy_module(__name__, LAZY_NAMES)
@@ -0,0 +1,99 @@
+from typing import List, Optional
+
+import structlog
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+
+from dx.types.charts._base import DEXChartBase
+from dx.types.charts.options import DEXCombinationMode
+from dx.types.filters import DEXFilterSettings, FilterTypes
+
+logger = structlog.get_logger(__name__)
+
+# DEX combination modes -> duckdb aggregate functions
+SQL_AGGREGATE_FUNCTIONS = {
+    DEXCombinationMode.avg.value: "AVG",
+    DEXCombinationMode.count.value: "COUNT",
+    DEXCombinationMode.max.value: "MAX",
+    DEXCombinationMode.med.value: "MEDIAN",
+    DEXCombinationMode.min.value: "MIN",
+    DEXCombinationMode.sum.value: "SUM",
+}
+# column name used for the per-group row count
+AGGREGATION_COUNT_COLUMN = "DEX_COUNT"
+
+
+class DEXAggregationMessage(BaseModel):
+    """
+    Request for a chart's group-by aggregation, run against the full
+    registered dataset instead of the sampled rows sent to the frontend.
+    """
+
+    display_id: str
+    dimensions: List[str] = Field(default_factory=list)
+    metrics: List[str] = Field(default_factory=list)
+    combination_mode: DEXCombinationMode = DEXCombinationMode.avg
+    filters: List[Annotated[FilterTypes, Field(discriminator="type")]] = Field(default_factory=list)
+    limit: Optional[int] = 50_000
+    cell_id: Optional[str] = None
+
+    class Config:
+        use_enum_values = True
+
+    @classmethod
+    def from_chart(
+        cls,
+        display_id: str,
+        chart: DEXChartBase,
+        **kwargs,
+    ) -> "DEXAggregationMessage":
+        """
+        Builds an aggregation request from a chart config's dimension (`dim1`-`dim3`)
+        and metric (`metric1`-`metric2`) columns and its `combination_mode`.
+        """
+        dimensions = [dim for dim in (chart.dim1, chart.dim2, chart.dim3) if dim]
+        metrics = [
+            metric
+            for metric in (chart.metric1, chart.metric2)
+            if metric and metric != AGGREGATION_COUNT_COLUMN
+        ]
+        params = {
+            "display_id": display_id,
+            "dimensions": dimensions,
+            "metrics": metrics,
+        }
+        if chart.combination_mode is not None:
+            params["combination_mode"] = str(chart.combination_mode).upper()
+        params.update(kwargs)
+        return cls.parse_obj(params)
+
+    def to_sql_query(self) -> str:
+        """
+        Returns a SQL group-by query with a `{table_name}` placeholder to be
+        filled in with the registered table of the display ID.
+        """
+        agg_func = SQL_AGGREGATE_FUNCTIONS[str(self.combination_mode)]
+
+        select_columns = [quote_column(dim) for dim in self.dimensions]
+        for metric in self.metrics:
+            select_columns.append(f"{agg_func}({quote_column(metric)}) AS {quote_column(metric)}")
+        select_columns.append(f"COUNT(*) AS {quote_column(AGGREGATION_COUNT_COLUMN)}")
+
+        query_string = f"SELECT {', '.join(select_columns)} FROM {{table_name}}"
+        if self.filters:
+            sql_filter_str = DEXFilterSettings(filters=self.filters).to_sql_query()
+            query_string = f"{query_string} WHERE {sql_filter_str}"
+        if self.dimensions:
+            group_columns = ", ".join(quote_column(dim) for dim in self.dimensions)
+            query_string = f"{query_string} GROUP BY {group_columns} ORDER BY {group_columns}"
+        if self.limit is not None:
+            query_string = f"{query_string} LIMIT {self.limit}"
+        return query_string
+
+
+def quote_column(column: str) -> str:
+    """
+    Double-quotes a column name for use as a SQL identifier.
+    """
+    escaped_column = str(column).replace('"', '""')
+    return f'"{escaped_column}"'
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Dict, Optional, Type, Union, get_args
 
 from pydantic import Field
 from typing_extensions import Annotated
@@ -40,6 +40,7 @@ from dx.types.charts.sunburst import DEXSunburstChartView
 from dx.types.charts.tilemap import DEXTilemapChartView
 from dx.types.charts.treemap import DEXTreemapChartView
 from dx.types.charts.wordcloud import DEXWordcloudChartView
+from dx.types.dex_metadata import DEXView
 
 basic_charts = Annotated[
     Union[
@@ -145,3 +146,27 @@ dex_charts = Annotated[
     ],
     Field(discriminator="chart_mode"),
 ]
+
+
+def get_chart_view_models(chart_union=dex_charts) -> Dict[str, Type[DEXView]]:
+    """
+    Flattens a (nested) discriminated union of chart views into a
+    `chart_mode` -> view model mapping.
+    """
+    view_models = {}
+    for arg in get_args(chart_union):
+        if isinstance(arg, type) and issubclass(arg, DEXView):
+            view_models.setdefault(arg.__fields__["chart_mode"].default, arg)
+        elif get_args(arg):
+            for chart_mode, view_model in get_chart_view_models(arg).items():
+                view_models.setdefault(chart_mode, view_model)
+    return view_models
+
+
+# used to go straight to a view's model instead of having pydantic hash and
+# walk the `dex_charts` union for every view (see dx.plotting.utils.handle_view)
+CHART_VIEW_MODELS = get_chart_view_models()
+
+
+def get_chart_view_model(chart_mode: str) -> Optional[Type[DEXView]]:
+    return CHART_VIEW_MODELS.get(chart_mode)
@@ -0,0 +1,147 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import structlog
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+
+from dx.types.aggregation import quote_column
+from dx.types.filters import DEXFilterSettings, FilterTypes
+
+logger = structlog.get_logger(__name__)
+
+
+class DEXFacetsMessage(BaseModel):
+    """
+    Request for the value counts (dimension columns) and histograms (metric columns)
+    used to populate filter widgets, computed over the full registered dataset
+    with the current filters applied.
+    """
+
+    display_id: str
+    dimensions: List[str] = Field(default_factory=list)
+    metrics: List[str] = Field(default_factory=list)
+    filters: List[Annotated[FilterTypes, Field(discriminator="type")]] = Field(default_factory=list)
+    top_k: int = 10
+    num_bins: int = 20
+    cell_id: Optional[str] = None
+
+    @property
+    def cache_key(self) -> str:
+        return self.json(exclude={"display_id", "cell_id"}, sort_keys=True)
+
+    def to_sql_query(self) -> str:
+        """
+        Returns a single grouped query (one grouping set per column) with a `{table_name}`
+        placeholder, returning the top `top_k` values of each dimension column (plus its
+        missing value count) and `num_bins` fixed-width bins for each metric column.
+        """
+        facet_columns = [*self.dimensions, *self.metrics]
+
+        stats_columns = {"num_rows": "COUNT(*)"}
+        facet_exprs = []
+        for i, column in enumerate(self.dimensions):
+            stats_columns[f"count_{i}"] = f"COUNT({quote_column(column)})"
+            # dimension filter values come through as strings
+            facet_exprs.append(f"CAST({quote_column(column)} AS VARCHAR) AS facet_{i}")
+        for i, column in enumerate(self.metrics, start=len(self.dimensions)):
+            value = f"CAST({quote_column(column)} AS DOUBLE)"
+            finite_filter = f"FILTER (WHERE isfinite({value}))"
+            stats_columns[f"count_{i}"] = f"COUNT({value}) {finite_filter}"
+            stats_columns[f"min_{i}"] = f"MIN({value}) {finite_filter}"
+            stats_columns[f"max_{i}"] = f"MAX({value}) {finite_filter}"
+            # values equal to the max go in the last bin; a column with a single value
+            # goes in the first bin; missing/infinite values aren't binned
+            bin_expr = (
+                f"CAST(FLOOR(({value} - min_{i}) / NULLIF(max_{i} - min_{i}, 0) * {self.num_bins})"
+                " AS INTEGER)"
+            )
+            facet_exprs.append(
+                f"CASE WHEN isfinite({value})"
+                f" THEN COALESCE(LEAST({bin_expr}, {self.num_bins - 1}), 0) END AS facet_{i}"
+            )
+
+        filtered_query = "SELECT * FROM {table_name}"
+        if self.filters:
+            sql_filter_str = DEXFilterSettings(filters=self.filters).to_sql_query()
+            filtered_query = f"{filtered_query} WHERE {sql_filter_str}"
+
+        facet_names = [f"facet_{i}" for i in range(len(facet_columns))]
+        dimension_names = facet_names[: len(self.dimensions)]
+        metric_names = facet_names[len(self.dimensions) :]
+
+        # keep the missing value group of each dimension plus its `top_k` most common values,
+        # and every bin of each metric
+        qualify_str = ""
+        if dimension_names:
+            is_missing = f"COALESCE({', '.join(dimension_names)}) IS NULL"
+            qualify_conditions = [
+                "ROW_NUMBER() OVER (PARTITION BY facet_id"
+                f" ORDER BY {is_missing} DESC, facet_count DESC) <= {self.top_k + 1}",
+                *[f"GROUPING({name}) = 0" for name in metric_names],
+            ]
+            qualify_str = f" QUALIFY {' OR '.join(qualify_conditions)}"
+
+        # the (constant) stats are carried through each group so this stays a single query
+        stats_str = ", ".join(f"{expr} AS {name}" for name, expr in stats_columns.items())
+        any_stats_str = ", ".join(f"ANY_VALUE({name}) AS {name}" for name in stats_columns)
+        return (
+            f"WITH filtered AS ({filtered_query}),"
+            f" stats AS (SELECT {stats_str} FROM filtered),"
+            f" facets AS (SELECT stats.*, {', '.join(facet_exprs)} FROM filtered, stats)"
+            f" SELECT GROUPING_ID({', '.join(facet_names)}) AS facet_id, {', '.join(facet_names)},"
+            f" COUNT(*) AS facet_count, {any_stats_str}"
+            " FROM facets"
+            f" GROUP BY GROUPING SETS ({', '.join(f'({name})' for name in facet_names)})"
+            f"{qualify_str}"
+        )
+
+    def to_payload(self, facets_df: pd.DataFrame) -> dict:
+        """
+        Converts the grouped facet rows into compact per-column arrays:
+        - dimensions: `values`/`counts` sorted by count, with `null_count`
+          and `other_count` (non-missing rows outside the top values)
+        - metrics: `bin_edges` (`num_bins + 1`) and `counts` (`num_bins`), with `null_count`
+          (missing or infinite values)
+        """
+        # no rows means nothing matched the filters
+        stats = facets_df.iloc[0] if len(facets_df) else {}
+        num_rows = int(stats.get("num_rows", 0))
+        payload = {"num_rows": num_rows, "dimensions": {}, "metrics": {}}
+
+        facet_columns = [*self.dimensions, *self.metrics]
+        num_facets = len(facet_columns)
+        for i, column in enumerate(facet_columns):
+            facet_name = f"facet_{i}"
+            non_null_count = int(stats.get(f"count_{i}", 0))
+            # only this facet's column is grouped in its grouping set
+            facet_id = (2**num_facets - 1) - 2 ** (num_facets - 1 - i)
+            facet_rows = facets_df[facets_df.facet_id == facet_id]
+            value_rows = facet_rows[facet_rows[facet_name].notnull()]
+
+            if i < len(self.dimensions):
+                value_rows = value_rows.sort_values("facet_count", ascending=False).head(self.top_k)
+                counts = value_rows.facet_count.astype(int).tolist()
+                payload["dimensions"][column] = {
+                    "values": value_rows[facet_name].tolist(),
+                    "counts": counts,
+                    "null_count": num_rows - non_null_count,
+                    "other_count": non_null_count - sum(counts),
+                }
+                continue
+
+            counts = np.zeros(self.num_bins, dtype=int)
+            counts[value_rows[facet_name].astype(int).to_numpy()] = value_rows.facet_count
+            bin_edges = []
+            if non_null_count:
+                bin_edges = np.linspace(
+                    stats[f"min_{i}"], stats[f"max_{i}"], self.num_bins + 1
+                ).tolist()
+            payload["metrics"][column] = {
+                "bin_edges": bin_edges,
+                "counts": counts.tolist(),
+                "null_count": num_rows - non_null_count,
+            }
+
+        return payload
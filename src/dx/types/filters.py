@@ -1,6 +1,11 @@
+import hashlib
+import json
+import math
+import numbers
 from datetime import datetime
-from typing import List, Literal, Optional, Union
+from typing import List, Literal, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import structlog
 from pydantic import BaseModel, Field
@@ -10,6 +15,8 @@ from dx.types.main import DXSamplingMethod
 
 logger = structlog.get_logger(__name__)
 
+BOOL_STRINGS = {"true": True, "false": False}
+
 
 class DEXDateFilter(BaseModel):
     column: str
@@ -25,9 +32,11 @@ class DEXDateFilter(BaseModel):
 
     @property
     def sql_filter(self) -> str:
-        sql_time_fmt = "%Y-%m-%dT%H:%M:%S.%f"  # yyyy-mm-ddThh:mi:ss.mmm
-        start_timestamp = pd.Timestamp(self.start).strftime(sql_time_fmt)
-        end_timestamp = pd.Timestamp(self.end).strftime(sql_time_fmt)
+        # the explicit UTC offset keeps duckdb from reading the bounds in the connection's
+        # local time zone when comparing them against TIMESTAMPTZ columns
+        sql_time_fmt = "%Y-%m-%dT%H:%M:%S.%f+00:00"  # yyyy-mm-ddThh:mi:ss.mmm+00:00
+        start_timestamp = to_naive_utc(self.start).strftime(sql_time_fmt)
+        end_timestamp = to_naive_utc(self.end).strftime(sql_time_fmt)
         date_filter_min = f""""{self.column}" >= '{start_timestamp}'"""
         date_filter_max = f""""{self.column}" <= '{end_timestamp}'"""
         return f"{date_filter_min} AND {date_filter_max}"
@@ -37,12 +46,26 @@ class DEXDateFilter(BaseModel):
         # any kind of .to_pydatetime() conversion will likely raise
         # InvalidComparison errors between pd.Timestamp and np.datetime64,
         # but the frontend passes UTC time, while the data may not have tzinfo
-        start_timestamp = pd.Timestamp(self.start).tz_localize(None)
-        end_timestamp = pd.Timestamp(self.end).tz_localize(None)
+        start_timestamp = to_naive_utc(self.start)
+        end_timestamp = to_naive_utc(self.end)
         date_filter_min = f"""({self._pd_column} >= "{start_timestamp}")"""
         date_filter_max = f"""({self._pd_column} <= "{end_timestamp}")"""
         return f"({date_filter_min} & {date_filter_max})"
 
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        # matches sql_filter: tz-aware start/end and values are both compared in UTC,
+        # and values without tzinfo are assumed to be UTC already
+        s = get_filter_series(df, self.column)
+        if not pd.api.types.is_datetime64_any_dtype(s):
+            s = pd.to_datetime(s, errors="coerce")
+        if getattr(s.dt, "tz", None) is not None:
+            s = s.dt.tz_convert("UTC").dt.tz_localize(None)
+        # the database stores timestamps (and sql_filter formats start/end) at microsecond precision
+        values = s.to_numpy(dtype="datetime64[ns]").astype("datetime64[us]")
+        start = np.datetime64(to_naive_utc(self.start).floor("us"), "us")
+        end = np.datetime64(to_naive_utc(self.end).floor("us"), "us")
+        return (values >= start) & (values <= end)
+
 
 class DEXDimensionFilter(BaseModel):
     column: str
@@ -57,6 +80,9 @@ class DEXDimensionFilter(BaseModel):
 
     @property
     def sql_filter(self) -> str:
+        if self.use_semi_join:
+            # the values table is registered by the datalink backend before the query runs
+            return f""""{self.column}" IN (SELECT "value" FROM {self.values_table_name})"""
         quote_scaped_vals = [v.replace("'", "''").replace('"', '""') for v in self.value]
         filter_values_str = ", ".join([f"'{v}'" for v in quote_scaped_vals])
         return f""""{self.column}" IN ({filter_values_str})"""
@@ -65,6 +91,54 @@ class DEXDimensionFilter(BaseModel):
     def pandas_filter(self) -> str:
         return f"""({self._pd_column} in {self.value})"""
 
+    @property
+    def use_semi_join(self) -> bool:
+        """
+        Whether the selected values should be loaded into a table and joined against
+        instead of being inlined into the SQL string.
+        """
+        from dx.settings import get_settings
+
+        return len(self.value) > get_settings().DIMENSION_FILTER_SEMI_JOIN_THRESHOLD
+
+    @property
+    def values_table_name(self) -> str:
+        values_hash = hashlib.md5(
+            json.dumps([self.column, self.value], default=str).encode()
+        ).hexdigest()
+        return f"dex_filter_values_{values_hash}"
+
+    def values_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the selected values as a single-column (`value`) dataframe,
+        cast to the filtered column's dtype so the database can join on it directly.
+        """
+        s = get_filter_series(df, self.column)
+        return pd.DataFrame({"value": self.cast_values(s)})
+
+    def cast_values(self, s: pd.Series) -> Union[list, pd.Series]:
+        """
+        Casts the selected values to the dtype of the filtered column.
+        """
+        values = self.value
+        if pd.api.types.is_bool_dtype(s):
+            # `.astype(bool)` casts any non-empty string (including "False") to True,
+            # so boolean strings are parsed the same way duckdb would
+            parsed_values = [BOOL_STRINGS.get(str(v).strip().lower()) for v in values]
+            return pd.Series([v for v in parsed_values if v is not None], dtype=s.dtype)
+        if not pd.api.types.is_object_dtype(s) and not isinstance(s.dtype, pd.CategoricalDtype):
+            # values come through as strings from the frontend, which sql_filter
+            # lets duckdb cast to the column type
+            try:
+                values = pd.Series(values).astype(s.dtype)
+            except (TypeError, ValueError):
+                pass
+        return values
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        s = get_filter_series(df, self.column)
+        return s.isin(self.cast_values(s)).to_numpy(dtype=bool)
+
 
 class DEXMetricFilter(BaseModel):
     column: str
@@ -77,10 +151,19 @@ class DEXMetricFilter(BaseModel):
     def _pd_column(self):
         return clean_pandas_query_column(self.column)
 
+    @property
+    def bounds(self) -> Tuple[Union[int, float], Union[int, float]]:
+        """
+        Returns the (min, max) bounds, keeping whole-number bounds as exact ints
+        so large integer columns aren't compared through floats.
+        """
+        return exact_number(self.value[0]), exact_number(self.value[1])
+
     @property
     def sql_filter(self) -> str:
-        metric_filter_min = f""""{self.column}" >= {self.value[0]}"""
-        metric_filter_max = f""""{self.column}" <= {self.value[1]}"""
+        metric_min, metric_max = [sql_number(bound) for bound in self.bounds]
+        metric_filter_min = f""""{self.column}" >= {metric_min}"""
+        metric_filter_max = f""""{self.column}" <= {metric_max}"""
         return f"{metric_filter_min} AND {metric_filter_max}"
 
     @property
@@ -90,8 +173,101 @@ class DEXMetricFilter(BaseModel):
         metric_filter_max = f"""({self._pd_column} <= {self.value[1]})"""
         return f"({metric_filter_min} & {metric_filter_max})"
 
+    def integer_bounds(self, dtype: np.dtype) -> Optional[Tuple[int, int]]:
+        """
+        Returns the bounds narrowed to whole numbers within the range of an integer dtype,
+        or None if no values of that dtype can be in range.
+        """
+        info = np.iinfo(dtype)
+        metric_min, metric_max = self.bounds
+        metric_min = info.min if metric_min == -math.inf else math.ceil(metric_min)
+        metric_max = info.max if metric_max == math.inf else math.floor(metric_max)
+        if metric_min > min(metric_max, info.max) or metric_max < info.min:
+            return None
+        return max(metric_min, info.min), min(metric_max, info.max)
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        s = get_filter_series(df, self.column)
+        if pd.api.types.is_integer_dtype(s):
+            # compared as integers, since int64 values above 2**53 aren't exact as floats
+            dtype = getattr(s.dtype, "numpy_dtype", s.dtype)
+            integer_bounds = self.integer_bounds(dtype)
+            if integer_bounds is None:
+                return np.zeros(len(s), dtype=bool)
+            values = s.to_numpy(dtype=dtype, na_value=0)
+            in_range = (values >= integer_bounds[0]) & (values <= integer_bounds[1])
+            return in_range & s.notna().to_numpy()
+        if not pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            s = pd.to_numeric(s, errors="coerce")
+        # missing values are compared as NaN, which is never in range
+        values = s.to_numpy(dtype="float64", na_value=np.nan)
+        metric_min, metric_max = self.bounds
+        return (values >= float(metric_min)) & (values <= float(metric_max))
 
-FilterTypes = Union[DEXDateFilter, DEXDimensionFilter, DEXMetricFilter]
+
+class DEXTextFilter(BaseModel):
+    column: str
+    type: Literal["TEXT_FILTER"] = "TEXT_FILTER"
+    predicate: Literal["contains", "prefix", "regex"] = "contains"
+    case_sensitive: bool = False
+
+    value: str
+
+    @property
+    def _pd_column(self):
+        return clean_pandas_query_column(self.column)
+
+    @property
+    def sql_filter(self) -> str:
+        column = f"""CAST("{self.column}" AS VARCHAR)"""
+        value = f"""'{self.value.replace("'", "''")}'"""
+        if self.predicate == "regex":
+            regex_options = "" if self.case_sensitive else ", 'i'"
+            return f"regexp_matches({column}, {value}{regex_options})"
+        if not self.case_sensitive:
+            column = f"lower({column})"
+            value = f"lower({value})"
+        sql_function = "starts_with" if self.predicate == "prefix" else "contains"
+        return f"{sql_function}({column}, {value})"
+
+    @property
+    def pandas_filter(self) -> str:
+        # requires `.query(..., engine="python")`
+        column = f"{self._pd_column}.astype('str')"
+        if self.predicate == "prefix":
+            if self.case_sensitive:
+                return f"({column}.str.startswith({self.value!r}))"
+            return f"({column}.str.lower().str.startswith({self.value.lower()!r}))"
+        regex = self.predicate == "regex"
+        return f"({column}.str.contains({self.value!r}, case={self.case_sensitive}, regex={regex}))"
+
+    def match_values(self, values: pd.Series) -> np.ndarray:
+        """
+        Returns a boolean array of which (string) values match the filter.
+        """
+        if self.predicate == "prefix":
+            if self.case_sensitive:
+                matches = values.str.startswith(self.value)
+            else:
+                matches = values.str.lower().str.startswith(self.value.lower())
+        else:
+            matches = values.str.contains(
+                self.value,
+                case=self.case_sensitive,
+                regex=self.predicate == "regex",
+            )
+        return matches.fillna(False).to_numpy(dtype=bool)
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        s = get_filter_series(df, self.column)
+        # only match each distinct value once, then broadcast back to the rows
+        codes, uniques = pd.factorize(s)
+        unique_matches = self.match_values(pd.Series(uniques).astype(str))
+        # missing values (code -1) index the trailing False
+        return np.append(unique_matches, False)[codes]
+
+
+FilterTypes = Union[DEXDateFilter, DEXDimensionFilter, DEXMetricFilter, DEXTextFilter]
 
 
 class DEXFilterSettings(BaseModel):
@@ -130,3 +306,62 @@ def clean_pandas_query_column(column: str) -> str:
     if str(column).isdigit() or str(column).isdecimal():
         return f"@{{df_name}}[{column}]"
     return f"`{column}`"
+
+
+def to_naive_utc(value) -> pd.Timestamp:
+    """
+    Converts a (possibly tz-aware) timestamp to UTC without tzinfo.
+    Timestamps without tzinfo are assumed to be UTC already.
+    """
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC")
+    return timestamp.tz_localize(None)
+
+
+def exact_number(value) -> Union[int, float]:
+    """
+    Converts a metric filter bound to an int if it's a whole number, or a float otherwise.
+    """
+    if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def sql_number(value: Union[int, float]) -> str:
+    """
+    Formats a number as a SQL literal that duckdb compares exactly.
+    """
+    if isinstance(value, int):
+        # integer literals are parsed as (exact) INTEGER/BIGINT/HUGEINT
+        return str(value)
+    # decimal literals are parsed as DECIMAL and rounded when compared against DOUBLE
+    # columns (dropping rows exactly at the bounds), so floats are passed as strings
+    # to be parsed directly as DOUBLE
+    return f"CAST('{value!r}' AS DOUBLE)"
+
+
+def get_filter_series(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    Returns the column (or index level) a filter applies to,
+    matching the column names used for the database (`index` for an unnamed index).
+    """
+    if column in df.columns:
+        return df[column]
+
+    str_columns = [str(col) for col in df.columns]
+    if column in str_columns:
+        return df.iloc[:, str_columns.index(column)]
+
+    index_names = [str(name) if name is not None else "index" for name in df.index.names]
+    if column in index_names:
+        level = index_names.index(column)
+        return pd.Series(df.index.get_level_values(level), index=df.index)
+
+    raise KeyError(f"Column `{column}` not found in DataFrame")
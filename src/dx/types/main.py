@@ -28,6 +28,18 @@ class DXSamplingMethod(BaseEnum):
     random = "random"  # df.sample(num_rows)
 
 
+class DXDatalinkBackend(BaseEnum):
+    duckdb = "duckdb"  # SQL queries against dataframes registered in duckdb
+    numpy = "numpy"  # vectorized boolean masks against the cached dataframe
+    polars = "polars"  # polars expressions/SQL against a copy of the dataframe in polars
+
+
+class DXMaterializeMode(BaseEnum):
+    auto = "auto"  # copy into a duckdb table once a large dataframe is filtered repeatedly
+    table = "table"  # always copy into a duckdb table
+    view = "view"  # always query the pandas dataframe through a registered view
+
+
 class DEXMediaType(BaseEnum):
     dataresource = "application/vnd.dataresource+json"
     dex = "application/vnd.dex.v1+json"
@@ -29,7 +29,7 @@ def to_dataframe(obj) -> pd.DataFrame:
     """
     Converts an object to a pandas dataframe.
     """
-    logger.debug(f"converting {type(obj)} to pd.DataFrame")
+    logger.debug("converting to pd.DataFrame", obj_type=type(obj))
 
     # handling for groupby operations returning pd.Series
     index_reset_name = None
@@ -275,16 +275,16 @@ def clean_series_values(s: pd.Series) -> pd.Series:
 
     if dtype_str in {"float", "int", "bool"}:
         # skip standard dtypes
-        logger.debug(f"skipping `{s.name}` since it has dtype `{dtype_str}`")
+        logger.debug("skipping column cleaning", column=s.name, dtype=dtype_str)
         return s
 
     if dtype_str.startswith("datetime") and not dtype_str.startswith("datetime64[ns, "):
         # skip datetime series that are not tz-aware datetime64[ns, <tz>]
         # because we need to handle some minor adjustments for tz information before build_table_schema()
-        logger.debug(f"skipping `{s.name}` since it has dtype `{dtype_str}`")
+        logger.debug("skipping column cleaning", column=s.name, dtype=dtype_str)
         return s
 
-    logger.debug(f"--> cleaning `{s.name}` with dtype `{dtype_str}`")
+    logger.debug("--> cleaning column", column=s.name, dtype=dtype_str)
 
     s = date_time.handle_time_period_series(s)
     s = date_time.handle_time_delta_series(s)
@@ -316,6 +316,7 @@ def generate_metadata(
 
     filters = []
     sample_history = []
+    resample_progress = None
     dex_metadata = DEXMetadata()
 
     # pull the topmost-parent dataframe's metadata, if available
@@ -323,7 +324,7 @@ def generate_metadata(
         existing_metadata = parent_dxdf.metadata
         parent_dataframe_info = existing_metadata.get("datalink", {}).get("dataframe_info", {})
         dex_metadata = DEXMetadata.parse_obj(existing_metadata.get("dx", {}))
-        logger.debug(f"existing {dex_metadata=}")
+        logger.debug("existing DEX metadata", dex_metadata=dex_metadata)
         if parent_dataframe_info:
             # if this comes after a resampling operation, we need to make sure the
             # original dimensions aren't overwritten by this new dataframe_info,
@@ -337,6 +338,8 @@ def generate_metadata(
             dataframe_info = parent_dataframe_info
         # these are set whenever store_sample_to_history() is called after a filter action from the frontend
         sample_history = existing_metadata.get("datalink", {}).get("sample_history", [])
+        # set whenever update_resampled_display() is called for a (partial or full) resample
+        resample_progress = existing_metadata.get("datalink", {}).get("resample_progress")
         # we shouldn't have a mix of pydantic FilterTypes and dicts here, but just in case
         filters = [f.dict() if not isinstance(f, dict) else f for f in parent_dxdf.filters]
 
@@ -362,6 +365,7 @@ def generate_metadata(
             "display_id": display_id,
             "applied_filters": filters,
             "sample_history": sample_history,
+            "resample_progress": resample_progress,
             "sampling_time": pd.Timestamp("now").strftime(settings.DATETIME_STRING_FORMAT),
             "variable_name": variable_name,
             "user_variable_name": user_variable_name,
@@ -380,7 +384,7 @@ def generate_metadata(
             dex_metadata=dex_metadata,
         )
 
-    logger.debug(f"{metadata=}")
+    logger.debug("generated metadata", metadata=metadata)
     return metadata
 
 
@@ -398,7 +402,7 @@ def deconflict_index_and_column_names(df: pd.DataFrame) -> pd.DataFrame:
     if not intersecting_names:
         return df
 
-    logger.debug(f"handling columns found in index names: {intersecting_names}")
+    logger.debug("handling columns found in index names", columns=intersecting_names)
     column_renames = {column: f"{column}.value" for column in intersecting_names}
     return df.rename(columns=column_renames)
 
@@ -462,7 +466,7 @@ def handle_extra_metadata(
             logger.warning(f"not sure what to do with {extra_metadata=}")
     except Exception as e:
         logger.error(f'error updating metadata: "{e}"')
-    logger.debug(f"done handling extra metadata, {metadata=}")
+    logger.debug("done handling extra metadata", metadata=metadata)
     return metadata
 
 
@@ -493,7 +497,7 @@ def update_dex_view_metadata(
             metadata.views[i] = extra_metadata
             updated_existing_view = True
         elif not updated_existing_view and view.variable_name == variable_name:
-            logger.debug(f"updating {view.display_id=} with {extra_metadata=}")
+            logger.debug("updating view", display_id=view.display_id, extra_metadata=extra_metadata)
             view = view.copy(update=extra_metadata)
             updated_existing_view = True
         else:
@@ -503,7 +507,9 @@ def update_dex_view_metadata(
         updated_views.append(view)
 
     if not updated_existing_view:
-        logger.debug(f"didn't match to existing view; adding new view with {extra_metadata=}")
+        logger.debug(
+            "didn't match to existing view; adding new view", extra_metadata=extra_metadata
+        )
         metadata.add_view(**extra_metadata)
     elif updated_views:
         metadata.views = updated_views
@@ -518,7 +524,7 @@ def update_dex_metadata(metadata: DEXMetadata, extra_metadata: dict) -> DEXMetad
     """
     Convenience method to update top-level DEX metadata; similar to update_dex_view_metadata().
     """
-    logger.debug(f"updating metadata with {extra_metadata=}")
+    logger.debug("updating metadata", extra_metadata=extra_metadata)
     return metadata.copy(update=extra_metadata)
 
 
@@ -0,0 +1,52 @@
+import importlib
+import sys
+import types
+from typing import Callable, Dict, Iterable, Tuple
+
+
+def make_lazy_module(
+    module_name: str,
+    lazy_names: Dict[str, Iterable[str]],
+) -> Tuple[Callable, Callable]:
+    """
+    Returns `__getattr__()` and `__dir__()` functions (PEP 562) for a package whose submodules
+    are only imported once one of their attributes is accessed.
+
+    `lazy_names` maps each submodule to the public names it provides, so accessing a name
+    only imports the submodule it comes from, and unknown names raise AttributeError
+    without importing anything.
+    """
+    namespace = vars(sys.modules[module_name])
+    name_to_module = {}
+    for submodule_name, names in lazy_names.items():
+        for name in names:
+            name_to_module.setdefault(name, submodule_name)
+
+    def __getattr__(name: str):
+        if name == "__all__":
+            # `from ... import *` needs every public name, which loads everything
+            return sorted(set(public_names(namespace)).union(name_to_module))
+
+        if f"{module_name}.{name}" in lazy_names:
+            return importlib.import_module(f"{module_name}.{name}")
+
+        if name not in name_to_module:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(name_to_module[name]), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace).union(name_to_module))
+
+    return __getattr__, __dir__
+
+
+def public_names(namespace: dict) -> list:
+    if "__all__" in namespace:
+        return list(namespace["__all__"])
+    return [
+        name
+        for name, value in namespace.items()
+        if not name.startswith("_") and not isinstance(value, types.ModuleType)
+    ]
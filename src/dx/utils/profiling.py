@@ -0,0 +1,157 @@
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, List, Optional
+
+import pandas as pd
+import structlog
+
+from dx.settings import get_settings, settings_context
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# only one cProfile profiler can be active per thread, so calls nested inside a
+# profiled call (like handle_format() during handle_resample()) are part of the outer profile
+PROFILING_ACTIVE = contextvars.ContextVar("dx_profiling_active", default=False)
+# most recent profile records, oldest first, up to settings.NUM_PROFILES_TRACKED
+PROFILES_HISTORY: List[dict] = []
+
+
+def get_top_functions(stats: pstats.Stats, num_functions: int) -> List[dict]:
+    """
+    Returns the first `num_functions` functions in the (already sorted) profile stats.
+    """
+    top_functions = []
+    for func in stats.fcn_list[:num_functions]:
+        _, num_calls, total_time, cumulative_time, _ = stats.stats[func]
+        top_functions.append(
+            {
+                "function": pstats.func_std_string(func),
+                "num_calls": num_calls,
+                "total_seconds": total_time,
+                "cumulative_seconds": cumulative_time,
+            }
+        )
+    return top_functions
+
+
+def dump_profile(profiler: cProfile.Profile, name: str) -> str:
+    os.makedirs(settings.PROFILING_OUTPUT_DIR, exist_ok=True)
+    timestamp = pd.Timestamp("now").strftime("%Y%m%d-%H%M%S")
+    filename = f"dx-{name}-{timestamp}-{uuid.uuid4().hex[:8]}.pstats"
+    pstats_path = os.path.join(settings.PROFILING_OUTPUT_DIR, filename)
+    profiler.dump_stats(pstats_path)
+    return pstats_path
+
+
+def record_profile(profiler: cProfile.Profile, name: str, seconds: float) -> dict:
+    stats_output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stats_output)
+    stats.sort_stats(settings.PROFILING_SORT_BY)
+
+    profile = {
+        "name": name,
+        "start_time": pd.Timestamp("now").strftime(settings.DATETIME_STRING_FORMAT),
+        "total_seconds": seconds,
+        "top_functions": get_top_functions(stats, settings.PROFILING_NUM_FUNCTIONS),
+        "pstats_path": None,
+    }
+    if settings.PROFILING_OUTPUT_DIR:
+        profile["pstats_path"] = dump_profile(profiler, name)
+
+    if settings.PROFILING_PRINT_STATS:
+        stats.print_stats(settings.PROFILING_NUM_FUNCTIONS)
+        print(f"dx profile for {name}() ({seconds:.3f}s):\n{stats_output.getvalue()}")
+
+    PROFILES_HISTORY.append(profile)
+    num_to_remove = len(PROFILES_HISTORY) - settings.NUM_PROFILES_TRACKED
+    if num_to_remove > 0:
+        del PROFILES_HISTORY[:num_to_remove]
+    return profile
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Runs the decorated function under cProfile while ENABLE_PROFILING is set,
+    keeping the hottest functions of each call for get_profiles().
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not settings.ENABLE_PROFILING or PROFILING_ACTIVE.get():
+            return func(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # another profiler is already running (on Python 3.12+, in any thread)
+            logger.debug("unable to start profiling", name=func.__name__, error=e)
+            return func(*args, **kwargs)
+
+        token = PROFILING_ACTIVE.set(True)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            profiler.disable()
+            PROFILING_ACTIVE.reset(token)
+            try:
+                record_profile(profiler, func.__name__, seconds)
+            except Exception as e:
+                # profiling shouldn't get in the way of displaying or resampling
+                logger.debug("error recording profile", name=func.__name__, error=e)
+
+    return wrapper
+
+
+@contextmanager
+def profile(
+    print_stats: bool = True,
+    output_dir: Optional[str] = None,
+    num_functions: Optional[int] = None,
+    sort_by: Optional[str] = None,
+):
+    """
+    Profiles any `handle_format()` and `handle_resample()` calls made in the block, printing
+    the hottest functions of each call (and writing `.pstats` files to `output_dir`, if provided).
+
+    >>> with dx.profile(output_dir="dx-profiles"):
+    ...     display(df)
+
+    To profile resample requests from the frontend too, use
+    `dx.set_option("ENABLE_PROFILING", True)` instead.
+    """
+    overrides = {
+        "enable_profiling": True,
+        "profiling_print_stats": print_stats,
+        "profiling_output_dir": output_dir,
+        "profiling_num_functions": num_functions,
+        "profiling_sort_by": sort_by,
+    }
+    with settings_context(**{key: val for key, val in overrides.items() if val is not None}):
+        yield
+
+
+def get_profiles(num_profiles: Optional[int] = None) -> List[dict]:
+    """
+    Returns the most recent profiles (oldest first), which are only
+    recorded while ENABLE_PROFILING is set or inside `dx.profile()`.
+    """
+    if num_profiles is None:
+        return list(PROFILES_HISTORY)
+    if num_profiles <= 0:
+        return []
+    return PROFILES_HISTORY[-num_profiles:]
+
+
+def clear_profiles() -> None:
+    PROFILES_HISTORY.clear()
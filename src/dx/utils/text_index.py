@@ -0,0 +1,74 @@
+from collections import defaultdict
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from dx.types.filters import DEXTextFilter
+
+logger = structlog.get_logger(__name__)
+
+
+class NGramIndex:
+    """
+    Character n-gram index over the distinct values of a string column,
+    used to narrow down which values can match a text filter before
+    checking them, instead of scanning every value.
+    """
+
+    def __init__(self, s: pd.Series, n: int = 3):
+        self.n = n
+        # each row points to its distinct value (-1 for missing values)
+        self.codes, uniques = pd.factorize(s)
+        self.values = pd.Series(uniques).astype(str)
+
+        postings = defaultdict(list)
+        for value_id, value in enumerate(self.values.str.lower()):
+            for ngram in self.ngrams(value):
+                postings[ngram].append(value_id)
+        self.postings: Dict[str, np.ndarray] = {
+            ngram: np.array(value_ids, dtype=np.int64) for ngram, value_ids in postings.items()
+        }
+        logger.debug(
+            "built n-gram index",
+            n=n,
+            num_ngrams=len(self.postings),
+            num_values=len(self.values),
+        )
+
+    def ngrams(self, value: str) -> set:
+        return {value[i : i + self.n] for i in range(len(value) - self.n + 1)}
+
+    def candidates(self, dex_filter: DEXTextFilter) -> np.ndarray:
+        """
+        Returns the IDs of distinct values that may match the filter: those containing
+        every n-gram of the search string. Regex filters and search strings shorter
+        than `n` can't be narrowed down, so every value is a candidate.
+        """
+        search_ngrams = self.ngrams(dex_filter.value.lower())
+        if dex_filter.predicate == "regex" or not search_ngrams:
+            return np.arange(len(self.values))
+
+        value_ids = None
+        # intersect the shortest posting lists first
+        for ngram in sorted(search_ngrams, key=lambda g: len(self.postings.get(g, ()))):
+            posting = self.postings.get(ngram)
+            if posting is None:
+                return np.array([], dtype=np.int64)
+            value_ids = posting if value_ids is None else np.intersect1d(value_ids, posting)
+            if not len(value_ids):
+                break
+        return value_ids
+
+    def mask(self, dex_filter: DEXTextFilter) -> np.ndarray:
+        """
+        Evaluates the text filter as a boolean row mask, only checking candidate values.
+        """
+        value_ids = self.candidates(dex_filter)
+        matches = dex_filter.match_values(self.values.iloc[value_ids])
+
+        # missing values (code -1) index the trailing False
+        unique_matches = np.zeros(len(self.values) + 1, dtype=bool)
+        unique_matches[value_ids[matches]] = True
+        return unique_matches[self.codes]
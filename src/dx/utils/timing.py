@@ -0,0 +1,248 @@
+import contextvars
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import structlog
+
+from dx.settings import get_settings
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# timings collected for the handle_format() call running in the current thread/async task
+CURRENT_DISPLAY_TIMINGS = contextvars.ContextVar("dx_display_timings", default=None)
+# most recent DisplayTimings records, oldest first, up to settings.NUM_DISPLAY_TIMINGS_TRACKED
+DISPLAY_TIMINGS_HISTORY: List[dict] = []
+
+
+class DisplayTimings:
+    """
+    Wall-clock seconds of each stage of a single display, plus the size (in bytes) of each
+    stage's output if `track_size` is set, and the peak memory allocated during each stage
+    if `track_memory` is set.
+    """
+
+    def __init__(self, track_memory: bool = False, track_size: bool = False):
+        self.display_id: Optional[str] = None
+        self.start_time = pd.Timestamp("now")
+        self.stages: Dict[str, dict] = {}
+
+        self.track_size = track_size
+        self.track_memory = track_memory
+        self.started_tracemalloc = False
+        # traced memory when the display started, which peaks are measured against
+        self.memory_baseline = 0
+        self.peak_memory_bytes = 0
+
+    def record(
+        self,
+        stage: str,
+        seconds: float,
+        size_bytes: Optional[int] = None,
+        peak_memory_bytes: Optional[int] = None,
+    ) -> None:
+        # some stages can run more than once for a display (like normalizing again
+        # when falling back from datalink processing), so totals are accumulated
+        stage_timing = self.stages.setdefault(stage, {"seconds": 0.0})
+        stage_timing["seconds"] += seconds
+        if size_bytes is not None:
+            stage_timing["bytes"] = size_bytes
+        if peak_memory_bytes is not None:
+            stage_timing["peak_memory_bytes"] = max(
+                peak_memory_bytes, stage_timing.get("peak_memory_bytes", 0)
+            )
+
+    def start_memory_tracking(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+        self.memory_baseline, _ = tracemalloc.get_traced_memory()
+
+    def stop_memory_tracking(self) -> None:
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+
+    @contextmanager
+    def track_stage_memory(self):
+        """
+        Yields a dict that's populated with the peak memory allocated in the block
+        (above what was allocated when it started).
+        """
+        stage_memory = {}
+        if not self.track_memory or not tracemalloc.is_tracing():
+            yield stage_memory
+            return
+
+        stage_start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        yield stage_memory
+        _, peak = tracemalloc.get_traced_memory()
+        stage_memory["peak_memory_bytes"] = peak - stage_start
+        self.peak_memory_bytes = max(self.peak_memory_bytes, peak - self.memory_baseline)
+
+    def to_dict(self) -> Dict[str, dict]:
+        return {stage: dict(stage_timing) for stage, stage_timing in self.stages.items()}
+
+    def to_record(self) -> dict:
+        record = {
+            "display_id": self.display_id,
+            "start_time": self.start_time.strftime(settings.DATETIME_STRING_FORMAT),
+            "total_seconds": sum(timing["seconds"] for timing in self.stages.values()),
+            "stages": self.to_dict(),
+        }
+        if self.track_memory:
+            record["peak_memory_bytes"] = self.peak_memory_bytes
+            record["max_rss_bytes"] = get_max_rss_bytes()
+        return record
+
+
+def get_max_rss_bytes() -> Optional[int]:
+    """
+    Returns the kernel process's peak resident set size so far,
+    which includes memory allocated outside of Python (like duckdb's).
+    """
+    try:
+        import resource
+    except ImportError:
+        # not available on Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS, and kilobytes elsewhere
+    if sys.platform == "darwin":
+        return max_rss
+    return max_rss * 1024
+
+
+def get_size_bytes(obj) -> Optional[int]:
+    """
+    Returns the size of a stage's output: the (shallow) memory usage for dataframes,
+    and the serialized size for anything else.
+    """
+    if obj is None:
+        return None
+    if isinstance(getattr(obj, "df", None), pd.DataFrame):
+        # DXDataFrame
+        obj = obj.df
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage().sum())
+    if isinstance(obj, str):
+        return len(obj.encode())
+    return len(json.dumps(obj, default=str).encode())
+
+
+@contextmanager
+def collect_display_timings():
+    """
+    Collects stage timings for the duration of the block (if ENABLE_DISPLAY_TIMINGS is set),
+    adding them to the display timings history afterwards.
+    """
+    if not settings.ENABLE_DISPLAY_TIMINGS:
+        yield None
+        return
+
+    # tracemalloc's tracing and peak are process-wide, so memory is only tracked on the main
+    # (shell) thread, where displays can't overlap; displays updated from the background
+    # resample worker only record their timings
+    track_memory = (
+        settings.DISPLAY_TIMINGS_TRACK_MEMORY
+        and threading.current_thread() is threading.main_thread()
+    )
+    timings = DisplayTimings(
+        track_memory=track_memory,
+        track_size=settings.DISPLAY_TIMINGS_TRACK_SIZE,
+    )
+    if timings.track_memory:
+        timings.start_memory_tracking()
+    token = CURRENT_DISPLAY_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        CURRENT_DISPLAY_TIMINGS.reset(token)
+        timings.stop_memory_tracking()
+        DISPLAY_TIMINGS_HISTORY.append(timings.to_record())
+        num_to_remove = len(DISPLAY_TIMINGS_HISTORY) - settings.NUM_DISPLAY_TIMINGS_TRACKED
+        if num_to_remove > 0:
+            del DISPLAY_TIMINGS_HISTORY[:num_to_remove]
+
+
+def timed(stage: str, func: Callable, *args, **kwargs):
+    """
+    Calls `func(*args, **kwargs)`, recording its wall-clock time under `stage` (and output size
+    and peak memory, if tracked) if display timings are being collected. Stages that don't
+    return anything (like registration) record the size of their first argument instead.
+    """
+    timings = CURRENT_DISPLAY_TIMINGS.get()
+    if timings is None:
+        return func(*args, **kwargs)
+
+    with timings.track_stage_memory() as stage_memory:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+
+    size_bytes = None
+    if timings.track_size:
+        output = result
+        if result is None and args:
+            output = args[0]
+        size_bytes = get_size_bytes(output)
+    timings.record(stage, seconds, size_bytes, **stage_memory)
+    logger.debug("timed display stage", stage=stage, seconds=seconds)
+    return result
+
+
+def get_display_timings(num_displays: Optional[int] = None) -> List[dict]:
+    """
+    Returns the stage timings of the most recent displays (oldest first), which are only
+    recorded while ENABLE_DISPLAY_TIMINGS is set.
+
+    >>> dx.set_option("ENABLE_DISPLAY_TIMINGS", True)
+    >>> df
+    >>> dx.get_display_timings(1)
+    [{'display_id': '...', 'start_time': '...', 'total_seconds': 0.0123,
+      'stages': {'normalize': {'seconds': 0.0011}, ...}}]
+
+    With DISPLAY_TIMINGS_TRACK_SIZE, each stage also includes its output size in `bytes`.
+    With DISPLAY_TIMINGS_TRACK_MEMORY, each stage also includes its `peak_memory_bytes`,
+    and each display its overall `peak_memory_bytes` and the process's `max_rss_bytes`.
+    """
+    if num_displays is None:
+        return list(DISPLAY_TIMINGS_HISTORY)
+    if num_displays <= 0:
+        return []
+    return DISPLAY_TIMINGS_HISTORY[-num_displays:]
+
+
+def summarize_display_timings(num_displays: Optional[int] = None) -> pd.DataFrame:
+    """
+    Returns a dataframe with one row per display stage, with the number of displays it ran
+    in and the mean/max of its time and (if tracked) output size and peak memory, across
+    the most recent displays. Sorted by peak memory if tracked, otherwise by time.
+    """
+    stage_rows = [
+        {"stage": stage, **stage_timing}
+        for record in get_display_timings(num_displays)
+        for stage, stage_timing in record["stages"].items()
+    ]
+    if not stage_rows:
+        return pd.DataFrame()
+
+    stages_df = pd.DataFrame(stage_rows)
+    summary_df = stages_df.groupby("stage", sort=False).agg(["mean", "max"])
+    summary_df.columns = [f"{func}_{column}" for column, func in summary_df.columns]
+    summary_df.insert(0, "num_displays", stages_df.groupby("stage", sort=False).size())
+    sort_column = "max_seconds"
+    if "max_peak_memory_bytes" in summary_df.columns:
+        sort_column = "max_peak_memory_bytes"
+    return summary_df.sort_values(sort_column, ascending=False)
+
+
+def clear_display_timings() -> None:
+    DISPLAY_TIMINGS_HISTORY.clear()
@@ -1,10 +1,12 @@
 import hashlib
 import os
+import threading
 import uuid
+from collections import Counter
 from functools import lru_cache
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-import duckdb
+import numpy as np
 import pandas as pd
 import structlog
 from IPython import get_ipython
@@ -12,12 +14,19 @@ from IPython.core.interactiveshell import InteractiveShell
 from pandas.util import hash_pandas_object
 
 from dx.settings import get_settings
+from dx.types.filters import get_filter_series
+from dx.types.main import DXMaterializeMode
 from dx.utils.formatting import (
     generate_metadata,
     is_default_index,
     normalize_index_and_columns,
     to_dataframe,
 )
+from dx.utils.text_index import NGramIndex
+from dx.utils.timing import timed
+
+if TYPE_CHECKING:
+    import duckdb
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
@@ -27,13 +36,39 @@ settings = get_settings()
 DXDF_CACHE = {}
 # used to track when a filtered subset should be tied to an existing display ID
 SUBSET_HASH_TO_PARENT_DATA = {}
+# names of dataframes copied into native duckdb tables instead of registered as views
+MATERIALIZED_TABLES = set()
+# guards writes to the tracking dicts above, which happen on both the kernel's shell thread
+# (displaying dataframes) and the background resample worker (updating displays)
+TRACKING_LOCK = threading.RLock()
+# duckdb connections aren't thread-safe, and views registered on the shared connection
+# aren't visible to its cursors, so every query (including fetching its result)
+# and (un)registration on the shared connection is run while holding this lock
+DB_CONNECTION_LOCK = threading.RLock()
 
 
 @lru_cache
-def get_db_connection() -> duckdb.DuckDBPyConnection:
+def get_db_connection() -> "duckdb.DuckDBPyConnection":
+    import duckdb
+
+    logger.debug("connecting to duckdb", db_location=settings.DB_LOCATION)
     return duckdb.connect(database=settings.DB_LOCATION, read_only=False)
 
 
+class LazyDBConnection:
+    """
+    Stand-in for the shared duckdb connection that doesn't import duckdb or open
+    the connection until it's first used.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(get_db_connection(), name)
+
+    def __repr__(self):
+        connected = get_db_connection.cache_info().currsize > 0
+        return f"<LazyDBConnection {connected=}>"
+
+
 class DXDataFrame:
     """
     Convenience class to store information about dataframes,
@@ -43,6 +78,7 @@ class DXDataFrame:
 
     df: pd.DataFrame = None
     original_column_dtypes: dict = {}
+    db_column_dtypes: dict = {}
     index_name: List[str] = []
 
     id: uuid.UUID = None
@@ -70,8 +106,23 @@ class DXDataFrame:
         self.default_index_used = is_default_index(df.index)
         self.index_name = get_df_index(df.index)
 
-        self.df = normalize_index_and_columns(df)
-        self.hash = generate_df_hash(self.df)
+        self.df = timed("normalize", normalize_index_and_columns, df)
+        self.db_column_dtypes = get_db_column_dtypes(self.df, self.original_column_dtypes)
+        self.hash = timed("hash", generate_df_hash, self.df)
+
+        # used to decide whether (and how) to materialize this dataframe in duckdb
+        self.num_filter_requests = 0
+        self.date_filter_counts = Counter()
+        # (filter JSON: bit-packed row mask) pairs for the filters currently applied,
+        # so only new/edited filters are re-evaluated on the next resample request
+        self.filter_bitmaps: Dict[str, np.ndarray] = {}
+        # (column: NGramIndex) pairs, built on the first text filter for a high-cardinality column
+        self.text_indexes: Dict[str, NGramIndex] = {}
+        # (facets request: payload) pairs for the most recent facet count requests
+        self.facet_cache: Dict[str, dict] = {}
+        # whether the data has been registered with duckdb, which other datalink backends
+        # only do once an aggregation or facets request needs to run SQL against it
+        self.duckdb_registered = False
 
         self.cell_id = self.get_cell_id()
         self.display_id = self.get_display_id()
@@ -97,17 +148,136 @@ class DXDataFrame:
         cell_id = SUBSET_HASH_TO_PARENT_DATA.get(self.hash, {}).get(
             "cell_id", last_executed_cell_id
         )
-        logger.debug(f"DXDF {last_executed_cell_id=} / last associated {cell_id=}")
+        logger.debug("DXDF cell ID", last_executed_cell_id=last_executed_cell_id, cell_id=cell_id)
         return cell_id
 
     def get_display_id(self) -> str:
         display_id = SUBSET_HASH_TO_PARENT_DATA.get(self.hash, {}).get(
             "display_id", str(uuid.uuid4())
         )
-        logger.debug(f"DXDF {display_id=}")
+        logger.debug("DXDF display ID", display_id=display_id)
         return display_id
 
 
+def register_dxdf(db_connection: "duckdb.DuckDBPyConnection", dxdf: DXDataFrame) -> None:
+    """
+    Registers the dataframe in duckdb under its variable name, either as a view over
+    the pandas data or as a native table, depending on `settings.DB_MATERIALIZE_MODE`.
+    """
+    table_name = dxdf.variable_name
+    with DB_CONNECTION_LOCK:
+        with TRACKING_LOCK:
+            if table_name in MATERIALIZED_TABLES:
+                # a previous dataframe with this name was materialized,
+                # which would conflict with the view
+                db_connection.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                MATERIALIZED_TABLES.discard(table_name)
+
+        db_connection.register(table_name, dxdf.df.reset_index())
+        dxdf.duckdb_registered = True
+        if settings.DB_MATERIALIZE_MODE == DXMaterializeMode.table:
+            materialize_table(db_connection, dxdf)
+
+
+def should_materialize(dxdf: DXDataFrame) -> bool:
+    """
+    Returns True if the dataframe is still registered as a view but should be copied
+    into a native duckdb table, based on `settings.DB_MATERIALIZE_MODE`:
+    - "table": always
+    - "view": never
+    - "auto": once a dataframe with at least `DB_MATERIALIZE_MIN_ROWS` rows has been
+    filtered at least `DB_MATERIALIZE_MIN_FILTER_COUNT` times
+    """
+    if dxdf.variable_name in MATERIALIZED_TABLES:
+        return False
+
+    mode = settings.DB_MATERIALIZE_MODE
+    if mode == DXMaterializeMode.table:
+        return True
+    if mode == DXMaterializeMode.view:
+        return False
+
+    large_enough = len(dxdf.df) >= settings.DB_MATERIALIZE_MIN_ROWS
+    filtered_enough = dxdf.num_filter_requests >= settings.DB_MATERIALIZE_MIN_FILTER_COUNT
+    return large_enough and filtered_enough
+
+
+def materialize_table(db_connection: "duckdb.DuckDBPyConnection", dxdf: DXDataFrame) -> None:
+    """
+    Replaces the registered view of a dataframe with a native duckdb table, ordered by
+    its most-filtered date column (if `DB_MATERIALIZE_SORT_BY_DATE` is enabled) so
+    date range filters can skip row groups using duckdb's min/max zone maps.
+    """
+    table_name = dxdf.variable_name
+    tmp_table_name = f"{table_name}__dx_materialized"
+
+    query_string = f'CREATE OR REPLACE TABLE "{tmp_table_name}" AS SELECT * FROM "{table_name}"'
+    if settings.DB_MATERIALIZE_SORT_BY_DATE and (sort_column := get_sort_column(dxdf)):
+        query_string = f'{query_string} ORDER BY "{sort_column}"'
+
+    logger.debug(
+        "materializing into a duckdb table", table_name=table_name, query_string=query_string
+    )
+    with DB_CONNECTION_LOCK:
+        if table_name in MATERIALIZED_TABLES:
+            # already materialized from another thread
+            return
+        db_connection.execute(query_string)
+        db_connection.unregister(table_name)
+        db_connection.execute(f'ALTER TABLE "{tmp_table_name}" RENAME TO "{table_name}"')
+        with TRACKING_LOCK:
+            MATERIALIZED_TABLES.add(table_name)
+
+
+def get_sort_column(dxdf: DXDataFrame) -> Optional[str]:
+    """
+    Returns the most frequently filtered date column of a dataframe,
+    or its first datetime column if no date filters have been applied yet.
+    """
+    if dxdf.date_filter_counts:
+        return dxdf.date_filter_counts.most_common(1)[0][0]
+
+    datetime_columns = dxdf.df.select_dtypes(include=["datetime", "datetimetz"]).columns
+    if len(datetime_columns):
+        return str(datetime_columns[0])
+    return None
+
+
+def get_text_index(dxdf: DXDataFrame, column: str) -> Optional[NGramIndex]:
+    """
+    Returns the n-gram index for a column of a dataframe, building it on first use.
+    Columns with fewer than `TEXT_INDEX_MIN_UNIQUE_VALUES` distinct values aren't
+    indexed, since checking each distinct value directly is already fast.
+    """
+    if not settings.ENABLE_TEXT_INDEX:
+        return None
+    if column in dxdf.text_indexes:
+        return dxdf.text_indexes[column]
+
+    s = get_filter_series(dxdf.df, column)
+    if s.nunique() < settings.TEXT_INDEX_MIN_UNIQUE_VALUES:
+        return None
+    logger.debug("building text index", column=column)
+    text_index = NGramIndex(s, n=settings.TEXT_INDEX_NGRAM_SIZE)
+    dxdf.text_indexes[column] = text_index
+    return text_index
+
+
+def get_db_column_dtypes(normalized_df: pd.DataFrame, original_column_dtypes: dict) -> dict:
+    """
+    Maps the original dtypes to the column names as they appear in the database
+    after index/column normalization (flattened, stringified, or deconflicted names),
+    so query results can be cast back with a single `.astype()` call.
+    Categorical dtypes keep their original categories.
+    """
+    db_columns = list(normalized_df.columns)
+    original_dtypes = list(original_column_dtypes.values())
+    # normalizing never reorders or drops columns, but may reset the index
+    # into new leading columns, so we line up the original columns from the end
+    db_columns = db_columns[len(db_columns) - len(original_dtypes) :]
+    return dict(zip(db_columns, original_dtypes))
+
+
 def generate_df_hash(df: pd.DataFrame) -> str:
     """
     Generates a single hash string for the dataframe object.
@@ -169,16 +339,15 @@ def get_df_variable_name(
     logger.debug("looking for matching variables for dataframe")
 
     ipython = ipython_shell or get_ipython()
-    df_vars = {
-        k: v
-        for k, v in ipython.user_ns.items()
-        if isinstance(v, tuple(settings.get_renderable_types()))
-    }
-    logger.debug(f"dataframe variables present: {list(df_vars.keys())}")
+    # snapshot the namespace first, since the shell thread may be running user code
+    # (and adding/removing variables) while a background resample request is displayed
+    user_ns_items = list(ipython.user_ns.items())
+    df_vars = {k: v for k, v in user_ns_items if settings.is_renderable(v)}
+    logger.debug("dataframe variables present", variables=list(df_vars))
 
     matching_df_vars = []
     for k, v in df_vars.items():
-        logger.debug(f"checking if `{k}` is equal to this dataframe")
+        logger.debug("checking if variable is equal to this dataframe", variable=k)
         # we previously checked columns, dtypes, shape, etc between both dataframes,
         # to avoid having to normalize and hash the other dataframe (v here),
         # but that was too slow, and ultimately we shouldn't be checking raw data vs cleaned data
@@ -190,15 +359,15 @@ def get_df_variable_name(
         # dataframe to another, so we need to compare the string representations of the values to
         # avoid making things more complicated than they already are
         if df.astype(str).equals(other_df.astype(str)):
-            logger.debug(f"`{k}` matches this dataframe")
+            logger.debug("variable matches this dataframe", variable=k)
             matching_df_vars.append(k)
-    logger.debug(f"dataframe variables with same data: {matching_df_vars}")
+    logger.debug("dataframe variables with same data", variables=matching_df_vars)
 
     # we might get a mix of references here like ['_', '__', 'df']
     named_df_vars_with_same_data = [name for name in matching_df_vars if not name.startswith("_")]
-    logger.debug(f"named dataframe variables with same hash: {named_df_vars_with_same_data}")
+    logger.debug("named dataframe variables with same hash", variables=named_df_vars_with_same_data)
     if named_df_vars_with_same_data:
-        logger.debug(f"{named_df_vars_with_same_data=}")
+        logger.debug("using first matching variable", variables=named_df_vars_with_same_data)
         return named_df_vars_with_same_data[0]
 
     # no dataframe variables found, assign a new one for internal referencing
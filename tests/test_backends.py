@@ -0,0 +1,364 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import duckdb
+import pandas as pd
+import pytest
+from IPython.terminal.interactiveshell import TerminalInteractiveShell
+
+from dx.backends import (
+    DuckDBDatalinkBackend,
+    NumpyDatalinkBackend,
+    PolarsDatalinkBackend,
+    get_datalink_backend,
+)
+from dx.datatypes.main import random_dataframe
+from dx.dependencies import polars_installed
+from dx.filtering import resample_from_backend
+from dx.formatters.main import handle_format
+from dx.settings import get_settings, settings_context
+from dx.types.filters import DEXFilterSettings
+from dx.utils.tracking import DB_CONNECTION_LOCK, DXDF_CACHE, DXDataFrame, LazyDBConnection
+
+settings = get_settings()
+
+BACKENDS = [
+    DuckDBDatalinkBackend,
+    NumpyDatalinkBackend,
+    pytest.param(
+        PolarsDatalinkBackend,
+        marks=pytest.mark.skipif(not polars_installed(), reason="polars not installed"),
+    ),
+]
+
+
+def make_backend(backend_class, db_connection: duckdb.DuckDBPyConnection):
+    if backend_class is DuckDBDatalinkBackend:
+        return DuckDBDatalinkBackend(connection=db_connection)
+    return backend_class()
+
+
+@pytest.fixture
+def sample_random_dataframe() -> pd.DataFrame:
+    return random_dataframe(num_rows=100)
+
+
+@pytest.fixture
+def sample_registered_display_id(
+    mocker,
+    get_ipython: TerminalInteractiveShell,
+    sample_db_connection: duckdb.DuckDBPyConnection,
+    sample_random_dataframe: pd.DataFrame,
+) -> str:
+    get_ipython.user_ns["test_df"] = sample_random_dataframe
+    mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+    mocker.patch("dx.filtering.db_connection", sample_db_connection)
+    with settings_context(enable_datalink=True):
+        _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+    return metadata[settings.MEDIA_TYPE]["display_id"]
+
+
+class TestLazyDBConnection:
+    def test_attribute_access_uses_shared_connection(self, mocker):
+        """
+        Ensure the connection is only opened once an attribute is accessed.
+        """
+        mock_get_db_connection = mocker.patch("dx.utils.tracking.get_db_connection")
+        db_connection = LazyDBConnection()
+        mock_get_db_connection.assert_not_called()
+
+        db_connection.execute("SELECT 1")
+        mock_get_db_connection.assert_called_once()
+        mock_get_db_connection.return_value.execute.assert_called_once_with("SELECT 1")
+
+
+class TestDatalinkBackends:
+    @pytest.mark.parametrize("backend_class", BACKENDS)
+    @pytest.mark.parametrize(
+        "filter_fixture",
+        [
+            "sample_dex_date_filter",
+            "sample_dex_metric_filter",
+            "sample_dex_dimension_filter",
+        ],
+    )
+    def test_sample_matches_pandas(
+        self,
+        request,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_registered_display_id: str,
+        backend_class,
+        filter_fixture: str,
+    ):
+        """
+        Ensure each backend returns the same rows (and row count) as filtering
+        the dataframe in pandas.
+        """
+        dxdf = DXDF_CACHE[sample_registered_display_id]
+        df = dxdf.df
+        dex_filter = request.getfixturevalue(filter_fixture)
+        # narrow the filter range to the upper half of the values so it actually excludes rows
+        if dex_filter["type"] == "DATE_FILTER":
+            dex_filter["start"] = df.datetime_column.sort_values().iloc[len(df) // 2]
+            expected = df[df.datetime_column >= dex_filter["start"]]
+        elif dex_filter["type"] == "METRIC_FILTER":
+            dex_filter["value"][0] = df.float_column.sort_values().iloc[len(df) // 2]
+            expected = df[df.float_column >= dex_filter["value"][0]]
+        else:
+            expected = df[df.keyword_column.isin(dex_filter["value"])]
+        filters = DEXFilterSettings(filters=[dex_filter]).filters
+
+        backend = make_backend(backend_class, sample_db_connection)
+        backend.register(dxdf)
+        sample_df = backend.sample(dxdf, filters=filters)
+
+        assert 0 < len(sample_df) < len(df)
+        assert sorted(sample_df.index) == sorted(expected.index)
+        assert list(sample_df.columns) == list(df.columns)
+        assert backend.count(dxdf, filters=filters) == len(expected)
+        backend.unregister(dxdf)
+
+    @pytest.mark.parametrize("backend_class", BACKENDS)
+    @pytest.mark.parametrize("semi_join_threshold", [0, 100])
+    @pytest.mark.parametrize("filter_value", [["False"], ["True"], ["false", "TRUE"]])
+    def test_bool_dimension_filter_matches_pandas(
+        self,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_registered_display_id: str,
+        backend_class,
+        semi_join_threshold: int,
+        filter_value: list,
+    ):
+        """
+        Ensure boolean strings from the frontend are parsed (rather than cast,
+        where any non-empty string is True) by every backend, with and without a semi-join.
+        """
+        dxdf = DXDF_CACHE[sample_registered_display_id]
+        df = dxdf.df
+        expected = df[df.bool_column.isin([v.lower() == "true" for v in filter_value])]
+        dex_filter = {
+            "column": "bool_column",
+            "type": "DIMENSION_FILTER",
+            "predicate": "in",
+            "value": filter_value,
+        }
+        filters = DEXFilterSettings(filters=[dex_filter]).filters
+
+        backend = make_backend(backend_class, sample_db_connection)
+        backend.register(dxdf)
+        with settings_context(dimension_filter_semi_join_threshold=semi_join_threshold):
+            sample_df = backend.sample(dxdf, filters=filters)
+            count = backend.count(dxdf, filters=filters)
+
+        assert sorted(sample_df.index) == sorted(expected.index)
+        assert count == len(expected)
+        backend.unregister(dxdf)
+
+    @pytest.mark.parametrize("backend_class", BACKENDS)
+    @pytest.mark.parametrize(
+        "bounds, expected_values",
+        [
+            ([2**53 + 1, 2**53 + 1], [2**53 + 1]),
+            ([2**53 + 1, 2**63], [2**53 + 1, 2**53 + 2]),
+            ([-(2**63) - 1, 2**53 + 0.5], [0, 2**53]),
+            ([2**64, 2**65], []),
+        ],
+    )
+    def test_metric_filter_on_large_integers(
+        self,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        backend_class,
+        bounds: list,
+        expected_values: list,
+    ):
+        """
+        Ensure integer bounds beyond float precision (2**53) include and exclude
+        the same BIGINT rows with every backend.
+        """
+        df = pd.DataFrame({"integer_column": [0, 2**53, 2**53 + 1, 2**53 + 2]})
+        get_ipython.user_ns["test_df"] = df
+        dxdf = DXDataFrame(df, ipython_shell=get_ipython)
+        dex_filter = {
+            "column": "integer_column",
+            "type": "METRIC_FILTER",
+            "predicate": "between",
+            "value": bounds,
+        }
+        filters = DEXFilterSettings(filters=[dex_filter]).filters
+
+        backend = make_backend(backend_class, sample_db_connection)
+        backend.register(dxdf)
+        sample_df = backend.sample(dxdf, filters=filters)
+        assert sorted(sample_df.integer_column.tolist()) == expected_values
+        assert backend.count(dxdf, filters=filters) == len(expected_values)
+        backend.unregister(dxdf)
+
+    @pytest.mark.parametrize("backend_class", BACKENDS)
+    @pytest.mark.parametrize("column_tz", ["UTC", "Asia/Tokyo", None])
+    def test_date_filter_compares_in_utc(
+        self,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        backend_class,
+        column_tz: str,
+    ):
+        """
+        Ensure every backend converts tz-aware date filter bounds and column values
+        to UTC (rather than dropping their offsets), independent of duckdb's time zone.
+        """
+        datetimes = pd.date_range("2022-01-01", periods=48, freq="H", tz="UTC")
+        if column_tz is None:
+            datetimes = datetimes.tz_localize(None)
+        else:
+            datetimes = datetimes.tz_convert(column_tz)
+        df = pd.DataFrame({"datetime_column": datetimes})
+        get_ipython.user_ns["test_df"] = df
+        dxdf = DXDataFrame(df, ipython_shell=get_ipython)
+        start = pd.Timestamp("2022-01-01 12:00", tz="US/Eastern")
+        end = pd.Timestamp("2022-01-02 00:00", tz="US/Eastern")
+        dex_filter = {
+            "column": "datetime_column",
+            "type": "DATE_FILTER",
+            "start": start,
+            "end": end,
+        }
+        filters = DEXFilterSettings(filters=[dex_filter]).filters
+        utc_values = pd.Series(pd.date_range("2022-01-01", periods=48, freq="H"))
+        expected = df[utc_values.between(start.tz_convert(None), end.tz_convert(None))]
+
+        sample_db_connection.execute("SET TimeZone = 'America/Los_Angeles'")
+        backend = make_backend(backend_class, sample_db_connection)
+        backend.register(dxdf)
+        sample_df = backend.sample(dxdf, filters=filters)
+        assert sorted(sample_df.index) == sorted(expected.index)
+        backend.unregister(dxdf)
+
+    @pytest.mark.parametrize("backend_class", BACKENDS)
+    def test_sample_respects_limit(
+        self,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_registered_display_id: str,
+        backend_class,
+    ):
+        dxdf = DXDF_CACHE[sample_registered_display_id]
+        backend = make_backend(backend_class, sample_db_connection)
+        backend.register(dxdf)
+        assert len(backend.sample(dxdf, limit=10)) == 10
+        assert backend.count(dxdf) == len(dxdf.df)
+
+    @pytest.mark.parametrize("backend_class", [BACKENDS[0], BACKENDS[2]])
+    def test_query(
+        self,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_registered_display_id: str,
+        backend_class,
+    ):
+        dxdf = DXDF_CACHE[sample_registered_display_id]
+        backend = make_backend(backend_class, sample_db_connection)
+        backend.register(dxdf)
+        result_df = backend.query(
+            dxdf,
+            "SELECT COUNT(*) AS num_rows FROM {table_name} WHERE integer_column > 0",
+        )
+        assert result_df.num_rows[0] == (dxdf.df.integer_column > 0).sum()
+
+    def test_duckdb_queries_wait_for_connection_lock(
+        self,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_registered_display_id: str,
+    ):
+        """
+        Ensure duckdb queries from another thread (like the resample worker) don't use
+        the shared connection while it's in use.
+        """
+        dxdf = DXDF_CACHE[sample_registered_display_id]
+        backend = DuckDBDatalinkBackend(connection=sample_db_connection)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with DB_CONNECTION_LOCK:
+                future = executor.submit(backend.count, dxdf)
+                with pytest.raises(TimeoutError):
+                    future.result(timeout=0.1)
+            assert future.result(timeout=10) == len(dxdf.df)
+
+    def test_numpy_backend_has_no_sql(self, sample_registered_display_id: str):
+        dxdf = DXDF_CACHE[sample_registered_display_id]
+        with pytest.raises(NotImplementedError):
+            NumpyDatalinkBackend().query(dxdf, "SELECT * FROM {table_name}")
+
+    @pytest.mark.parametrize("backend_name", ["duckdb", "numpy", "polars"])
+    def test_backend_selected_from_settings(self, backend_name: str):
+        with settings_context(datalink_backend=backend_name):
+            backend = get_datalink_backend()
+        if backend_name == "polars" and not polars_installed():
+            backend_name = "numpy"
+        assert backend.name == backend_name
+
+    @pytest.mark.parametrize("backend_name", ["numpy", "polars"])
+    def test_resample_from_settings_backend(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_dex_metric_filter: dict,
+        backend_name: str,
+    ):
+        """
+        Ensure dataframes are registered with (and resampled through) the configured backend
+        without touching the duckdb connection.
+        """
+        df = random_dataframe(num_rows=100)
+        get_ipython.user_ns["test_df"] = df
+        mock_db_connection = mocker.patch("dx.formatters.main.db_connection")
+        mocker.patch("dx.filtering.db_connection", mock_db_connection)
+        sample_dex_metric_filter["value"] = [df.float_column.median(), df.float_column.max()]
+
+        with settings_context(enable_datalink=True, datalink_backend=backend_name):
+            _, metadata = handle_format(df, ipython_shell=get_ipython)
+            resampled_df = resample_from_backend(
+                display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+                filters=[sample_dex_metric_filter],
+                assign_subset=False,
+            )
+
+        assert not mock_db_connection.method_calls
+        assert len(resampled_df) == (df.float_column >= df.float_column.median()).sum()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("backend_class", BACKENDS)
+def test_benchmark_backend_sample(
+    benchmark,
+    get_ipython: TerminalInteractiveShell,
+    sample_db_connection: duckdb.DuckDBPyConnection,
+    backend_class,
+):
+    """
+    Compare filtering a 250k-row dataframe with each datalink backend.
+    """
+    df = random_dataframe(num_rows=250_000)
+    get_ipython.user_ns["test_df"] = df
+    with settings_context(enable_datalink=True, datalink_backend="numpy"):
+        _, metadata = handle_format(df, ipython_shell=get_ipython)
+    dxdf = DXDF_CACHE[metadata[settings.MEDIA_TYPE]["display_id"]]
+    filters = DEXFilterSettings(
+        filters=[
+            {
+                "column": "float_column",
+                "type": "METRIC_FILTER",
+                "predicate": "between",
+                "value": [df.float_column.median(), df.float_column.max()],
+            },
+            {
+                "column": "keyword_column",
+                "type": "DIMENSION_FILTER",
+                "predicate": "in",
+                "value": df.keyword_column.unique()[:5].tolist(),
+            },
+        ]
+    ).filters
+
+    backend = make_backend(backend_class, sample_db_connection)
+    backend.register(dxdf)
+    # disable the bitmap cache so every round evaluates the filters
+    with settings_context(enable_filter_bitmap_cache=False):
+        benchmark(backend.sample, dxdf, filters=filters, limit=50_000)
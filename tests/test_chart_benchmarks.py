@@ -0,0 +1,90 @@
+"""
+Benchmarks for generating chart views with every function in `dx.plotting.dex.chart_functions`
+(argument handling, chart config validation, and view modeling, without rendering).
+
+Only run with `-m benchmark`, e.g.:
+    pytest -m benchmark tests/test_chart_benchmarks.py --benchmark-json=benchmarks.json
+"""
+from typing import Dict
+
+import pandas as pd
+import pytest
+
+from dx.datatypes.main import random_dataframe
+from dx.plotting.dex import chart_functions
+from dx.types.dex_metadata import DEXView
+
+# required arguments for chart functions that have them,
+# using columns from the default `random_dataframe()`
+SPLIT_BY_METRIC = {"split_by": "keyword_column", "metric": "integer_column"}
+CHART_FUNCTION_ARGS: Dict[str, dict] = {
+    "bar": {"x": "keyword_column", "y": "integer_column"},
+    "line": {"x": "datetime_column", "y": "integer_column"},
+    "pie": {"y": "integer_column"},
+    "scatter": {"x": "integer_column", "y": "float_column"},
+    "wordcloud": {"word_column": "keyword_column", "size": "integer_column"},
+    "parallel_coordinates": {
+        "columns": ["integer_column", "float_column"],
+        "filtered_only": "all data",
+    },
+    "tilemap": {"lat": "float_column", "lon": "float_column"},
+    "hexbin": {"x": "integer_column", "y": "float_column"},
+    "bignumber": SPLIT_BY_METRIC,
+    "boxplot": SPLIT_BY_METRIC,
+    "heatmap": SPLIT_BY_METRIC,
+    "histogram": SPLIT_BY_METRIC,
+    "horizon": SPLIT_BY_METRIC,
+    "ridgeline": SPLIT_BY_METRIC,
+    "violin": SPLIT_BY_METRIC,
+}
+NUM_DASHBOARD_VIEWS = 100
+
+
+@pytest.fixture
+def chart_dataframe() -> pd.DataFrame:
+    return random_dataframe(num_rows=100)
+
+
+def generate_views(df: pd.DataFrame, num_views: int):
+    chart_names = list(chart_functions)
+    return [
+        chart_functions[chart_names[i % len(chart_names)]](
+            df,
+            return_view=True,
+            **CHART_FUNCTION_ARGS.get(chart_names[i % len(chart_names)], {}),
+        )
+        for i in range(num_views)
+    ]
+
+
+@pytest.mark.parametrize("chart_name", chart_functions)
+def test_chart_function_generates_view(chart_dataframe: pd.DataFrame, chart_name: str):
+    """
+    Ensure every chart function can generate a view with the benchmark arguments.
+    """
+    chart_func = chart_functions[chart_name]
+    view = chart_func(chart_dataframe, return_view=True, **CHART_FUNCTION_ARGS.get(chart_name, {}))
+    assert isinstance(view, DEXView)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("chart_name", chart_functions)
+def test_benchmark_chart_function(benchmark, chart_dataframe: pd.DataFrame, chart_name: str):
+    chart_func = chart_functions[chart_name]
+    benchmark(
+        chart_func,
+        chart_dataframe,
+        return_view=True,
+        **CHART_FUNCTION_ARGS.get(chart_name, {}),
+    )
+    benchmark.extra_info["chart_name"] = chart_name
+
+
+@pytest.mark.benchmark
+def test_benchmark_dashboard_views(benchmark, chart_dataframe: pd.DataFrame):
+    """
+    Times generating the views for a dashboard with many charts.
+    """
+    views = benchmark(generate_views, chart_dataframe, NUM_DASHBOARD_VIEWS)
+    assert len(views) == NUM_DASHBOARD_VIEWS
+    benchmark.extra_info["num_views"] = NUM_DASHBOARD_VIEWS
@@ -1,11 +1,28 @@
+import sys
+import threading
 import uuid
 
+import duckdb
+import numpy as np
 import pandas as pd
+import pytest
 from IPython.terminal.interactiveshell import TerminalInteractiveShell
 
+from dx.comms.aggregation import handle_aggregation_comm
 from dx.comms.assignment import handle_assignment_comm
-from dx.comms.resample import handle_resample_comm
+from dx.comms.facets import handle_facets_comm
+from dx.comms.resample import handle_resample_comm, submit_resample
+from dx.filtering import LATEST_RESAMPLE_REQUESTS, facets_from_db, handle_resample
+from dx.formatters.main import handle_format
+from dx.settings import get_settings, settings_context
+from dx.types.aggregation import DEXAggregationMessage
+from dx.types.charts.bar import DEXBarChartConfig
+from dx.types.facets import DEXFacetsMessage
 from dx.types.filters import DEXFilterSettings, DEXResampleMessage
+from dx.utils import tracking
+from dx.utils.tracking import DXDF_CACHE
+
+settings = get_settings()
 
 
 class TestResampleComm:
@@ -31,10 +48,137 @@ class TestResampleComm:
             }
         }
         mock_handle_resample = mocker.patch("dx.comms.resample.handle_resample")
-        handle_resample_comm(msg)
+        future = handle_resample_comm(msg)
+        if future is not None:
+            # wait for the background worker to pick up the request
+            future.result(timeout=10)
         resample_msg = DEXResampleMessage.parse_obj(msg["content"]["data"])
         mock_handle_resample.assert_called_once_with(resample_msg)
 
+    def test_resample_handled_synchronously(self, mocker):
+        """
+        Test that `handle_resample` is called directly on the calling thread
+        when async resampling is disabled.
+        """
+        msg = {"content": {"data": {"display_id": "test", "filters": []}}}
+        mock_handle_resample = mocker.patch("dx.comms.resample.handle_resample")
+        with settings_context(enable_async_resample=False):
+            future = handle_resample_comm(msg)
+        assert future is None
+        mock_handle_resample.assert_called_once()
+
+    def test_superseded_resample_skips_display_update(self, mocker):
+        """
+        Test that a resample request that was replaced by a newer request
+        for the same display ID doesn't query the database or update the display.
+        """
+        display_id = str(uuid.uuid4())
+        old_msg = DEXResampleMessage(display_id=display_id)
+        new_msg = DEXResampleMessage(display_id=display_id)
+        LATEST_RESAMPLE_REQUESTS[display_id] = new_msg
+
+        mock_resample = mocker.patch("dx.filtering.resample_from_backend")
+        mock_update_display = mocker.patch("dx.filtering.update_display")
+        try:
+            assert handle_resample(old_msg) is None
+        finally:
+            LATEST_RESAMPLE_REQUESTS.pop(display_id, None)
+
+        mock_resample.assert_not_called()
+        mock_update_display.assert_not_called()
+
+    def test_only_latest_resample_applied(self, mocker):
+        """
+        Test that when several resample requests for the same display ID are
+        submitted back-to-back, only the latest one updates the display.
+        """
+        display_id = str(uuid.uuid4())
+        msgs = [DEXResampleMessage(display_id=display_id, limit=i + 1) for i in range(5)]
+
+        mocker.patch("dx.filtering.resample_from_backend", return_value=pd.DataFrame({"a": [1]}))
+        mocker.patch("dx.filtering.store_sample_to_history", return_value={"datalink": {}})
+        mock_update_display = mocker.patch("dx.filtering.update_display")
+
+        futures = [submit_resample(msg) for msg in msgs]
+        futures[-1].result(timeout=10)
+
+        # the first request may have already started before the others were queued,
+        # but it should still skip its display update since it was superseded
+        for future in futures[:-1]:
+            assert future.cancelled() or future.result(timeout=10) is None
+        mock_update_display.assert_called_once()
+
+    def test_resample_while_user_ns_changes(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+    ):
+        """
+        Test that background resample requests (which look up the dataframe's variable
+        name while updating the display) don't fail while the shell thread is
+        adding and removing variables.
+        """
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+        mocker.patch(
+            "dx.filtering.update_display",
+            lambda obj, display_id=None, metadata=None: handle_format(
+                obj, ipython_shell=get_ipython, with_ipython_display=False
+            ),
+        )
+        # errors here would otherwise be hidden by handle_format()'s fallback to simple processing
+        lookup_errors = []
+        get_df_variable_name = tracking.get_df_variable_name
+
+        def recording_get_df_variable_name(*args, **kwargs):
+            try:
+                return get_df_variable_name(*args, **kwargs)
+            except Exception as e:
+                lookup_errors.append(e)
+                raise
+
+        mocker.patch(
+            "dx.utils.tracking.get_df_variable_name", side_effect=recording_get_df_variable_name
+        )
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        with settings_context(enable_datalink=True, datalink_backend="duckdb"):
+            _, metadata = handle_format(
+                sample_random_dataframe, ipython_shell=get_ipython, with_ipython_display=False
+            )
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+
+            stop = threading.Event()
+
+            def change_user_ns():
+                i = 0
+                while not stop.is_set():
+                    # grow and shrink the namespace
+                    if (i // 1000) % 2:
+                        get_ipython.user_ns.pop(f"_test_var_{i % 1000}", None)
+                    else:
+                        get_ipython.user_ns[f"_test_var_{i % 1000}"] = i
+                    i += 1
+
+            shell_thread = threading.Thread(target=change_user_ns)
+            # switch threads as often as possible to make the race more likely
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            shell_thread.start()
+            try:
+                for limit in range(1, 51):
+                    future = submit_resample(DEXResampleMessage(display_id=display_id, limit=limit))
+                    # not superseded, so the display should have been updated
+                    assert future.result(timeout=30) is not None
+            finally:
+                stop.set()
+                shell_thread.join()
+                sys.setswitchinterval(switch_interval)
+                for i in range(1000):
+                    get_ipython.user_ns.pop(f"_test_var_{i}", None)
+        assert lookup_errors == []
+
 
 class TestAssignmentComm:
     def test_assignment_handled(
@@ -45,7 +189,7 @@ class TestAssignmentComm:
     ):
         """
         Test that a valid message handled through the assignment comm
-        will call resample_from_db() with the provided display_id, filters,
+        will call resample_from_backend() with the provided display_id, filters,
         and sample size, and will assign a valid pandas DataFrame in the
         kernel namespace with the provided variable name.
         """
@@ -63,13 +207,13 @@ class TestAssignmentComm:
             }
         }
         mock_resample = mocker.patch(
-            "dx.comms.assignment.resample_from_db", return_value=sample_dataframe
+            "dx.comms.assignment.resample_from_backend", return_value=sample_dataframe
         )
         handle_assignment_comm(msg, ipython_shell=get_ipython)
         resample_params = {
             "display_id": display_id,
-            "sql_filter": f"SELECT * FROM {{table_name}} LIMIT {sample_size}",
             "filters": [],
+            "limit": sample_size,
             "assign_subset": False,
         }
         mock_resample.assert_called_once_with(**resample_params)
@@ -86,7 +230,7 @@ class TestAssignmentComm:
     ):
         """
         Test that a valid message handled through the assignment comm
-        will call resample_from_db() with the provided display_id, filters,
+        will call resample_from_backend() with the provided display_id, filters,
         and sample size, and will assign a valid pandas DataFrame in the
         kernel namespace with the provided variable name.
         """
@@ -94,10 +238,6 @@ class TestAssignmentComm:
         sample_size = 50
 
         filters = [sample_dex_metric_filter]
-        dex_filters = DEXFilterSettings(filters=filters)
-        sql_filter = (
-            f"SELECT * FROM {{table_name}} WHERE {dex_filters.to_sql_query()} LIMIT {sample_size}"
-        )
 
         msg = {
             "content": {
@@ -111,13 +251,13 @@ class TestAssignmentComm:
             }
         }
         mock_resample = mocker.patch(
-            "dx.comms.assignment.resample_from_db", return_value=sample_dataframe
+            "dx.comms.assignment.resample_from_backend", return_value=sample_dataframe
         )
         handle_assignment_comm(msg, ipython_shell=get_ipython)
         resample_params = {
             "display_id": display_id,
-            "sql_filter": sql_filter,
             "filters": filters,
+            "limit": sample_size,
             "assign_subset": False,
         }
         mock_resample.assert_called_once_with(**resample_params)
@@ -152,13 +292,13 @@ class TestAssignmentComm:
             }
         }
         mock_resample = mocker.patch(
-            "dx.comms.assignment.resample_from_db", return_value=sample_dataframe
+            "dx.comms.assignment.resample_from_backend", return_value=sample_dataframe
         )
         handle_assignment_comm(msg, ipython_shell=get_ipython)
         resample_params = {
             "display_id": display_id,
-            "sql_filter": f"SELECT * FROM {{table_name}} LIMIT {sample_size}",
             "filters": [],
+            "limit": sample_size,
             "assign_subset": False,
         }
         mock_resample.assert_called_once_with(**resample_params)
@@ -191,7 +331,228 @@ class TestAssignmentComm:
                 }
             }
         }
-        mock_resample = mocker.patch("dx.comms.assignment.resample_from_db")
+        mock_resample = mocker.patch("dx.comms.assignment.resample_from_backend")
         handle_assignment_comm(msg, ipython_shell=get_ipython)
         mock_resample.assert_not_called()
         assert "new_df" not in get_ipython.user_ns
+
+
+class TestAggregationComm:
+    @pytest.mark.parametrize("datalink_backend", ["duckdb", "numpy", "polars"])
+    @pytest.mark.parametrize(
+        "combination_mode, pandas_agg",
+        [("avg", "mean"), ("sum", "sum"), ("med", "median"), ("min", "min"), ("max", "max")],
+    )
+    def test_aggregation_matches_pandas(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        combination_mode: str,
+        pandas_agg: str,
+        datalink_backend: str,
+    ):
+        """
+        Test that a chart aggregation request is computed over the full registered
+        dataset and matches the equivalent pandas groupby aggregation, regardless of
+        which backend the dataframe was displayed with.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True, datalink_backend=datalink_backend):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+
+        msg = {
+            "content": {
+                "data": {
+                    "display_id": metadata[settings.MEDIA_TYPE]["display_id"],
+                    "dimensions": ["keyword_column"],
+                    "metrics": ["float_column"],
+                    "combination_mode": combination_mode.upper(),
+                }
+            }
+        }
+        response = handle_aggregation_comm(msg)
+        assert response["status"] == "success"
+
+        payload = response["data"]
+        assert payload["columns"] == ["keyword_column", "float_column", "DEX_COUNT"]
+        agg_df = pd.DataFrame(payload["data"], columns=payload["columns"])
+
+        expected = sample_random_dataframe.groupby("keyword_column").float_column.agg(pandas_agg)
+        actual = agg_df.set_index("keyword_column").float_column
+        pd.testing.assert_series_equal(
+            actual.sort_index().astype(float),
+            expected.sort_index().astype(float),
+            check_names=False,
+        )
+
+    def test_aggregation_skipped(self, mocker):
+        """
+        Test that aggregation is skipped if the comm message has no data.
+        """
+        mock_aggregate = mocker.patch("dx.comms.aggregation.aggregate_from_db")
+        assert handle_aggregation_comm({"content": {}}) is None
+        mock_aggregate.assert_not_called()
+
+    def test_aggregation_message_from_chart(self, sample_dex_metric_filter: dict):
+        """
+        Test that a chart config's dimensions, metrics, and combination mode
+        are converted to a filtered group-by SQL query.
+        """
+        chart = DEXBarChartConfig(
+            dim1="keyword_column",
+            metric1="float_column",
+            combination_mode="sum",
+        )
+        msg = DEXAggregationMessage.from_chart(
+            "test",
+            chart,
+            filters=[sample_dex_metric_filter],
+            limit=10,
+        )
+        filter_str = DEXFilterSettings(filters=[sample_dex_metric_filter]).to_sql_query()
+        assert msg.to_sql_query() == (
+            'SELECT "keyword_column", SUM("float_column") AS "float_column", '
+            'COUNT(*) AS "DEX_COUNT" FROM {table_name} '
+            f'WHERE {filter_str} GROUP BY "keyword_column" ORDER BY "keyword_column" LIMIT 10'
+        )
+
+
+class TestFacetsComm:
+    @pytest.fixture
+    def sample_facets_display_id(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+    ) -> str:
+        sample_random_dataframe.loc[::7, "keyword_column"] = None
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+        return metadata[settings.MEDIA_TYPE]["display_id"]
+
+    def test_facets_match_pandas(
+        self,
+        sample_random_dataframe: pd.DataFrame,
+        sample_facets_display_id: str,
+        sample_dex_date_filter: dict,
+    ):
+        """
+        Test that facet counts are computed over the full filtered dataset and
+        match pandas value counts and numpy histograms.
+        """
+        msg = {
+            "content": {
+                "data": {
+                    "display_id": sample_facets_display_id,
+                    "dimensions": ["keyword_column"],
+                    "metrics": ["float_column"],
+                    "filters": [sample_dex_date_filter],
+                    "top_k": 3,
+                    "num_bins": 5,
+                }
+            }
+        }
+        response = handle_facets_comm(msg)
+        assert response["status"] == "success"
+        payload = response["data"]
+
+        df = sample_random_dataframe
+        assert payload["num_rows"] == len(df)
+
+        keyword_facet = payload["dimensions"]["keyword_column"]
+        value_counts = df.keyword_column.value_counts()
+        assert keyword_facet["counts"] == value_counts.head(3).tolist()
+        assert set(value_counts[value_counts.isin(keyword_facet["counts"])].index) >= set(
+            keyword_facet["values"]
+        )
+        assert keyword_facet["null_count"] == df.keyword_column.isnull().sum()
+        assert keyword_facet["other_count"] == value_counts.sum() - sum(keyword_facet["counts"])
+
+        float_facet = payload["metrics"]["float_column"]
+        counts, bin_edges = np.histogram(df.float_column, bins=5)
+        assert float_facet["counts"] == counts.tolist()
+        assert float_facet["bin_edges"] == pytest.approx(bin_edges.tolist())
+        assert float_facet["null_count"] == 0
+
+    def test_facets_default_columns(
+        self,
+        sample_facets_display_id: str,
+    ):
+        """
+        Test that string/boolean columns are used as dimensions and
+        numeric columns as metrics if no columns are requested.
+        """
+        payload = facets_from_db(DEXFacetsMessage(display_id=sample_facets_display_id))
+        assert "keyword_column" in payload["dimensions"]
+        assert "bool_column" in payload["dimensions"]
+        assert set(payload["metrics"]) == {"integer_column", "float_column"}
+        assert "datetime_column" not in {*payload["dimensions"], *payload["metrics"]}
+
+    def test_facets_with_numpy_backend(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+    ):
+        """
+        Test that dataframes displayed without duckdb are registered with it
+        once a facets request needs to query them.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True, datalink_backend="numpy"):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+            assert not DXDF_CACHE[display_id].duckdb_registered
+
+            msg = DEXFacetsMessage(display_id=display_id, dimensions=["keyword_column"])
+            payload = facets_from_db(msg)
+
+        assert DXDF_CACHE[display_id].duckdb_registered
+        assert payload["num_rows"] == len(sample_random_dataframe)
+
+    def test_facets_cached_per_filters(
+        self,
+        mocker,
+        sample_facets_display_id: str,
+        sample_dex_metric_filter: dict,
+    ):
+        """
+        Test that facet counts are only queried once per display ID and filter set.
+        """
+        query_spy = mocker.spy(DEXFacetsMessage, "to_sql_query")
+        msg = DEXFacetsMessage(display_id=sample_facets_display_id, metrics=["float_column"])
+        filtered_msg = msg.copy(
+            update={"filters": DEXFilterSettings(filters=[sample_dex_metric_filter]).filters}
+        )
+
+        first_payload = facets_from_db(msg)
+        assert facets_from_db(msg) == first_payload
+        assert query_spy.call_count == 1
+
+        facets_from_db(filtered_msg)
+        assert query_spy.call_count == 2
+        assert len(DXDF_CACHE[sample_facets_display_id].facet_cache) == 2
+
+    def test_facets_skipped(self, mocker):
+        """
+        Test that facet counts are skipped if the comm message has no data.
+        """
+        mock_facets = mocker.patch("dx.comms.facets.facets_from_db")
+        assert handle_facets_comm({"content": {}}) is None
+        mock_facets.assert_not_called()
@@ -4,6 +4,7 @@ Tests to ensure various data types can be sent functions to
 - hash the dataframe for tracking
 - write to the database for tracking/filtering
 """
+import os
 from datetime import datetime
 
 import duckdb
@@ -14,7 +15,9 @@ from jupyter_client.jsonutil import json_clean
 from pandas.io.json import build_table_schema
 from pandas.util import hash_pandas_object
 
-from dx.datatypes import date_time, geometry, main, misc, numeric, text
+from dx import settings as dx_settings
+from dx.datatypes import compatibility, date_time, geometry, main, misc, numeric, text
+from dx.datatypes.dataset import write_random_dataset
 from dx.datatypes.main import (
     DX_DATATYPES,
     SORTED_DX_DATATYPES,
@@ -141,6 +144,28 @@ class TestDataFrameGeneration:
             assert col in df.columns
             assert df[col].notnull().all()
 
+    def test_seeded_random_dataframe_is_reproducible(self):
+        # nested tables and geometries can't be compared directly
+        excluded_datatypes = {
+            "nested_tabular_column",
+            "latlon_point_column",
+            "filled_geojson_column",
+            "exterior_geojson_column",
+        }
+        params = {dt: dt not in excluded_datatypes for dt in SORTED_DX_DATATYPES}
+        df = random_dataframe(num_rows=20, seed=1, **params)
+        assert df.equals(random_dataframe(num_rows=20, seed=1, **params))
+        assert not df.equals(random_dataframe(num_rows=20, seed=2, **params))
+
+    def test_keyword_letters_are_distinct(self):
+        keywords = text.generate_keyword_series(1_000, num_letters=5, rng=0)
+        assert (keywords.str.len() == 5).all()
+        assert keywords.map(lambda keyword: len(set(keyword)) == 5).all()
+
+    def test_uuid4_series_values_are_version_4(self):
+        uuids = misc.generate_uuid4_series(100, rng=0)
+        assert all(value.version == 4 for value in uuids)
+
     def test_quick_random_dataframe_has_default_data(self):
         df = quick_random_dataframe()
         assert df.shape[0] >= 1
@@ -402,3 +427,144 @@ class TestDatatypeHandling:
                 handle_format(df)
             except Exception as e:
                 assert False, f"{dtype} failed dx handle_format(): {e}"
+
+
+class TestRandomDatasetWriting:
+    def test_chunks_and_row_groups(self, tmp_path, sample_db_connection: duckdb.DuckDBPyConnection):
+        file_paths = write_random_dataset(
+            str(tmp_path / "dataset"),
+            num_rows=25_000,
+            chunk_size=10_000,
+            row_group_size=4_096,
+            register=True,
+            db_connection=sample_db_connection,
+        )
+
+        assert [os.path.basename(path) for path in file_paths] == [
+            "part-00000.parquet",
+            "part-00001.parquet",
+            "part-00002.parquet",
+        ]
+        row_group_sizes = sample_db_connection.execute(
+            f"""
+            SELECT row_group_num_rows
+            FROM parquet_metadata('{file_paths[0]}')
+            GROUP BY row_group_id, row_group_num_rows
+            ORDER BY row_group_id
+            """
+        ).fetchall()
+        assert [num_rows for (num_rows,) in row_group_sizes] == [4_096, 4_096, 1_808]
+
+        db_df = sample_db_connection.execute("SELECT * FROM dataset").df()
+        assert len(db_df) == 25_000
+        assert list(db_df.columns) == list(normalize_index_and_columns(random_dataframe(1)).columns)
+
+    def test_seeded_reproducibility(self, tmp_path):
+        """
+        Ensure the same seed writes the same values, and a different seed doesn't.
+        """
+        columns = {"datetime_column": False, "text_column": True, "uuid4_column": True}
+        datasets = {}
+        for name, seed in [("first", 1), ("second", 1), ("third", 2)]:
+            path = str(tmp_path / name)
+            write_random_dataset(path, num_rows=500, chunk_size=200, seed=seed, **columns)
+            datasets[name] = duckdb.query(
+                f"SELECT * FROM read_parquet('{path}/*.parquet', filename=true)"
+            ).df()
+            datasets[name]["filename"] = datasets[name]["filename"].map(os.path.basename)
+
+        pd.testing.assert_frame_equal(datasets["first"], datasets["second"])
+        assert not datasets["first"].equals(datasets["third"])
+
+    def test_seeded_files_are_identical(self, tmp_path):
+        """
+        Ensure writing the same seed twice (including date/time columns) produces identical files.
+        """
+        columns = {"datetime_column": True, "datetimetz_column": True, "date_column": True}
+        file_contents = []
+        for name in ["first", "second"]:
+            file_paths = write_random_dataset(
+                str(tmp_path / name), num_rows=500, chunk_size=200, seed=1, **columns
+            )
+            file_contents.append([open(file_path, "rb").read() for file_path in file_paths])
+        assert file_contents[0] == file_contents[1]
+
+    def test_existing_files_not_overwritten(self, tmp_path):
+        path = str(tmp_path / "dataset")
+        file_paths = write_random_dataset(path, num_rows=300, chunk_size=100)
+        with pytest.raises(FileExistsError):
+            write_random_dataset(path, num_rows=100, chunk_size=100)
+        assert sorted(os.listdir(path)) == [os.path.basename(p) for p in file_paths]
+
+    def test_overwrite_removes_old_chunks(self, tmp_path):
+        path = str(tmp_path / "dataset")
+        write_random_dataset(path, num_rows=300, chunk_size=100)
+        file_paths = write_random_dataset(path, num_rows=100, chunk_size=100, overwrite=True)
+        assert sorted(os.listdir(path)) == [os.path.basename(file_paths[0])]
+
+    def test_arrow_files(self, tmp_path, sample_db_connection: duckdb.DuckDBPyConnection):
+        pytest.importorskip("pyarrow")
+        write_random_dataset(
+            str(tmp_path / "dataset"),
+            num_rows=250,
+            chunk_size=100,
+            file_format="arrow",
+            register=True,
+            table_name="arrow_dataset",
+            db_connection=sample_db_connection,
+        )
+        (num_rows,) = sample_db_connection.execute("SELECT COUNT(*) FROM arrow_dataset").fetchone()
+        assert num_rows == 250
+
+    def test_unsupported_file_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_random_dataset(str(tmp_path), num_rows=10, file_format="csv")
+
+
+class TestCompatibilityBatch:
+    @pytest.fixture
+    def mixed_dataframe(self) -> pd.DataFrame:
+        return random_dataframe(
+            10,
+            complex_number_column=True,
+            time_interval_column=True,
+            uuid4_column=True,
+        )
+
+    def test_compatibility_matrix(self, mixed_dataframe: pd.DataFrame):
+        matrix = compatibility.test_compatibility_batch(mixed_dataframe, use_processes=False)
+
+        assert list(matrix.index) == list(mixed_dataframe.columns)
+        assert list(matrix.columns) == ["dtype", *compatibility.COMPATIBILITY_CHECKS, "details"]
+        assert matrix.loc["integer_column"].drop(["dtype", "details"]).all()
+        # duckdb can't register complex numbers
+        assert not matrix.loc["complex_number_column", "duckdb.conn.register"]
+        assert matrix.loc["complex_number_column", "dx.handle_format"]
+        details = matrix.loc["complex_number_column", "details"]
+        assert "error" in details["duckdb.conn.register"]
+
+    def test_settings_unchanged(self, mocker, mixed_dataframe: pd.DataFrame):
+        """
+        Ensure checking columns doesn't toggle global settings
+        (which would re-register the comm targets for every column).
+        """
+        set_option_spy = mocker.spy(dx_settings, "set_option")
+        compatibility.test_compatibility_batch(mixed_dataframe, use_processes=False)
+        set_option_spy.assert_not_called()
+
+    def test_process_pool_matches_in_process(self, mixed_dataframe: pd.DataFrame):
+        pooled_results = compatibility.test_compatibility_batch(
+            mixed_dataframe, as_dataframe=False, max_workers=2
+        )
+        results = compatibility.test_compatibility_batch(
+            mixed_dataframe, as_dataframe=False, use_processes=False
+        )
+        assert pooled_results == results
+
+    def test_list_of_values(self):
+        values = [1, "a", complex(1, 2)]
+        matrix = compatibility.test_compatibility_batch(values, use_processes=False)
+
+        assert list(matrix.index) == [0, 1, 2]
+        assert list(matrix.dtype) == ["int", "str", "complex"]
+        assert list(matrix["duckdb.conn.register"]) == [True, True, False]
@@ -5,9 +5,13 @@ function to the primary function, and check for more specific attributes.
 """
 
 import pandas as pd
+import pytest
+from pydantic import ValidationError, parse_obj_as
 
 from dx.plotting import dex
+from dx.plotting.utils import handle_view
 from dx.types import charts
+from dx.types.charts._base import DEXChartBase
 
 
 class TestBasicCharts:
@@ -377,3 +381,53 @@ class TestTimeSeriesCharts:
         )
         assert isinstance(view, charts.stacked_percent.DEXStackedPercentChartView)
         assert view.chart_mode == "stacked_percent"
+
+
+class TestChartViewParsing:
+    @pytest.mark.parametrize("chart_mode", sorted(charts.CHART_VIEW_MODELS))
+    def test_matches_union_parsing(self, chart_mode: str):
+        """
+        Ensure going straight to a chart_mode's view model generates the same
+        view metadata as parsing the full `dex_charts` union.
+        """
+        chart = {"dim1": "keyword_column", "metric1": "integer_column"}
+        if chart_mode == "network":
+            chart["network_type"] = "force"
+        if chart_mode == "dotplot":
+            chart["bar_projection"] = "radial"
+        if chart_mode == "summary":
+            chart["summary_type"] = "violin"
+
+        view = handle_view(pd.DataFrame(), chart_mode, chart=chart, return_view=True)
+        union_view = parse_obj_as(
+            charts.dex_charts,
+            {
+                "chart_mode": chart_mode,
+                "chart": DEXChartBase.parse_obj(chart),
+                "decoration": {"title": chart_mode.title()},
+            },
+        )
+
+        assert type(view) is type(union_view)
+        # (handle_view() also adds the summary type to the title)
+        exclude = {"id", "display_id", "decoration"}
+        assert view.dict(exclude_unset=True, exclude_none=True, exclude=exclude) == union_view.dict(
+            exclude_unset=True, exclude_none=True, exclude=exclude
+        )
+
+    def test_config_model_not_revalidated(self, mocker):
+        chart = {"dim1": "keyword_column", "pro_bar_mode": "stacked"}
+        config = charts.bar.DEXBarChartConfig.parse_obj(chart)
+        parse_obj_spy = mocker.spy(charts.bar.DEXBarChartConfig, "parse_obj")
+
+        view = handle_view(pd.DataFrame(), "bar", chart=config, return_view=True)
+
+        assert parse_obj_spy.call_count == 0
+        dict_view = handle_view(pd.DataFrame(), "bar", chart=chart, return_view=True)
+        assert view.chart.dict(exclude_unset=True) == dict_view.chart.dict(exclude_unset=True)
+        # the passed-in config is left alone
+        assert config.__fields_set__ == {"dim1", "pro_bar_mode"}
+
+    def test_unknown_chart_mode(self):
+        with pytest.raises(ValidationError):
+            handle_view(pd.DataFrame(), "not_a_chart", return_view=True)
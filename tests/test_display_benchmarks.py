@@ -0,0 +1,172 @@
+"""
+End-to-end and per-stage benchmarks for the display pipeline (`handle_format()`),
+across a grid of dataframe sizes using every `DX_DATATYPES` column type.
+
+Only run with `-m benchmark`; to save results for comparing releases, use:
+    pytest -m benchmark tests/test_display_benchmarks.py --benchmark-json=benchmarks.json
+
+Grid sizes with more than `DX_BENCHMARK_MAX_CELLS` (rows x columns, default 10M)
+cells are skipped.
+"""
+import os
+from functools import lru_cache
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+from IPython.terminal.interactiveshell import TerminalInteractiveShell
+from pandas.io.json import build_table_schema
+
+from dx import __version__
+from dx.backends import DuckDBDatalinkBackend
+from dx.datatypes.main import DX_DATATYPES, random_dataframe
+from dx.formatters.main import generate_body, handle_format
+from dx.formatters.summarizing import make_df_summary
+from dx.sampling import sample_if_too_big
+from dx.settings import settings_context
+from dx.utils.formatting import normalize_index_and_columns
+from dx.utils.tracking import DXDataFrame, generate_df_hash, get_df_variable_name
+
+BENCHMARK_ROWS = [1_000, 100_000, 1_000_000, 10_000_000]
+BENCHMARK_COLUMNS = [5, 100, 2_000]
+BENCHMARK_MAX_CELLS = int(os.environ.get("DX_BENCHMARK_MAX_CELLS", 10_000_000))
+# distinct rows generated per datatype before repeating them to fill larger sizes,
+# since some of the random value generators are slow
+BASE_NUM_ROWS = 1_000
+
+DISPLAY_MODES = ["simple", "enhanced"]
+STAGES = [
+    "copy",
+    "normalize",
+    "hash",
+    "variable_lookup",
+    "sample",
+    "schema",
+    "body",
+    "summary",
+    "duckdb_registration",
+]
+
+
+@lru_cache(maxsize=1)
+def base_dataframe() -> pd.DataFrame:
+    all_datatypes = {datatype: True for datatype in DX_DATATYPES}
+    return random_dataframe(num_rows=BASE_NUM_ROWS, **all_datatypes)
+
+
+@lru_cache(maxsize=2)
+def benchmark_dataframe(num_rows: int, num_cols: int) -> pd.DataFrame:
+    """
+    Returns a `num_rows` x `num_cols` dataframe cycling through every
+    `DX_DATATYPES` column type.
+    """
+    base_df = base_dataframe()
+    row_positions = np.arange(num_rows) % len(base_df)
+    col_positions = np.arange(num_cols) % len(base_df.columns)
+    df = base_df.iloc[row_positions, col_positions].reset_index(drop=True)
+    df.columns = [f"{col}_{i}" for i, col in enumerate(df.columns)]
+    return df
+
+
+def size_params() -> list:
+    params = []
+    for num_rows in BENCHMARK_ROWS:
+        for num_cols in BENCHMARK_COLUMNS:
+            marks = []
+            if num_rows * num_cols > BENCHMARK_MAX_CELLS:
+                marks.append(pytest.mark.skip(reason=f"more than {BENCHMARK_MAX_CELLS=} cells"))
+            params.append(
+                pytest.param(num_rows, num_cols, marks=marks, id=f"{num_rows}x{num_cols}")
+            )
+    return params
+
+
+def add_extra_info(benchmark, num_rows: int, num_cols: int, display_mode: str, stage: str):
+    benchmark.extra_info.update(
+        {
+            "dx_version": __version__,
+            "num_rows": num_rows,
+            "num_cols": num_cols,
+            "display_mode": display_mode,
+            "stage": stage,
+        }
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("display_mode", DISPLAY_MODES)
+@pytest.mark.parametrize("num_rows,num_cols", size_params())
+def test_benchmark_handle_format(
+    benchmark,
+    mocker,
+    get_ipython: TerminalInteractiveShell,
+    sample_db_connection: duckdb.DuckDBPyConnection,
+    num_rows: int,
+    num_cols: int,
+    display_mode: str,
+):
+    df = benchmark_dataframe(num_rows, num_cols)
+    get_ipython.user_ns["test_df"] = df
+    mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+
+    with settings_context(
+        display_mode=display_mode,
+        enable_datalink=True,
+        datalink_backend="duckdb",
+        ipython_shell=get_ipython,
+    ):
+        benchmark(handle_format, df, ipython_shell=get_ipython, with_ipython_display=False)
+    add_extra_info(benchmark, num_rows, num_cols, display_mode, "handle_format")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("stage", STAGES)
+@pytest.mark.parametrize("display_mode", DISPLAY_MODES)
+@pytest.mark.parametrize("num_rows,num_cols", size_params())
+def test_benchmark_display_stage(
+    benchmark,
+    get_ipython: TerminalInteractiveShell,
+    sample_db_connection: duckdb.DuckDBPyConnection,
+    num_rows: int,
+    num_cols: int,
+    display_mode: str,
+    stage: str,
+):
+    """
+    Times each step of `handle_format()` separately, with each stage's input
+    prepared the same way the display pipeline would.
+    """
+    if stage == "summary":
+        # used by DataFrame.to_markdown() for the summary
+        pytest.importorskip("tabulate")
+    df = benchmark_dataframe(num_rows, num_cols)
+    get_ipython.user_ns["test_df"] = df
+
+    with settings_context(
+        display_mode=display_mode,
+        enable_datalink=True,
+        ipython_shell=get_ipython,
+    ):
+        normalized_df = normalize_index_and_columns(df.copy())
+        sampled_df = normalized_df
+        if stage in {"schema", "body", "summary"}:
+            sampled_df = sample_if_too_big(normalized_df)
+
+        stage_funcs = {
+            "copy": lambda: df.copy(),
+            "normalize": lambda: normalize_index_and_columns(df.copy()),
+            "hash": lambda: generate_df_hash(normalized_df),
+            "variable_lookup": lambda: get_df_variable_name(df, ipython_shell=get_ipython),
+            "sample": lambda: sample_if_too_big(normalized_df),
+            "schema": lambda: build_table_schema(sampled_df),
+            "body": lambda: generate_body(sampled_df),
+            "summary": lambda: make_df_summary(sampled_df),
+        }
+        if stage == "duckdb_registration":
+            dxdf = DXDataFrame(df, ipython_shell=get_ipython)
+            backend = DuckDBDatalinkBackend(connection=sample_db_connection)
+            stage_funcs[stage] = lambda: backend.register(dxdf)
+
+        benchmark(stage_funcs[stage])
+    add_extra_info(benchmark, num_rows, num_cols, display_mode, stage)
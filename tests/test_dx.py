@@ -1,13 +1,27 @@
+import cProfile
+import importlib
+import json
+import os
+import pstats
+import subprocess
+import sys
 import uuid
 
 import pytest
 
-from dx.datatypes.main import quick_random_dataframe
+import dx
+import dx.types
+from dx.datatypes.main import quick_random_dataframe, random_dataframe
+from dx.filtering import handle_resample
 from dx.formatters.enhanced import get_dx_settings
-from dx.formatters.main import format_output, generate_body
-from dx.settings import settings_context
+from dx.formatters.main import format_output, generate_body, handle_format
+from dx.loggers import callsite_parameter_adder, get_shared_processors
+from dx.settings import get_settings, settings_context
+from dx.types.filters import DEXResampleMessage
+from dx.utils.profiling import clear_profiles, get_profiles, profile
 
 dx_settings = get_dx_settings()
+settings = get_settings()
 
 
 def test_data_structure(sample_dataframe):
@@ -65,3 +79,208 @@ def test_datalink_toggle(enabled: bool):
             format_output(df)
         except Exception as e:
             assert False, f"failed with {e}"
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_is_lazy():
+    """
+    Ensure `import dx` only loads the display formatter path (without opening duckdb), and that
+    plotting/comms/datatypes are loaded on first attribute access.
+    """
+    lazy_modules = ["dx.comms", "dx.plotting", "dx.types.charts", "duckdb", "faker"]
+    result = run_python(
+        "-c",
+        "import json, sys; import dx; loaded = [m for m in sys.argv[1:] if m in sys.modules]; "
+        "dx.random_dataframe; dx.handle_resample_comm; print(json.dumps([loaded, dx.bar.__module__]))",
+        *lazy_modules,
+    )
+    loaded_modules, bar_module = json.loads(result.stdout)
+    assert loaded_modules == []
+    assert bar_module == "dx.plotting.dex.basic_charts"
+
+
+def test_star_import_includes_lazy_names():
+    """
+    Ensure `from dx import *` still exposes names from lazily-loaded subpackages.
+    """
+    result = run_python(
+        "-c",
+        "from dx import *; print(all(callable(f) for f in [bar, random_dataframe, handle_format]))",
+    )
+    assert result.stdout.strip() == "True"
+
+
+def test_types_star_import_includes_lazy_names():
+    """
+    Ensure `from dx.types import *` exposes the models from every lazily-loaded submodule.
+    """
+    result = run_python(
+        "-c",
+        "from dx.types import *; "
+        "print([m.__name__ for m in [DXDisplayMode, DEXFilterSettings, DEXBarChartView]])",
+    )
+    assert result.stdout.strip() == "['DXDisplayMode', 'DEXFilterSettings', 'DEXBarChartView']"
+
+
+def test_unknown_attribute_does_not_import_lazy_modules():
+    """
+    Ensure looking up a name that doesn't exist raises AttributeError
+    without importing every lazily-loaded subpackage to search it.
+    """
+    result = run_python(
+        "-c",
+        "import json, sys; import dx; has_attr = hasattr(dx, 'not_a_dx_attribute'); "
+        "print(json.dumps([has_attr, [m for m in sys.argv[1:] if m in sys.modules]]))",
+        "dx.comms",
+        "dx.plotting",
+        "dx.types.charts",
+    )
+    assert json.loads(result.stdout) == [False, []]
+
+
+@pytest.mark.parametrize("package", [dx, dx.types])
+def test_lazy_names_match_their_submodules(package):
+    """
+    Ensure every name in a package's static lazy-loading map comes from
+    the submodule it's mapped to.
+    """
+    for module_name, names in package.LAZY_NAMES.items():
+        module = importlib.import_module(module_name)
+        assert [name for name in names if not hasattr(module, name)] == []
+
+
+def test_display_does_not_import_optional_dataframe_libraries():
+    """
+    Ensure checking whether an object is renderable doesn't import
+    dask/geopandas/polars when no objects of their types have been created.
+    """
+    optional_modules = ["dask.dataframe", "geopandas", "polars"]
+    result = run_python(
+        "-c",
+        "import json, sys; import pandas as pd; import dx; "
+        "dx.handle_format(pd.DataFrame({'a': [1, 2]}), with_ipython_display=False); "
+        "print(json.dumps([m for m in sys.argv[1:] if m in sys.modules]))",
+        *optional_modules,
+    )
+    assert json.loads(result.stdout) == []
+
+
+def test_callsite_parameters_are_opt_in():
+    """
+    Ensure log events only inspect stack frames for callsite info when enabled.
+    """
+    assert callsite_parameter_adder not in get_shared_processors()
+    with settings_context(log_callsite_parameters=True):
+        assert callsite_parameter_adder in get_shared_processors()
+    assert callsite_parameter_adder not in get_shared_processors()
+
+
+def test_profiling_is_opt_in(get_ipython, sample_random_dataframe):
+    clear_profiles()
+    handle_format(sample_random_dataframe, ipython_shell=get_ipython, with_ipython_display=False)
+    assert get_profiles() == []
+
+
+def test_profile_records_top_functions(tmp_path, capsys, get_ipython, sample_random_dataframe):
+    """
+    Ensure `dx.profile()` keeps (and prints) the hottest functions of each call,
+    and writes a loadable `.pstats` file.
+    """
+    clear_profiles()
+    with profile(output_dir=str(tmp_path), num_functions=5):
+        handle_format(
+            sample_random_dataframe, ipython_shell=get_ipython, with_ipython_display=False
+        )
+
+    (format_profile,) = get_profiles()
+    assert format_profile["name"] == "handle_format"
+    assert len(format_profile["top_functions"]) == 5
+    assert "handle_format" in format_profile["top_functions"][0]["function"]
+    assert "dx profile for handle_format()" in capsys.readouterr().out
+
+    stats = pstats.Stats(format_profile["pstats_path"])
+    assert stats.total_calls > 0
+
+
+def test_nested_calls_are_part_of_the_outer_profile(mocker, get_ipython, sample_random_dataframe):
+    """
+    Ensure the display update made while resampling is profiled
+    as part of the `handle_resample()` call.
+    """
+    get_ipython.user_ns["test_df"] = sample_random_dataframe
+    mocker.patch(
+        "dx.filtering.update_display",
+        lambda obj, **kwargs: handle_format(
+            obj, ipython_shell=get_ipython, with_ipython_display=False
+        ),
+    )
+    with settings_context(enable_datalink=True, datalink_backend="numpy"):
+        _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+        msg = DEXResampleMessage(
+            display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+            filters=[],
+            limit=2,
+        )
+        clear_profiles()
+        with profile(print_stats=False):
+            handle_resample(msg)
+
+    (resample_profile,) = get_profiles()
+    assert resample_profile["name"] == "handle_resample"
+    assert any("handle_format" in f["function"] for f in resample_profile["top_functions"])
+
+
+@pytest.mark.benchmark
+def test_benchmark_format_logging_overhead(benchmark, get_ipython):
+    """
+    Formats a 50k-row dataframe at the default WARNING log level, recording
+    the share of time spent inside logging/structlog, which should be negligible.
+    """
+    df = random_dataframe(num_rows=50_000)
+    get_ipython.user_ns["test_df"] = df
+
+    def format_df():
+        with settings_context(log_level="WARNING"):
+            handle_format(df, ipython_shell=get_ipython, with_ipython_display=False)
+
+    benchmark(format_df)
+
+    profiler = cProfile.Profile()
+    profiler.runcall(format_df)
+    stats = pstats.Stats(profiler).stats
+    total_time = sum(tottime for _, _, tottime, _, _ in stats.values())
+    logging_time = sum(
+        tottime
+        for (filename, _, _), (_, _, tottime, _, _) in stats.items()
+        if "structlog" in filename or f"logging{os.sep}" in filename
+    )
+    benchmark.extra_info["logging_time_share"] = logging_time / total_time
+    assert logging_time / total_time < 0.01
+
+
+@pytest.mark.benchmark
+def test_benchmark_import_time(benchmark):
+    """
+    Measures a cold `import dx` in a fresh interpreter, recording the
+    slowest modules reported by `python -X importtime` alongside the timing.
+    """
+    result = benchmark.pedantic(run_python, args=("-X", "importtime", "-c", "import dx"), rounds=5)
+
+    # lines look like "import time:       self [us] |  cumulative | imported package"
+    module_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module_name = line.split("|")
+        module_times[module_name.strip()] = int(cumulative_us)
+    slowest = sorted(module_times.items(), key=lambda kv: kv[1], reverse=True)[:10]
+    benchmark.extra_info["import_time_us"] = module_times["dx"]
+    benchmark.extra_info["slowest_imports_us"] = dict(slowest)
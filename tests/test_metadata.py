@@ -1,5 +1,9 @@
+import contextvars
+import threading
+import tracemalloc
 import uuid
 
+import duckdb
 import pandas as pd
 import pytest
 from IPython.terminal.interactiveshell import TerminalInteractiveShell
@@ -8,6 +12,11 @@ from dx.formatters.main import handle_format
 from dx.settings import get_settings, settings_context
 from dx.types.dex_metadata import DEXMetadata, DEXView
 from dx.utils.formatting import generate_metadata, is_dex_metadata, is_dex_view_metadata
+from dx.utils.timing import (
+    clear_display_timings,
+    get_display_timings,
+    summarize_display_timings,
+)
 
 settings = get_settings()
 
@@ -182,5 +191,170 @@ class TestStructure:
             assert "dx" not in metadata
 
 
+class TestDisplayTimings:
+    def test_timings_disabled_by_default(
+        self,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+    ):
+        clear_display_timings()
+        _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+        assert "timings" not in metadata[settings.MEDIA_TYPE]["datalink"]
+        assert get_display_timings() == []
+
+    @pytest.mark.parametrize("datalink_enabled", [True, False])
+    def test_stage_timings_added_to_metadata(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_random_dataframe: pd.DataFrame,
+        datalink_enabled: bool,
+    ):
+        """
+        Ensure each stage's time and output size are included in the metadata, and that
+        the full set of stages (including registration) is kept for get_display_timings().
+        """
+        clear_display_timings()
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        with settings_context(
+            enable_display_timings=True,
+            display_timings_track_size=True,
+            enable_datalink=datalink_enabled,
+        ):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+
+        display_metadata = metadata[settings.MEDIA_TYPE]
+        timings = display_metadata["datalink"]["timings"]
+        expected_stages = {"normalize", "sample", "schema", "body"}
+        if datalink_enabled:
+            expected_stages.add("hash")
+        assert expected_stages.issubset(timings)
+        for stage_timing in timings.values():
+            assert stage_timing["seconds"] >= 0
+            assert stage_timing["bytes"] > 0
+
+        (display_timings,) = get_display_timings()
+        assert display_timings["display_id"] == display_metadata["display_id"]
+        assert ("register" in display_timings["stages"]) == datalink_enabled
+        assert display_timings["total_seconds"] == pytest.approx(
+            sum(timing["seconds"] for timing in display_timings["stages"].values())
+        )
+
+    def test_size_tracking_is_opt_in(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+    ):
+        """
+        Ensure stage outputs (like the display body) aren't measured unless
+        DISPLAY_TIMINGS_TRACK_SIZE is set.
+        """
+        mock_get_size_bytes = mocker.patch("dx.utils.timing.get_size_bytes")
+        with settings_context(enable_display_timings=True, enable_datalink=False):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+
+        mock_get_size_bytes.assert_not_called()
+        timings = metadata[settings.MEDIA_TYPE]["datalink"]["timings"]
+        assert all("bytes" not in stage_timing for stage_timing in timings.values())
+
+    def test_timings_history_is_limited(
+        self,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+    ):
+        clear_display_timings()
+        with settings_context(
+            enable_display_timings=True,
+            enable_datalink=False,
+            num_display_timings_tracked=3,
+        ):
+            display_ids = []
+            for _ in range(5):
+                _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+                display_ids.append(metadata[settings.MEDIA_TYPE]["display_id"])
+
+        assert [t["display_id"] for t in get_display_timings()] == display_ids[-3:]
+        assert [t["display_id"] for t in get_display_timings(2)] == display_ids[-2:]
+        assert get_display_timings(0) == []
+
+    def test_memory_tracking(
+        self,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+    ):
+        """
+        Ensure each stage's peak allocated memory is recorded (without leaving tracemalloc on),
+        along with the display's overall peak and the process's peak RSS.
+        """
+        clear_display_timings()
+        with settings_context(
+            enable_display_timings=True,
+            display_timings_track_memory=True,
+            enable_datalink=False,
+        ):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+
+        assert not tracemalloc.is_tracing()
+        timings = metadata[settings.MEDIA_TYPE]["datalink"]["timings"]
+        assert timings["copy"]["peak_memory_bytes"] > 0
+        assert all("peak_memory_bytes" in stage_timing for stage_timing in timings.values())
+
+        (display_timings,) = get_display_timings()
+        assert display_timings["peak_memory_bytes"] > 0
+        assert display_timings["max_rss_bytes"] > 0
+
+    def test_memory_not_tracked_off_main_thread(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+    ):
+        """
+        Ensure displays from another thread (like the resample worker) don't start, stop,
+        or reset the process-wide tracemalloc state used by displays on the main thread.
+        """
+        clear_display_timings()
+        mock_tracemalloc = mocker.patch("dx.utils.timing.tracemalloc")
+        with settings_context(
+            enable_display_timings=True,
+            display_timings_track_memory=True,
+            enable_datalink=False,
+        ):
+            context = contextvars.copy_context()
+            thread = threading.Thread(
+                target=context.run,
+                args=(handle_format, sample_random_dataframe),
+                kwargs={"ipython_shell": get_ipython},
+            )
+            thread.start()
+            thread.join()
+
+        assert mock_tracemalloc.method_calls == []
+        (display_timings,) = get_display_timings()
+        assert "peak_memory_bytes" not in display_timings
+        assert all("peak_memory_bytes" not in t for t in display_timings["stages"].values())
+
+    def test_summarize_display_timings(
+        self,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+    ):
+        clear_display_timings()
+        assert summarize_display_timings().empty
+
+        with settings_context(enable_display_timings=True, enable_datalink=False):
+            for _ in range(3):
+                handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+
+        summary_df = summarize_display_timings()
+        assert {"copy", "normalize", "sample", "schema", "body"}.issubset(summary_df.index)
+        assert (summary_df.num_displays == 3).all()
+        assert "peak_memory_bytes" not in "".join(summary_df.columns)
+        assert summary_df.max_seconds.is_monotonic_decreasing
+
+
 class TestPlottingMetadata:
     pass
@@ -0,0 +1,145 @@
+import stat
+import urllib.request
+
+import pandas as pd
+import pytest
+from IPython.terminal.interactiveshell import TerminalInteractiveShell
+
+from dx import metrics
+from dx.filtering import handle_resample
+from dx.formatters.main import handle_format
+from dx.settings import get_settings, settings_context
+from dx.types.filters import DEXResampleMessage
+
+settings = get_settings()
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestMetricsRegistry:
+    def test_counter_labels(self):
+        registry = metrics.MetricsRegistry()
+        counter = registry.counter("test_total", "Test counter.", label_names=("kind",))
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+        counter.inc(kind="b")
+
+        assert counter.get(kind="a") == 3
+        assert registry.to_dict()["test_total"] == {
+            "type": "counter",
+            "description": "Test counter.",
+            "samples": [
+                {"labels": {"kind": "a"}, "value": 3},
+                {"labels": {"kind": "b"}, "value": 1},
+            ],
+        }
+
+    def test_histogram_prometheus_format(self):
+        """
+        Ensure histogram buckets are cumulative, with values equal to a bucket's
+        upper bound counted in that bucket.
+        """
+        registry = metrics.MetricsRegistry()
+        histogram = registry.histogram("test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(value)
+
+        assert registry.to_prometheus() == "\n".join(
+            [
+                "# HELP test_seconds Test histogram.",
+                "# TYPE test_seconds histogram",
+                'test_seconds_bucket{le="0.1"} 2',
+                'test_seconds_bucket{le="1"} 3',
+                'test_seconds_bucket{le="+Inf"} 4',
+                "test_seconds_sum 2.65",
+                "test_seconds_count 4",
+                "",
+            ]
+        )
+
+    def test_duplicate_metric_raises(self):
+        registry = metrics.MetricsRegistry()
+        registry.counter("test_total", "Test counter.")
+        with pytest.raises(ValueError):
+            registry.counter("test_total", "Test counter.")
+
+    def test_metrics_disabled(self):
+        with settings_context(enable_metrics=False):
+            metrics.DISPLAYS.inc(display_mode="simple")
+            metrics.DISPLAY_SECONDS.observe(0.1, display_mode="simple")
+        assert metrics.DISPLAYS.samples() == []
+        assert metrics.DISPLAY_SECONDS.samples() == []
+
+
+class TestDatalinkMetrics:
+    def test_display_metrics(
+        self,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+    ):
+        with settings_context(enable_datalink=False, display_max_rows=2):
+            handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+
+        assert metrics.DISPLAYS.get(display_mode="simple") == 1
+        assert metrics.ROWS_ORIGINAL.get() == len(sample_random_dataframe)
+        assert metrics.ROWS_SAMPLED.get() == 2
+        assert metrics.DISPLAYED_BYTES.get() > 0
+        (display_seconds,) = metrics.DISPLAY_SECONDS.samples()
+        assert display_seconds["count"] == 1
+
+    def test_resample_and_cache_metrics(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_dex_dimension_filter: dict,
+    ):
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        mocker.patch("dx.filtering.update_display")
+        with settings_context(enable_datalink=True, datalink_backend="numpy"):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            msg = DEXResampleMessage(
+                display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+                filters=[sample_dex_dimension_filter],
+                limit=10,
+            )
+            handle_resample(msg)
+            handle_resample(msg)
+
+        assert metrics.RESAMPLES.get(backend="numpy", status="success") == 2
+        assert metrics.CACHE_MISSES.get(cache="filter_bitmap") == 1
+        assert metrics.CACHE_HITS.get(cache="filter_bitmap") == 1
+        (resample_seconds,) = metrics.RESAMPLE_SECONDS.samples()
+        assert resample_seconds["labels"] == {"backend": "numpy"}
+        assert resample_seconds["count"] == 2
+
+
+class TestMetricsExport:
+    def test_write_prometheus(self, tmp_path):
+        metrics.DISPLAYS.inc(display_mode="enhanced")
+        path = tmp_path / "dx.prom"
+        metrics.write_prometheus(str(path))
+
+        assert path.read_text() == metrics.to_prometheus()
+        assert 'dx_displays_total{display_mode="enhanced"} 1' in path.read_text()
+        assert list(tmp_path.iterdir()) == [path]
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+    def test_serve(self):
+        metrics.DISPLAYS.inc(display_mode="simple")
+        server = metrics.serve(port=0)
+        host, port = server.server_address
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert body == metrics.to_prometheus()
+        assert "# TYPE dx_resample_seconds histogram" in body
@@ -0,0 +1,260 @@
+"""
+Harness for measuring datalink resample round trips the way the frontend sees them:
+comm message -> `DEXResampleMessage` -> filtered query -> dtype restore -> hash/parent
+lookup -> `update_display()` payload, using a fake kernel comm and display publisher.
+
+The latency benchmarks only run with `-m benchmark`, and report p50/p95/p99 latency
+and payload sizes in their `extra_info` (see `--benchmark-json`).
+"""
+import json
+import queue
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+from IPython.terminal.interactiveshell import TerminalInteractiveShell
+
+from dx.comms.resample import resampler
+from dx.datatypes.main import random_dataframe
+from dx.formatters.main import handle_format
+from dx.settings import get_settings, settings_context
+from dx.utils.tracking import DXDF_CACHE
+
+settings = get_settings()
+
+NUM_STEPS = 20
+
+
+class FakeComm:
+    """
+    Stands in for an ipykernel `Comm`, delivering messages to the handler registered
+    with `on_msg()` and timestamping everything sent back to the frontend.
+    """
+
+    def __init__(self):
+        self.handler = None
+        self.sent = queue.Queue()
+
+    def on_msg(self, handler: Callable) -> None:
+        self.handler = handler
+
+    def send(self, data: dict) -> None:
+        self.sent.put((time.perf_counter(), data))
+
+    def receive(self, data: dict) -> None:
+        self.handler({"content": {"data": data}})
+
+
+class FakeDisplayPublisher:
+    """
+    Stands in for `IPython.display.display()`, recording the serialized
+    size of each payload + metadata bundle that would be sent to the frontend.
+    """
+
+    def __init__(self):
+        self.payload_bytes = []
+
+    def __call__(self, payload: dict, metadata: dict = None, **kwargs) -> None:
+        bundle = {"data": payload, "metadata": metadata or {}}
+        self.payload_bytes.append(len(json.dumps(bundle, default=str).encode()))
+
+
+def slider_drag(df: pd.DataFrame) -> List[list]:
+    """
+    Metric filter whose lower bound is dragged from the minimum to the median.
+    """
+    values = df.float_column
+    lower_bounds = np.linspace(values.min(), values.median(), NUM_STEPS)
+    return [
+        [
+            {
+                "column": "float_column",
+                "type": "METRIC_FILTER",
+                "predicate": "between",
+                "value": [float(lower_bound), float(values.max())],
+            }
+        ]
+        for lower_bound in lower_bounds
+    ]
+
+
+def date_range_drag(df: pd.DataFrame) -> List[list]:
+    """
+    Date filter whose start is dragged forward while the end stays fixed.
+    """
+    values = df.datetime_column
+    starts = pd.date_range(values.min(), values.median(), periods=NUM_STEPS)
+    return [
+        [
+            {
+                "column": "datetime_column",
+                "type": "DATE_FILTER",
+                "predicate": "between",
+                "start": str(start),
+                "end": str(values.max()),
+            }
+        ]
+        for start in starts
+    ]
+
+
+def dimension_toggles(df: pd.DataFrame) -> List[list]:
+    """
+    Dimension filter values toggled on one at a time, then off again.
+    """
+    values = df.keyword_column.value_counts().index[: NUM_STEPS // 2].tolist()
+    selections = [values[: i + 1] for i in range(len(values))]
+    selections += selections[-2::-1]
+    return [
+        [
+            {
+                "column": "keyword_column",
+                "type": "DIMENSION_FILTER",
+                "predicate": "in",
+                "value": selection,
+            }
+        ]
+        for selection in selections
+    ]
+
+
+FILTER_SEQUENCES: Dict[str, Callable] = {
+    "slider_drag": slider_drag,
+    "date_range_drag": date_range_drag,
+    "dimension_toggles": dimension_toggles,
+}
+
+
+@lru_cache(maxsize=1)
+def latency_dataframe(num_rows: int) -> pd.DataFrame:
+    return random_dataframe(num_rows=num_rows)
+
+
+@pytest.fixture
+def resample_harness(
+    mocker,
+    get_ipython: TerminalInteractiveShell,
+    sample_db_connection: duckdb.DuckDBPyConnection,
+):
+    """
+    Opens the resample comm against a fake comm, and routes `update_display()` through
+    the dx formatter into a fake display publisher (like a notebook kernel would).
+    """
+    mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+    mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+    publisher = FakeDisplayPublisher()
+    mocker.patch("dx.formatters.main.ipydisplay", publisher)
+    mocker.patch(
+        "dx.filtering.update_display",
+        lambda obj, display_id=None, metadata=None: handle_format(obj, ipython_shell=get_ipython),
+    )
+
+    comm = FakeComm()
+    resampler(comm, open_msg={})
+    # "connected" status
+    comm.sent.get(timeout=1)
+    return comm, publisher
+
+
+def register_dataframe(df: pd.DataFrame, ipython_shell: TerminalInteractiveShell) -> str:
+    ipython_shell.user_ns["test_df"] = df
+    _, metadata = handle_format(df, ipython_shell=ipython_shell, with_ipython_display=False)
+    return metadata[settings.MEDIA_TYPE]["display_id"]
+
+
+def replay(
+    comm: FakeComm,
+    display_id: str,
+    filter_sequence: List[list],
+    limit: int = 50_000,
+    timeout: float = 120,
+) -> List[float]:
+    """
+    Sends each resample request once the previous one has been answered, and returns
+    the time (in seconds) from each request to its status reply.
+    """
+    latencies = []
+    for filters in filter_sequence:
+        start = time.perf_counter()
+        comm.receive({"display_id": display_id, "filters": filters, "limit": limit})
+        replied_at, reply = comm.sent.get(timeout=timeout)
+        assert reply["status"] == "success", reply
+        latencies.append(replied_at - start)
+    return latencies
+
+
+def latency_summary(latencies: List[float], payload_bytes: List[int]) -> dict:
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "num_requests": len(latencies),
+        "latency_p50_ms": float(np.percentile(latencies_ms, 50)),
+        "latency_p95_ms": float(np.percentile(latencies_ms, 95)),
+        "latency_p99_ms": float(np.percentile(latencies_ms, 99)),
+        "payload_bytes_p50": int(np.percentile(payload_bytes, 50)),
+        "payload_bytes_max": int(max(payload_bytes)),
+    }
+
+
+@pytest.mark.parametrize("sequence_name", FILTER_SEQUENCES)
+@pytest.mark.parametrize("backend", ["duckdb", "numpy"])
+def test_resample_harness_replays_sequence(
+    get_ipython: TerminalInteractiveShell,
+    resample_harness,
+    backend: str,
+    sequence_name: str,
+):
+    """
+    Ensure every replayed request gets a reply and a display update
+    with the request's filters applied.
+    """
+    comm, publisher = resample_harness
+    df = random_dataframe(num_rows=1_000)
+    filter_sequence = FILTER_SEQUENCES[sequence_name](df)
+
+    with settings_context(enable_datalink=True, datalink_backend=backend):
+        display_id = register_dataframe(df, get_ipython)
+        latencies = replay(comm, display_id, filter_sequence, limit=100)
+
+    assert len(latencies) == len(filter_sequence)
+    assert len(publisher.payload_bytes) == len(filter_sequence)
+    applied_filters = DXDF_CACHE[display_id].metadata["datalink"]["applied_filters"]
+    assert [f["column"] for f in applied_filters] == [f["column"] for f in filter_sequence[-1]]
+
+    summary = latency_summary(latencies, publisher.payload_bytes)
+    assert summary["latency_p50_ms"] <= summary["latency_p99_ms"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("sequence_name", FILTER_SEQUENCES)
+@pytest.mark.parametrize("backend", ["duckdb", "numpy"])
+@pytest.mark.parametrize("num_rows", [100_000, 1_000_000])
+def test_benchmark_resample_latency(
+    benchmark,
+    get_ipython: TerminalInteractiveShell,
+    resample_harness,
+    num_rows: int,
+    backend: str,
+    sequence_name: str,
+):
+    comm, publisher = resample_harness
+    df = latency_dataframe(num_rows)
+    filter_sequence = FILTER_SEQUENCES[sequence_name](df)
+
+    with settings_context(enable_datalink=True, datalink_backend=backend):
+        display_id = register_dataframe(df, get_ipython)
+        latencies = benchmark.pedantic(
+            replay,
+            args=(comm, display_id, filter_sequence),
+            rounds=1,
+            iterations=1,
+        )
+
+    summary = latency_summary(latencies, publisher.payload_bytes)
+    benchmark.extra_info.update(
+        {"num_rows": num_rows, "backend": backend, "sequence": sequence_name, **summary}
+    )
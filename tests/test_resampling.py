@@ -6,11 +6,31 @@ import pandas as pd
 import pytest
 from IPython.terminal.interactiveshell import TerminalInteractiveShell
 
-from dx.filtering import handle_resample, resample_from_db, store_sample_to_history
+from dx import backends
+from dx.datatypes.main import random_dataframe
+from dx.filtering import (
+    handle_resample,
+    resample_from_db,
+    resample_from_frame,
+    store_sample_to_history,
+)
 from dx.formatters.main import handle_format
 from dx.settings import get_settings, settings_context
-from dx.types.filters import DEXFilterSettings, DEXResampleMessage
-from dx.utils.tracking import DXDF_CACHE, SUBSET_HASH_TO_PARENT_DATA, DXDataFrame
+from dx.types.filters import (
+    DEXDimensionFilter,
+    DEXFilterSettings,
+    DEXMetricFilter,
+    DEXResampleMessage,
+    DEXTextFilter,
+)
+from dx.utils.text_index import NGramIndex
+from dx.utils.tracking import (
+    DXDF_CACHE,
+    SUBSET_HASH_TO_PARENT_DATA,
+    DXDataFrame,
+    get_sort_column,
+    materialize_table,
+)
 
 settings = get_settings()
 
@@ -334,3 +354,623 @@ class TestResample:
                 resampled_dxdf.display_id
                 == SUBSET_HASH_TO_PARENT_DATA[resampled_dxdf.hash]["display_id"]
             )
+
+    @pytest.mark.parametrize("display_mode", ["simple", "enhanced"])
+    def test_resample_restores_original_dtypes(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        display_mode: str,
+    ):
+        """
+        Ensure resampled dataframes are cast back to their original dtypes,
+        including categoricals (with their original categories) and columns
+        whose names were changed during normalization.
+        """
+        df = pd.DataFrame(
+            {
+                "category_column": pd.Categorical(list("abca"), categories=list("dcba")),
+                "int8_column": pd.Series([1, 2, 3, 4], dtype="int8"),
+                0: [0.1, 0.2, 0.3, 0.4],
+            }
+        )
+        get_ipython.user_ns["test_df"] = df
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True, display_mode=display_mode):
+            _, metadata = handle_format(df, ipython_shell=get_ipython)
+            resampled_df = resample_from_db(
+                display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+                sql_filter="SELECT * FROM {table_name}",
+                assign_subset=False,
+            )
+
+        assert resampled_df["category_column"].dtype == df["category_column"].dtype
+        assert list(resampled_df["category_column"].cat.categories) == list("dcba")
+        assert resampled_df["int8_column"].dtype == "int8"
+        assert resampled_df.iloc[:, 2].dtype == "float64"
+
+
+class TestProgressiveResample:
+    @pytest.mark.parametrize("display_mode", ["simple", "enhanced"])
+    def test_preview_sent_before_full_sample(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        display_mode: str,
+    ):
+        """
+        Ensure a progressive resample first updates the display with a small preview
+        and the exact filtered row count, then with the full sample.
+        """
+        df = random_dataframe(num_rows=1_000)
+        get_ipython.user_ns["test_df"] = df
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+        mock_update_display = mocker.patch("dx.filtering.update_display")
+
+        with settings_context(
+            enable_datalink=True,
+            display_mode=display_mode,
+            enable_progressive_resample=True,
+            progressive_resample_preview_rows=100,
+        ):
+            _, metadata = handle_format(df, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+            resampled_df = handle_resample(DEXResampleMessage(display_id=display_id, limit=500))
+
+        assert len(resampled_df) == 500
+        assert mock_update_display.call_count == 2
+
+        preview_call, full_call = mock_update_display.call_args_list
+        assert len(preview_call.args[0]) == 100
+        assert len(full_call.args[0]) == 500
+
+        resample_progress = DXDF_CACHE[display_id].metadata["datalink"]["resample_progress"]
+        assert resample_progress["stage"] == "complete"
+        assert resample_progress["num_filtered_rows"] == 1_000
+        assert resample_progress["num_sampled_rows"] == 500
+
+    @pytest.mark.parametrize("num_rows, num_displays", [(1_000, 2), (50, 1)])
+    def test_preview_updates_parent_display(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        num_rows: int,
+        num_displays: int,
+    ):
+        """
+        Ensure the preview and the full sample both update the original display
+        (without being registered as new dataframes), and that the request's filters
+        are only counted once.
+        """
+        df = random_dataframe(num_rows=num_rows)
+        get_ipython.user_ns["test_df"] = df
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+        metric_filter = {
+            "column": "float_column",
+            "type": "METRIC_FILTER",
+            "predicate": "between",
+            "value": [df.float_column.min(), df.float_column.max()],
+        }
+
+        displayed_ids = []
+
+        def format_update(resampled_df: pd.DataFrame, display_id: str, metadata: dict):
+            # what the IPython display formatter does with update_display() in a notebook
+            _, update_metadata = handle_format(
+                resampled_df, ipython_shell=get_ipython, with_ipython_display=False
+            )
+            displayed_ids.append(update_metadata[settings.MEDIA_TYPE]["display_id"])
+
+        mocker.patch("dx.filtering.update_display", side_effect=format_update)
+
+        with settings_context(
+            enable_datalink=True,
+            enable_progressive_resample=True,
+            progressive_resample_preview_rows=100,
+        ):
+            _, metadata = handle_format(df, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+            num_cached = len(DXDF_CACHE)
+            register_spy = mocker.spy(backends, "register_dxdf")
+            handle_resample(
+                DEXResampleMessage(display_id=display_id, filters=[metric_filter], limit=500)
+            )
+
+        assert displayed_ids == [display_id] * num_displays
+        assert len(DXDF_CACHE) == num_cached
+        register_spy.assert_not_called()
+        assert DXDF_CACHE[display_id].num_filter_requests == 1
+
+    def test_small_result_skips_preview(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+    ):
+        """
+        Ensure a progressive resample whose filtered result fits in the preview
+        only updates the display once.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+        mock_update_display = mocker.patch("dx.filtering.update_display")
+
+        with settings_context(enable_datalink=True, enable_progressive_resample=True):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+            resampled_df = handle_resample(DEXResampleMessage(display_id=display_id))
+
+        assert len(resampled_df) == len(sample_random_dataframe)
+        mock_update_display.assert_called_once()
+        resample_progress = DXDF_CACHE[display_id].metadata["datalink"]["resample_progress"]
+        assert resample_progress["stage"] == "complete"
+        assert resample_progress["num_filtered_rows"] == len(sample_random_dataframe)
+
+
+class TestMaterializedTables:
+    @staticmethod
+    def is_table(db_connection: duckdb.DuckDBPyConnection, name: str) -> bool:
+        tables = db_connection.execute("SELECT table_name FROM duckdb_tables()").fetchall()
+        return (name,) in tables
+
+    def test_table_mode_materializes_on_register(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_dex_filters: list,
+    ):
+        """
+        Ensure dataframes are copied into native duckdb tables when
+        DB_MATERIALIZE_MODE is "table", and can still be resampled.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True, db_materialize_mode="table"):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            assert self.is_table(sample_db_connection, "test_df")
+
+            sql_filter_str = DEXFilterSettings(filters=sample_dex_filters).to_sql_query()
+            resampled_df = resample_from_db(
+                display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+                sql_filter=f"SELECT * FROM {{table_name}} WHERE {sql_filter_str}",
+                filters=sample_dex_filters,
+                assign_subset=False,
+            )
+        assert resampled_df.shape[1] == sample_random_dataframe.shape[1]
+
+    def test_view_mode_never_materializes(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_dex_filters: list,
+    ):
+        """
+        Ensure dataframes stay registered as views when DB_MATERIALIZE_MODE is "view".
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True, db_materialize_mode="view"):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            for _ in range(5):
+                resample_from_db(
+                    display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+                    sql_filter="SELECT * FROM {table_name}",
+                    filters=sample_dex_filters,
+                    assign_subset=False,
+                )
+        assert not self.is_table(sample_db_connection, "test_df")
+
+    def test_auto_mode_materializes_after_repeated_filtering(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_dex_filters: list,
+    ):
+        """
+        Ensure dataframes are copied into native duckdb tables once they've been
+        filtered DB_MATERIALIZE_MIN_FILTER_COUNT times, sorted by the filtered date column.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+        mock_materialize = mocker.patch("dx.filtering.materialize_table", wraps=materialize_table)
+
+        with settings_context(
+            enable_datalink=True,
+            db_materialize_mode="auto",
+            db_materialize_min_rows=1,
+            db_materialize_min_filter_count=2,
+        ):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+            for _ in range(3):
+                resample_from_db(
+                    display_id=display_id,
+                    sql_filter="SELECT * FROM {table_name}",
+                    filters=sample_dex_filters,
+                    assign_subset=False,
+                )
+
+        mock_materialize.assert_called_once()
+        assert self.is_table(sample_db_connection, "test_df")
+        assert get_sort_column(DXDF_CACHE[display_id]) == "datetime_column"
+
+
+class TestNumpyFilterEngine:
+    @pytest.mark.parametrize(
+        "filter_fixture",
+        [
+            "sample_dex_date_filter",
+            "sample_dex_metric_filter",
+            "sample_dex_dimension_filter",
+        ],
+    )
+    def test_frame_filtering_matches_db_filtering(
+        self,
+        request,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        filter_fixture: str,
+    ):
+        """
+        Ensure evaluating filters as boolean masks against the cached dataframe
+        returns the same rows as running the SQL filter through duckdb.
+        """
+        df = request.getfixturevalue("sample_random_dataframe")
+        dex_filter = request.getfixturevalue(filter_fixture)
+        # narrow the filter range so it actually excludes rows
+        if dex_filter["type"] == "DATE_FILTER":
+            dex_filter["start"] = df.datetime_column.median()
+        elif dex_filter["type"] == "METRIC_FILTER":
+            dex_filter["value"][0] = df.float_column.median()
+        filters = DEXFilterSettings(filters=[dex_filter]).filters
+        get_ipython.user_ns["test_df"] = df
+
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True):
+            _, metadata = handle_format(df, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+
+            sql_filter_str = DEXFilterSettings(filters=filters).to_sql_query()
+            db_df = resample_from_db(
+                display_id=display_id,
+                sql_filter=f"SELECT * FROM {{table_name}} WHERE {sql_filter_str}",
+                filters=filters,
+                assign_subset=False,
+            )
+            frame_df = resample_from_frame(
+                display_id=display_id,
+                filters=filters,
+                assign_subset=False,
+            )
+
+        assert 0 < len(frame_df) <= len(df)
+        assert sorted(frame_df.index) == sorted(db_df.index)
+        assert list(frame_df.columns) == list(db_df.columns)
+
+    def test_frame_filtering_respects_limit(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+    ):
+        """
+        Ensure only `limit` rows are returned from the cached dataframe.
+        """
+        df = random_dataframe(num_rows=100)
+        get_ipython.user_ns["test_df"] = df
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+
+        with settings_context(enable_datalink=True):
+            _, metadata = handle_format(df, ipython_shell=get_ipython)
+            frame_df = resample_from_frame(
+                display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+                limit=10,
+                assign_subset=False,
+            )
+        assert len(frame_df) == 10
+        assert frame_df.dtypes.to_dict() == df.dtypes.to_dict()
+
+    def test_numpy_backend_resample(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_dex_filters: list,
+    ):
+        """
+        Ensure resampling with the numpy backend doesn't register or query
+        anything in duckdb.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        mock_register = mocker.patch("dx.backends.register_dxdf")
+        mock_execute = mocker.patch("dx.backends.DuckDBDatalinkBackend.execute")
+        mocker.patch("dx.filtering.update_display")
+
+        with settings_context(enable_datalink=True, datalink_backend="numpy"):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            resampled_df = handle_resample(
+                DEXResampleMessage(
+                    display_id=metadata[settings.MEDIA_TYPE]["display_id"],
+                    filters=sample_dex_filters,
+                )
+            )
+
+        mock_register.assert_not_called()
+        mock_execute.assert_not_called()
+        assert resampled_df.shape[1] == sample_random_dataframe.shape[1]
+
+
+class TestFilterBitmapCache:
+    def test_only_changed_filters_are_evaluated(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_dex_date_filter: dict,
+        sample_dex_metric_filter: dict,
+        sample_dex_dimension_filter: dict,
+    ):
+        """
+        Ensure editing one filter only re-evaluates that filter's mask, and that
+        the combined result matches evaluating all filters from scratch.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        mocker.patch("dx.backends.register_dxdf")
+        metric_mask_spy = mocker.spy(DEXMetricFilter, "mask")
+        dimension_mask_spy = mocker.spy(DEXDimensionFilter, "mask")
+
+        with settings_context(enable_datalink=True, datalink_backend="numpy"):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+
+            filters = [
+                sample_dex_date_filter,
+                sample_dex_metric_filter,
+                sample_dex_dimension_filter,
+            ]
+            resample_from_frame(display_id=display_id, filters=filters, assign_subset=False)
+            assert metric_mask_spy.call_count == 1
+            assert dimension_mask_spy.call_count == 1
+
+            # only adjust the metric filter's range
+            sample_dex_metric_filter["value"][0] = sample_random_dataframe.float_column.median()
+            cached_df = resample_from_frame(
+                display_id=display_id, filters=filters, assign_subset=False
+            )
+            assert metric_mask_spy.call_count == 2
+            assert dimension_mask_spy.call_count == 1
+
+            with settings_context(enable_filter_bitmap_cache=False):
+                uncached_df = resample_from_frame(
+                    display_id=display_id, filters=filters, assign_subset=False
+                )
+
+        assert list(cached_df.index) == list(uncached_df.index)
+        assert len(DXDF_CACHE[display_id].filter_bitmaps) == 3
+
+    def test_bitmaps_are_bit_packed_and_pruned(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_dex_metric_filter: dict,
+        sample_dex_dimension_filter: dict,
+    ):
+        """
+        Ensure bitmaps use one bit per row and are dropped once their filter is removed.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        mocker.patch("dx.backends.register_dxdf")
+
+        with settings_context(enable_datalink=True, datalink_backend="numpy"):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+            dxdf = DXDF_CACHE[display_id]
+
+            resample_from_frame(
+                display_id=display_id,
+                filters=[sample_dex_metric_filter, sample_dex_dimension_filter],
+                assign_subset=False,
+            )
+            assert len(dxdf.filter_bitmaps) == 2
+            for bitmap in dxdf.filter_bitmaps.values():
+                assert bitmap.nbytes == -(-len(sample_random_dataframe) // 8)
+
+            resample_from_frame(
+                display_id=display_id,
+                filters=[sample_dex_dimension_filter],
+                assign_subset=False,
+            )
+            assert len(dxdf.filter_bitmaps) == 1
+
+            resample_from_frame(display_id=display_id, assign_subset=False)
+            assert dxdf.filter_bitmaps == {}
+
+
+class TestSemiJoinDimensionFilter:
+    @pytest.mark.parametrize("column", ["keyword_column", "integer_column"])
+    def test_semi_join_matches_inline_filter(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_random_dataframe: pd.DataFrame,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        column: str,
+    ):
+        """
+        Ensure a dimension filter run as a semi-join against a registered values table
+        returns the same rows as the inline `IN (...)` list, and that the values table
+        is removed once the query is done.
+        """
+        get_ipython.user_ns["test_df"] = sample_random_dataframe
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+
+        # values come through from the frontend as strings
+        selected_values = sample_random_dataframe[column].astype(str).unique()[:3].tolist()
+        filters = DEXFilterSettings(
+            filters=[
+                {
+                    "column": column,
+                    "type": "DIMENSION_FILTER",
+                    "predicate": "in",
+                    "value": selected_values,
+                }
+            ]
+        ).filters
+
+        with settings_context(enable_datalink=True):
+            _, metadata = handle_format(sample_random_dataframe, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+
+            resampled_dfs = {}
+            for threshold in [len(selected_values), 0]:
+                with settings_context(dimension_filter_semi_join_threshold=threshold):
+                    sql_filter_str = DEXFilterSettings(filters=filters).to_sql_query()
+                    resampled_dfs[threshold] = resample_from_db(
+                        display_id=display_id,
+                        sql_filter=f"SELECT * FROM {{table_name}} WHERE {sql_filter_str}",
+                        filters=filters,
+                        assign_subset=False,
+                    )
+            # the last query string should reference the values table instead of the values
+            assert filters[0].values_table_name in sql_filter_str
+            assert f"'{selected_values[0]}'" not in sql_filter_str
+
+        inline_df = resampled_dfs[len(selected_values)]
+        semi_join_df = resampled_dfs[0]
+        assert len(semi_join_df) > 0
+        assert sorted(semi_join_df.index) == sorted(inline_df.index)
+
+        view_names = sample_db_connection.execute("SELECT view_name FROM duckdb_views()").df()
+        assert filters[0].values_table_name not in view_names.view_name.tolist()
+
+
+class TestTextFilter:
+    @pytest.fixture
+    def sample_text_dataframe(self) -> pd.DataFrame:
+        df = random_dataframe(num_rows=300)
+        df["text_column"] = [
+            f"Item-{i % 250:04d} {keyword}" for i, keyword in enumerate(df.keyword_column)
+        ]
+        df.loc[::50, "text_column"] = None
+        return df
+
+    @pytest.mark.parametrize(
+        "text_filter",
+        [
+            {"predicate": "contains", "value": "m-01"},
+            {"predicate": "contains", "value": "Item-01", "case_sensitive": True},
+            {"predicate": "prefix", "value": "item-002"},
+            {"predicate": "regex", "value": "^item-00[0-4]5"},
+        ],
+    )
+    def test_frame_filtering_matches_db_filtering(
+        self,
+        mocker,
+        get_ipython: TerminalInteractiveShell,
+        sample_db_connection: duckdb.DuckDBPyConnection,
+        sample_text_dataframe: pd.DataFrame,
+        text_filter: dict,
+    ):
+        """
+        Ensure text filters return the same rows from duckdb, from the numpy
+        engine, and from the numpy engine with an n-gram index.
+        """
+        get_ipython.user_ns["test_df"] = sample_text_dataframe
+        mocker.patch("dx.formatters.main.db_connection", sample_db_connection)
+        mocker.patch("dx.filtering.db_connection", sample_db_connection)
+        filters = DEXFilterSettings(
+            filters=[{"column": "text_column", "type": "TEXT_FILTER", **text_filter}]
+        ).filters
+
+        with settings_context(enable_datalink=True, enable_filter_bitmap_cache=False):
+            _, metadata = handle_format(sample_text_dataframe, ipython_shell=get_ipython)
+            display_id = metadata[settings.MEDIA_TYPE]["display_id"]
+
+            sql_filter_str = DEXFilterSettings(filters=filters).to_sql_query()
+            db_df = resample_from_db(
+                display_id=display_id,
+                sql_filter=f"SELECT * FROM {{table_name}} WHERE {sql_filter_str}",
+                filters=filters,
+                assign_subset=False,
+            )
+            with settings_context(enable_text_index=False):
+                frame_df = resample_from_frame(
+                    display_id=display_id, filters=filters, assign_subset=False
+                )
+            with settings_context(text_index_min_unique_values=1):
+                indexed_df = resample_from_frame(
+                    display_id=display_id, filters=filters, assign_subset=False
+                )
+
+        assert "text_column" in DXDF_CACHE[display_id].text_indexes
+        assert 0 < len(db_df) < len(sample_text_dataframe)
+        assert sorted(frame_df.index) == sorted(db_df.index)
+        assert sorted(indexed_df.index) == sorted(db_df.index)
+
+    def test_ngram_index_narrows_candidates(self, sample_text_dataframe: pd.DataFrame):
+        """
+        Ensure only values containing every n-gram of the search string are checked.
+        """
+        text_index = NGramIndex(sample_text_dataframe.text_column)
+        candidate_ids = text_index.candidates(DEXTextFilter(column="text_column", value="m-012"))
+
+        assert 0 < len(candidate_ids) < len(text_index.values)
+        assert text_index.values.iloc[candidate_ids].str.lower().str.contains("m-012").all()
+        # regex filters can't be narrowed down
+        regex_filter = DEXTextFilter(column="text_column", value="m-012", predicate="regex")
+        assert len(text_index.candidates(regex_filter)) == len(text_index.values)
+
+
+def test_metric_filter_bounds_are_inclusive(
+    sample_db_connection: duckdb.DuckDBPyConnection,
+):
+    """
+    Ensure rows exactly at a metric filter's min/max bounds aren't dropped
+    by decimal literal rounding in duckdb.
+    """
+    df = pd.DataFrame({"float_column": [0.9823213770203137, 0.1234567890123457, 0.5]})
+    sample_db_connection.register("bounds_df", df)
+    dex_filter = DEXFilterSettings(
+        filters=[
+            {
+                "column": "float_column",
+                "type": "METRIC_FILTER",
+                "predicate": "between",
+                "value": [df.float_column.min(), df.float_column.max()],
+            }
+        ]
+    )
+    query_string = f"SELECT COUNT(*) FROM bounds_df WHERE {dex_filter.to_sql_query()}"
+    assert sample_db_connection.execute(query_string).fetchone()[0] == len(df)
@@ -1,5 +1,10 @@
+import threading
+
+import pandas as pd
+import pytest
 from IPython.terminal.interactiveshell import TerminalInteractiveShell
 
+from dx import settings as dx_settings
 from dx.settings import add_renderable_type, get_settings, set_display_mode, settings_context
 from dx.types.main import DXDisplayMode
 
@@ -49,9 +54,139 @@ def test_settings_context_preserves_global_display_mode(get_ipython: TerminalInt
     assert settings.DISPLAY_MODE == DXDisplayMode.simple, f"{settings=}"
 
 
+def test_settings_context_overrides_are_context_local():
+    """
+    Ensure overrides from settings_context() aren't visible to other threads.
+    """
+    max_rows = settings.DISPLAY_MAX_ROWS
+    thread_values = []
+
+    with settings_context(display_max_rows=1):
+        thread = threading.Thread(target=lambda: thread_values.append(settings.DISPLAY_MAX_ROWS))
+        thread.start()
+        thread.join()
+        assert settings.DISPLAY_MAX_ROWS == 1
+
+    assert thread_values == [max_rows]
+    assert settings.DISPLAY_MAX_ROWS == max_rows
+
+
+def test_settings_context_nested_overrides():
+    with settings_context(display_max_rows=1, display_max_columns=2):
+        with settings_context(display_max_rows=3):
+            assert (settings.DISPLAY_MAX_ROWS, settings.DISPLAY_MAX_COLUMNS) == (3, 2)
+            assert settings.dict()["DISPLAY_MAX_ROWS"] == 3
+        assert (settings.DISPLAY_MAX_ROWS, settings.DISPLAY_MAX_COLUMNS) == (1, 2)
+
+
+def test_settings_context_validates_overrides():
+    """
+    Ensure overrides are validated (and coerced) like regular assignment,
+    without changing the global setting.
+    """
+    max_rows = vars(settings)["DISPLAY_MAX_ROWS"]
+    with settings_context(display_max_rows=5.0):
+        assert settings.DISPLAY_MAX_ROWS == 5
+        assert vars(settings)["DISPLAY_MAX_ROWS"] == max_rows
+
+    with pytest.raises(ValueError):
+        with settings_context(display_max_rows=-1):
+            pass
+    with pytest.raises(ValueError):
+        with settings_context(not_a_setting=True):
+            pass
+
+
+def test_settings_context_updates_pandas_options():
+    """
+    Ensure overridden settings that mirror pandas display options are applied
+    to pandas within the context, and restored afterwards.
+    """
+    pandas_max_rows = pd.get_option("display.max_rows")
+    pandas_max_colwidth = pd.get_option("display.max_colwidth")
+    with settings_context(display_max_rows=5, max_string_length=10):
+        assert pd.get_option("display.max_rows") == 5
+        assert pd.get_option("display.max_colwidth") == 10
+        with settings_context(display_max_rows=3):
+            assert pd.get_option("display.max_rows") == 3
+        assert pd.get_option("display.max_rows") == 5
+    assert pd.get_option("display.max_rows") == pandas_max_rows
+    assert pd.get_option("display.max_colwidth") == pandas_max_colwidth
+
+
+def test_set_option_updates_pandas_options():
+    max_rows = settings.DISPLAY_MAX_ROWS
+    try:
+        dx_settings.set_option("DISPLAY_MAX_ROWS", 7)
+        assert pd.get_option("display.max_rows") == 7
+    finally:
+        dx_settings.set_option("DISPLAY_MAX_ROWS", max_rows)
+
+
+@pytest.mark.benchmark
+def test_benchmark_settings_context(benchmark):
+    def enter_context():
+        with settings_context(display_max_rows=100, display_max_columns=10):
+            return settings.DISPLAY_MAX_ROWS
+
+    assert benchmark(enter_context) == 100
+
+
 def test_add_renderables():
     class FakeRenderable:
         pass
 
     add_renderable_type(FakeRenderable)
     assert FakeRenderable in settings.get_renderable_types().keys()
+
+
+@pytest.fixture
+def restore_renderable_types():
+    """
+    Restores RENDERABLE_TYPES (which add_renderable_type() updates in place)
+    and clears the resolved renderable type cache after the test.
+    """
+    orig_renderable_types = dict(settings.RENDERABLE_TYPES)
+    yield
+    settings.RENDERABLE_TYPES.clear()
+    settings.RENDERABLE_TYPES.update(orig_renderable_types)
+    dx_settings.RENDERABLE_TYPES_CACHE.clear()
+
+
+def test_renderable_types_cached_until_changed(mocker, restore_renderable_types):
+    """
+    Ensure renderable types are only resolved again after a type is added
+    or another optional dataframe library is imported.
+    """
+    mocker.patch("dx.settings.get_loaded_optional_modules", return_value=())
+    add_renderable_type(float)
+    mock_resolve = mocker.spy(dx_settings, "get_loaded_renderable_types")
+
+    settings.get_renderable_types()
+    assert settings.is_renderable(1.0)
+    assert mock_resolve.call_count == 1
+
+    class FakeRenderable:
+        pass
+
+    add_renderable_type(FakeRenderable)
+    assert settings.is_renderable(FakeRenderable())
+    assert mock_resolve.call_count == 2
+
+    dx_settings.get_loaded_optional_modules.return_value = ("polars",)
+    settings.get_renderable_types()
+    assert mock_resolve.call_count == 3
+
+
+def test_optional_renderable_types_resolved_once_imported(mocker):
+    """
+    Ensure optional dataframe library types are only checked once their module is imported.
+    """
+    pl = pytest.importorskip("polars")
+    mock_loaded_modules = mocker.patch("dx.settings.get_loaded_optional_modules")
+    mock_loaded_modules.return_value = ()
+    mocker.patch("dx.dependencies.get_loaded_optional_modules", mock_loaded_modules)
+    assert not settings.is_renderable(pl.DataFrame())
+
+    mock_loaded_modules.return_value = ("polars",)
+    assert settings.is_renderable(pl.DataFrame())